@@ -0,0 +1,328 @@
+#import necessary modules
+import argparse
+from time import sleep
+import cv2
+import numpy as np
+from landmarks import (LandmarkFrame, NUM_LANDMARKS, LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_ELBOW, RIGHT_ELBOW,
+                       LEFT_WRIST, RIGHT_WRIST, LEFT_PINKY, RIGHT_PINKY, LEFT_INDEX, RIGHT_INDEX, LEFT_THUMB,
+                       RIGHT_THUMB)
+from models import getVideoPose
+
+# The names of the pose backends createBackend() builds.
+BACKENDS = ('mediapipe', 'opencv', 'synthetic')
+
+# The keypoints of the COCO OpenPose models, in the order of their heatmaps.
+COCO_KEYPOINTS = ('nose', 'neck', 'right_shoulder', 'right_elbow', 'right_wrist', 'left_shoulder', 'left_elbow',
+                  'left_wrist', 'right_hip', 'right_knee', 'right_ankle', 'left_hip', 'left_knee', 'left_ankle',
+                  'right_eye', 'left_eye', 'right_ear', 'left_ear')
+
+# The COCO keypoint each of the 33 mediapipe landmarks is taken from: the hands from the wrists, the feet from the
+# ankles and the face from the nearest face keypoint.
+COCO_TO_MEDIAPIPE = np.array([0, 15, 15, 15, 14, 14, 14, 17, 16, 0, 0, 5, 2, 6, 3, 7, 4, 7, 4, 7, 4, 7, 4, 11, 8,
+                              12, 9, 13, 10, 13, 10, 13, 10])
+
+
+def heatmapKeypoints(heatmaps):
+    '''
+    This function finds the most likely position of each keypoint in its heatmap.
+    Args:
+        heatmaps: An array shaped (keypoints, height, width) of the heatmaps of one person.
+    Returns:
+        keypoints: A float32 array shaped (keypoints, 3) of the normalized x and y coordinates of the centre of the
+                   hottest cell of each heatmap, and its value as the confidence.
+    '''
+
+    count, height, width = heatmaps.shape
+    flat = heatmaps.reshape(count, -1)
+    best = flat.argmax(axis=1)
+    rows, columns = np.divmod(best, width)
+    return np.stack([(columns + 0.5) / width, (rows + 0.5) / height, flat[np.arange(count), best]],
+                    axis=1).astype(np.float32)
+
+
+class MediaPipeBackend:
+    '''
+    This class detects the pose with a mediapipe Pose function.
+    Args:
+        pose:   The Pose function, or any object whose process() returns mediapipe results.
+        config: The settings of the shared video Pose function built if no pose is given, see getVideoPose().
+    '''
+
+    def __init__(self, pose=None, **config):
+
+        self.pose = getVideoPose(**config) if pose is None else pose
+
+    def detect(self, image, landmarks):
+        '''
+        This function detects the pose of the most prominent person in an image.
+        Args:
+            image:     The RGB image.
+            landmarks: The LandmarkFrame object the normalized landmarks are copied into.
+        Returns:
+            landmarks: The same LandmarkFrame object.
+        '''
+
+        return landmarks.update(self.pose.process(image), image.shape[1], image.shape[0])
+
+    def close(self):
+        pass
+
+
+class OpenCvDnnBackend:
+    '''
+    This class detects the pose with an OpenPose-style heatmap model, such as the COCO OpenPose Caffe model or an
+    ONNX export of a lightweight one, run by OpenCV's DNN module on the CPU. The hottest cell of each heatmap is
+    taken as the keypoint, and the keypoints are mapped to the 33 mediapipe landmarks.
+    Args:
+        model:          The path of the model weights (.caffemodel, .onnx, ...).
+        config:         The path of the network description, if the format has one (.prototxt).
+        input_size:     The (width, height) the image is scaled to.
+        keypoints:      The names of the keypoints of the first heatmaps, COCO_KEYPOINTS by default.
+        output:         The name of the output holding the heatmaps, the first output by default.
+        scale:          The factor the pixel values are multiplied by.
+        mean:           The values subtracted from the pixel values, per channel.
+        swap_rb:        A boolean value that is if set to true the RGB image is fed in BGR order.
+        min_confidence: The confidence both shoulders need for the person to count as detected.
+        net:            An already loaded cv2.dnn network, used instead of reading the model.
+    '''
+
+    def __init__(self, model=None, config='', input_size=(368, 368), keypoints=COCO_KEYPOINTS, output=None,
+                 scale=1 / 255, mean=(0, 0, 0), swap_rb=True, min_confidence=0.1, net=None):
+
+        if net is None:
+            if model is None:
+                raise ValueError('the opencv backend needs the path of a pose model')
+            net = cv2.dnn.readNet(model, config)
+        self.net = net
+        self.input_size = tuple(input_size)
+        self.output = output
+        self.scale = scale
+        self.mean = mean
+        self.swap_rb = swap_rb
+        self.min_confidence = min_confidence
+
+        # The index of the heatmap of each keypoint the mediapipe landmarks are taken from.
+        names = list(keypoints)
+        self.sources = np.array([names.index(name) for name in COCO_KEYPOINTS])[COCO_TO_MEDIAPIPE]
+        self.shoulders = [self.sources[LEFT_SHOULDER], self.sources[RIGHT_SHOULDER]]
+
+    def detect(self, image, landmarks):
+        '''
+        This function detects the pose of the most prominent person in an image.
+        Args:
+            image:     The RGB image.
+            landmarks: The LandmarkFrame object the normalized landmarks are written to.
+        Returns:
+            landmarks: The same LandmarkFrame object.
+        '''
+
+        # Run the network on the image scaled to its input, the heatmaps cover the whole image.
+        blob = cv2.dnn.blobFromImage(image, self.scale, self.input_size, self.mean, swapRB=self.swap_rb, crop=False)
+        self.net.setInput(blob)
+        heatmaps = self.net.forward(self.output)[0]
+        keypoints = heatmapKeypoints(heatmaps[:self.sources.max() + 1])
+
+        # Copy the keypoints to the landmarks they stand for, with their confidence as the visibility.
+        landmarks.width = image.shape[1]
+        landmarks.height = image.shape[0]
+        landmarks.extrapolated = False
+        landmarks.detected = bool((keypoints[self.shoulders, 2] >= self.min_confidence).all())
+        landmarks.data[:, :2] = keypoints[self.sources, :2]
+        landmarks.data[:, 2] = 0
+        landmarks.data[:, 3] = keypoints[self.sources, 2]
+        return landmarks
+
+    def close(self):
+        pass
+
+
+def syntheticPoses():
+    '''
+    This function builds the poses the synthetic backend plays, as the player sees them on the mirrored frame.
+    Returns:
+        poses: A dictionary from the name of each pose to its (33, 4) float32 array of normalized landmarks, None
+               for the frames without a person.
+    '''
+
+    # A person standing in the middle of the frame, the arms hanging down. Their left side is on the right.
+    standing = np.zeros((NUM_LANDMARKS, 4), dtype=np.float32)
+    standing[:, 3] = 1.0
+    standing[:, :2] = [(0.5, 0.25), (0.51, 0.23), (0.52, 0.23), (0.53, 0.23), (0.49, 0.23), (0.48, 0.23),
+                       (0.47, 0.23), (0.55, 0.24), (0.45, 0.24), (0.52, 0.28), (0.48, 0.28), (0.6, 0.4), (0.4, 0.4),
+                       (0.65, 0.55), (0.35, 0.55), (0.7, 0.7), (0.3, 0.7), (0.71, 0.73), (0.29, 0.73), (0.7, 0.74),
+                       (0.3, 0.74), (0.69, 0.72), (0.31, 0.72), (0.56, 0.7), (0.44, 0.7), (0.56, 0.82),
+                       (0.44, 0.82), (0.56, 0.94), (0.44, 0.94), (0.56, 0.96), (0.44, 0.96), (0.57, 0.97),
+                       (0.43, 0.97)]
+
+    def moved(pose, points):
+        pose = pose.copy()
+        for index, point in points.items():
+            pose[index, :2] = point
+        return pose
+
+    def hand(wrist, x, y, side):
+        return {wrist: (x, y), side[0]: (x + 0.01, y + 0.03), side[1]: (x, y + 0.04), side[2]: (x - 0.01, y + 0.02)}
+
+    left_hand = (LEFT_PINKY, LEFT_INDEX, LEFT_THUMB)
+    right_hand = (RIGHT_PINKY, RIGHT_INDEX, RIGHT_THUMB)
+
+    # The wrists joined in front of the chest, the right arm raised sideways, and the thumbs on the shoulders.
+    hands_joined = moved(standing, {LEFT_ELBOW: (0.58, 0.5), RIGHT_ELBOW: (0.42, 0.5), **hand(LEFT_WRIST, 0.51, 0.3,
+                                    left_hand), **hand(RIGHT_WRIST, 0.49, 0.3, right_hand)})
+    lean_left = moved(standing, {RIGHT_ELBOW: (0.25, 0.33), **hand(RIGHT_WRIST, 0.15, 0.28, right_hand)})
+    quit_pose = moved(standing, {LEFT_ELBOW: (0.55, 0.55), RIGHT_ELBOW: (0.45, 0.55),
+                                 **hand(LEFT_WRIST, 0.42, 0.44, left_hand), **hand(RIGHT_WRIST, 0.58, 0.44, right_hand),
+                                 LEFT_THUMB: (0.41, 0.41), RIGHT_THUMB: (0.59, 0.41)})
+
+    # The other side is the mirror image of the left lean.
+    lean_right = LandmarkFrame(1, 1, lean_left.copy()).mirror().data
+
+    # A jump or a crouch moves the shoulders further than the band of the classifier.
+    jump = standing.copy()
+    jump[:, 1] -= 0.12
+    crouch = standing.copy()
+    crouch[:, 1] += 0.12
+
+    return {'standing': standing, 'hands_joined': hands_joined, 'lean_left': lean_left, 'lean_right': lean_right,
+            'jump': jump, 'crouch': crouch, 'quit': quit_pose, 'absent': None}
+
+
+# The default script of the synthetic backend, (pose, frames) played in a loop: the start gesture, then the
+# moves of the game.
+DEFAULT_SCRIPT = (('absent', 5), ('standing', 5), ('hands_joined', 12), ('standing', 10), ('lean_left', 4),
+                  ('standing', 6), ('lean_right', 4), ('standing', 6), ('jump', 4), ('standing', 6), ('crouch', 4),
+                  ('standing', 6))
+
+
+class SyntheticBackend:
+    '''
+    This class plays a deterministic script of poses instead of detecting them, to load-test the control loop and
+    the gestures without a camera or a model. It never looks at the image.
+    Args:
+        script:  The sequence of (pose, frames) played in a loop, the poses being names of syntheticPoses().
+        noise:   The standard deviation of the gaussian noise added to the coordinates, normalized.
+        seed:    The seed of the noise, the same seed gives the same landmarks.
+        latency: The time in seconds each detection takes, to stand in for the cost of a model.
+        mirror:  A boolean value that is if set to true the poses are returned as a detector would see them on the
+                 captured frame, for the pipelines mirroring the landmarks; otherwise as scripted.
+    '''
+
+    def __init__(self, script=DEFAULT_SCRIPT, noise=0.0, seed=0, latency=0.0, mirror=True):
+
+        poses = syntheticPoses()
+        unknown = [name for name, _ in script if name not in poses]
+        if unknown:
+            raise ValueError(f'unknown synthetic poses {unknown}')
+
+        # Mirror each pose once, and unroll the script into one pose per frame.
+        if mirror:
+            poses = {name: None if pose is None else LandmarkFrame(1, 1, pose.copy()).mirror().data
+                     for name, pose in poses.items()}
+        self.frames = [poses[name] for name, count in script for _ in range(count)]
+        self.names = [name for name, count in script for _ in range(count)]
+
+        self.noise = noise
+        self.rng = np.random.default_rng(seed)
+        self.latency = latency
+        self.calls = 0
+
+    @property
+    def current(self):
+        '''
+        The name of the pose returned by the last detection.
+        '''
+
+        return self.names[(self.calls - 1) % len(self.names)]
+
+    def detect(self, image, landmarks):
+        '''
+        This function returns the next pose of the script.
+        Args:
+            image:     The RGB image, only its size is used.
+            landmarks: The LandmarkFrame object the normalized landmarks are written to.
+        Returns:
+            landmarks: The same LandmarkFrame object.
+        '''
+
+        pose = self.frames[self.calls % len(self.frames)]
+        self.calls += 1
+        if self.latency > 0:
+            sleep(self.latency)
+
+        landmarks.width = image.shape[1]
+        landmarks.height = image.shape[0]
+        landmarks.extrapolated = False
+        landmarks.detected = pose is not None
+        if pose is not None:
+            landmarks.data[:] = pose
+            if self.noise > 0:
+                landmarks.data[:, :2] += self.rng.normal(0.0, self.noise, (NUM_LANDMARKS, 2))
+        return landmarks
+
+    def close(self):
+        pass
+
+
+def asBackend(pose):
+    '''
+    This function returns the backend of a pose function.
+    Args:
+        pose: A backend, or a mediapipe Pose function or any object whose process() returns mediapipe results.
+    Returns:
+        backend: The backend itself, or a MediaPipeBackend object running the pose function.
+    '''
+
+    return pose if hasattr(pose, 'detect') else MediaPipeBackend(pose)
+
+
+def createBackend(backend='mediapipe', **config):
+    '''
+    This function builds a pose backend by name. It is a module level function, so it can be the pose factory of
+    the worker processes.
+    Args:
+        backend: One of BACKENDS.
+        config:  The keyword arguments of the backend class; the settings of the Pose function for mediapipe.
+    Returns:
+        backend: The backend object.
+    '''
+
+    if backend == 'mediapipe':
+        return MediaPipeBackend(**config)
+    if backend == 'opencv':
+        return OpenCvDnnBackend(**config)
+    if backend == 'synthetic':
+        return SyntheticBackend(**config)
+    raise ValueError(f'unknown pose backend {backend}, expected one of {BACKENDS}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the control loop headless with each pose backend on the same '
+                                                 'frames and compare their time.')
+    parser.add_argument('backends', nargs='+', choices=BACKENDS, help='The backends to compare.')
+    parser.add_argument('--paths', nargs='*', default=None,
+                        help='A video file, or images such as sample.png. Black frames by default.')
+    parser.add_argument('--frames', type=int, default=300, help='The number of frames of each run.')
+    parser.add_argument('--fps', type=float, default=30.0, help='The frame rate the frame timestamps assume.')
+    parser.add_argument('--model', help='The model of the opencv backend.')
+    parser.add_argument('--model-config', default='', help='The network description of the opencv backend.')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='The time in ms each detection of the synthetic backend takes.')
+    args = parser.parse_args()
+
+    # Import the control loop here, it imports this module.
+    from capture import BlankSource, openSource
+    from replay import replay
+
+    configs = {'mediapipe': {}, 'opencv': {'model': args.model, 'config': args.model_config},
+               'synthetic': {'latency': args.latency / 1000}}
+    for name in args.backends:
+        source = openSource(args.paths, args.frames) if args.paths else BlankSource(args.frames)
+        report = replay(source, createBackend(name, **configs[name]), args.fps)
+        inference = report['stages'].get('inference', {})
+        print(f"{name:<10}{report['frames']:6d} frames {report['fps']:8.1f} FPS  inference "
+              f"{inference.get('p50_ms', 0.0):7.2f} ms p50 {inference.get('p95_ms', 0.0):7.2f} ms p95  "
+              f"{len(report['events'])} events")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,395 @@
+#import necessary modules
+import threading
+from collections import deque
+from time import perf_counter, time, sleep
+import cv2
+import numpy as np
+
+
+class FrameGrabber:
+    '''
+    This class reads frames from a cv2.VideoCapture object on its own thread into a small ring buffer.
+    From a live camera read() always returns the newest frame, so the control loop never works on the frames queued
+    up while it was busy. From a video file the capture thread waits for the reader instead, and read() returns
+    every frame in order.
+    Args:
+        source:       The camera index or the video path passed to cv2.VideoCapture, or an already opened capture
+                      object with the same read(), set(), isOpened() and release() methods.
+        width:        The requested width of the captured frames, None to keep the mode of the capture object.
+        height:       The requested height of the captured frames, None to keep the mode of the capture object.
+        buffer_size:  The number of the most recent frames kept in the ring buffer.
+        live:         A boolean value that is true if the source is a live camera. By default only camera indexes
+                      are treated as live.
+        max_failures: The number of consecutive failed reads from a live camera after which the grabber gives up.
+    '''
+
+    def __init__(self, source=0, width=1280, height=960, buffer_size=2, live=None, max_failures=100):
+
+        # Initialize the VideoCapture object, unless an opened capture object is passed, and request the frame size.
+        self.capture = source if hasattr(source, 'read') else cv2.VideoCapture(source)
+        if width is not None and height is not None:
+            self.capture.set(3, width)
+            self.capture.set(4, height)
+
+        # Store whether the source is a live camera, a video file ends when a frame can not be read anymore.
+        self.live = isinstance(source, int) if live is None else live
+        self.max_failures = max_failures
+
+        # Initialize the ring buffer storing (sequence number, timestamp, frame) of the newest frames.
+        self.buffer = deque(maxlen=buffer_size)
+
+        # Initialize the condition used to wake up the reader when a new frame arrives,
+        # and the capture thread of a video file when a frame is consumed.
+        self.condition = threading.Condition()
+
+        # Initialize the sequence number and the timestamp of the frame last returned by read().
+        self.seq = -1
+        self.timestamp = None
+
+        # Initialize the counters of frames captured, skipped over by the reader and reads without a new frame.
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.frames_stale = 0
+
+        # Initialize the variables storing the state of the capture thread.
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        '''
+        This function starts the capture thread.
+        Returns:
+            grabber: The same FrameGrabber object, so it can be chained on construction.
+        '''
+
+        with self.condition:
+
+            # Check if the capture thread is already running.
+            if self.running:
+                return self
+
+            self.running = True
+
+        self.thread = threading.Thread(target=self.update, name='FrameGrabber', daemon=True)
+        self.thread.start()
+
+        return self
+
+    def update(self):
+        '''
+        This function is the body of the capture thread, it keeps reading frames into the ring buffer and releases
+        the capture object once it stops.
+        '''
+
+        # Initialize the count of consecutive failed reads.
+        failures = 0
+
+        # Iterate until the grabber is stopped or the capture is closed.
+        while self.running and self.capture.isOpened():
+
+            # Read a frame.
+            ok, frame = self.capture.read()
+
+            # Check if frame is not read properly then back off and read the next frame from a camera,
+            # or stop at the end of a video file.
+            if not ok:
+                failures += 1
+                if not self.live or failures >= self.max_failures:
+                    break
+                sleep(min(0.005 * failures, 0.1))
+                continue
+
+            failures = 0
+
+            with self.condition:
+
+                # Wait until the reader consumed a buffered frame, so no frame of a video file is overwritten.
+                if not self.live:
+                    self.condition.wait_for(lambda: not self.running or
+                                            self.frames_captured - 1 - self.seq < self.buffer.maxlen)
+                    if not self.running:
+                        break
+
+                # Push the frame into the ring buffer and wake up the reader.
+                self.buffer.append((self.frames_captured, time(), frame))
+                self.frames_captured += 1
+                self.condition.notify_all()
+
+        # Wake up the reader so it does not wait for a frame that will never come.
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+
+        # Release the VideoCapture object, nothing else reads from it anymore.
+        self.capture.release()
+
+    def read(self, timeout=0.5):
+        '''
+        This function returns the newest frame in the ring buffer, or the next one in order for a video file.
+        Args:
+            timeout: The maximum time in seconds to wait for a frame newer than the one returned last time.
+        Returns:
+            ok:    A boolean value that is true if a frame newer than the one returned last time is returned.
+            frame: The returned frame, or None if no new frame arrived within the timeout.
+        '''
+
+        with self.condition:
+
+            # Wait until a frame newer than the last returned one is available.
+            self.condition.wait_for(lambda: not self.running or (self.buffer and self.buffer[-1][0] > self.seq),
+                                    timeout)
+
+            # Check if no new frame arrived, so the caller does not process the same frame twice.
+            if not self.buffer or self.buffer[-1][0] <= self.seq:
+                self.frames_stale += 1
+                return False, None
+
+            # Take the newest frame from a camera, or the oldest frame not returned yet from a video file.
+            if self.live:
+                seq, timestamp, frame = self.buffer[-1]
+            else:
+                seq, timestamp, frame = next(item for item in self.buffer if item[0] > self.seq)
+
+            # Count the frames that were captured but never returned.
+            self.frames_dropped += seq - self.seq - 1
+
+            self.seq = seq
+            self.timestamp = timestamp
+
+            # Wake up the capture thread of a video file waiting for a free slot.
+            self.condition.notify_all()
+
+        return True, frame
+
+    def pending(self):
+        '''
+        This function checks whether a frame newer than the one returned last time is buffered, so a caller
+        serving several grabbers can read only the ones with a new frame.
+        Returns:
+            pending: A boolean value that is true if read() would return a frame without waiting.
+        '''
+
+        with self.condition:
+            return bool(self.buffer) and self.buffer[-1][0] > self.seq
+
+    def isOpened(self):
+        '''
+        This function checks whether the grabber can still deliver frames.
+        Returns:
+            opened: A boolean value that is true while the capture thread is running or new frames are buffered.
+        '''
+
+        with self.condition:
+            return self.running or (bool(self.buffer) and self.buffer[-1][0] > self.seq)
+
+    def stats(self):
+        '''
+        This function returns the frame counters of the grabber.
+        Returns:
+            stats: A dictionary with the number of captured, dropped and stale frames.
+        '''
+
+        with self.condition:
+            return {'captured': self.frames_captured, 'dropped': self.frames_dropped, 'stale': self.frames_stale}
+
+    def release(self):
+        '''
+        This function stops the capture thread, which releases the VideoCapture object once its current read ends.
+        '''
+
+        # Stop the capture thread and wake it up if it waits for the reader.
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+
+        # Check if the capture thread was never started, then release the VideoCapture object here.
+        if self.thread is None:
+            self.capture.release()
+            return
+
+        # Wait for the capture thread to finish its current read.
+        self.thread.join(timeout=1.0)
+        self.thread = None
+
+
+class ImageSequence:
+    '''
+    This class reads a list of image files like a cv2.VideoCapture object reads a video, so the control loop can run
+    on still images.
+    Args:
+        paths:  The paths of the images, read in order.
+        repeat: The number of times the whole sequence is read.
+    '''
+
+    def __init__(self, paths, repeat=1):
+
+        # Read all the images once, so the disk is not part of the measured loop.
+        self.images = []
+        for path in paths:
+            image = cv2.imread(path)
+            if image is None:
+                raise ValueError(f'can not read the image {path}')
+            self.images.append(image)
+
+        self.repeat = repeat
+        self.index = 0
+
+    def set(self, prop, value):
+        return False
+
+    def isOpened(self):
+        return self.index < len(self.images) * self.repeat
+
+    def read(self):
+
+        # Check if the sequence is over.
+        if not self.isOpened():
+            return False, None
+
+        image = self.images[self.index % len(self.images)]
+        self.index += 1
+
+        # Return a copy, as the control loop draws on the frames it reads.
+        return True, image.copy()
+
+    def release(self):
+        self.index = len(self.images) * self.repeat
+
+
+class BlankSource:
+    '''
+    This class returns black frames like a cv2.VideoCapture object reads a video, so the control loop can be
+    load-tested without a camera, with a pose backend that does not look at the frames.
+    Args:
+        frames: The number of frames read.
+        width:  The width of the frames.
+        height: The height of the frames.
+    '''
+
+    def __init__(self, frames, width=640, height=480):
+
+        self.image = np.zeros((height, width, 3), dtype=np.uint8)
+        self.frames = frames
+        self.index = 0
+
+    def set(self, prop, value):
+        return False
+
+    def isOpened(self):
+        return self.index < self.frames
+
+    def read(self):
+
+        # Check if the source is over.
+        if not self.isOpened():
+            return False, None
+        self.index += 1
+
+        # Return a copy, as the control loop draws on the frames it reads.
+        return True, self.image.copy()
+
+    def release(self):
+        self.index = self.frames
+
+
+# The modes the SyntheticCamera supports by default, like a USB 2 webcam: MJPG keeps the frame rate at every size,
+# the uncompressed YUYV only at the small ones.
+SYNTHETIC_MODES = ({'fourcc': 'MJPG', 'width': 1280, 'height': 960, 'fps': 30.0},
+                   {'fourcc': 'MJPG', 'width': 640, 'height': 480, 'fps': 60.0},
+                   {'fourcc': 'YUYV', 'width': 1280, 'height': 960, 'fps': 7.5},
+                   {'fourcc': 'YUYV', 'width': 640, 'height': 480, 'fps': 30.0})
+
+
+class SyntheticCamera:
+    '''
+    This class stands in for a camera opened with cv2.VideoCapture: it supports a few modes, switches to one when
+    its FOURCC, size and frame rate are set, and delivers black frames at the frame rate of the mode. The capture
+    modes can be negotiated and the latency measured without a camera.
+    Args:
+        modes: The supported modes, dictionaries with the fourcc, width, height and maximum fps. The first one is
+               used until another is set, and whenever the requested one is not supported.
+    '''
+
+    def __init__(self, modes=SYNTHETIC_MODES):
+
+        self.modes = [dict(mode) for mode in modes]
+        self.requested = {'fourcc': self.modes[0]['fourcc'], 'width': self.modes[0]['width'],
+                          'height': self.modes[0]['height'], 'fps': self.modes[0]['fps']}
+        self.buffer_size = 4
+        self.mode = dict(self.modes[0])
+        self.opened = True
+        self.next_frame = None
+
+    def set(self, prop, value):
+
+        # Store the requested property and switch to the supported mode matching the request.
+        names = {cv2.CAP_PROP_FOURCC: 'fourcc', cv2.CAP_PROP_FRAME_WIDTH: 'width', cv2.CAP_PROP_FRAME_HEIGHT: 'height',
+                 cv2.CAP_PROP_FPS: 'fps'}
+        if prop == cv2.CAP_PROP_BUFFERSIZE:
+            self.buffer_size = max(int(value), 1)
+            return True
+        if prop not in names:
+            return False
+        if prop == cv2.CAP_PROP_FOURCC:
+            value = int(value).to_bytes(4, 'little').decode('ascii', 'replace')
+        self.requested[names[prop]] = value
+
+        match = next((mode for mode in self.modes if mode['fourcc'] == self.requested['fourcc'] and
+                      (mode['width'], mode['height']) == (self.requested['width'], self.requested['height'])),
+                     self.modes[0])
+        self.mode = dict(match, fps=min(float(self.requested['fps']), match['fps']))
+        self.next_frame = None
+        return True
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FOURCC:
+            return float(int.from_bytes(self.mode['fourcc'].encode('ascii'), 'little'))
+        if prop == cv2.CAP_PROP_BUFFERSIZE:
+            return float(self.buffer_size)
+        names = {cv2.CAP_PROP_FRAME_WIDTH: 'width', cv2.CAP_PROP_FRAME_HEIGHT: 'height', cv2.CAP_PROP_FPS: 'fps'}
+        return float(self.mode[names[prop]]) if prop in names else 0.0
+
+    def isOpened(self):
+        return self.opened
+
+    def read(self):
+
+        if not self.opened:
+            return False, None
+
+        # Wait until the next frame of the mode is due.
+        now = perf_counter()
+        if self.next_frame is None or self.next_frame < now - 1.0:
+            self.next_frame = now
+        if self.next_frame > now:
+            sleep(self.next_frame - now)
+        self.next_frame += 1.0 / self.mode['fps']
+
+        return True, np.zeros((self.mode['height'], self.mode['width'], 3), dtype=np.uint8)
+
+    def release(self):
+        self.opened = False
+
+
+# The file extensions read as still images by openSource.
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+def openSource(paths, repeat=1):
+    '''
+    This function opens the offline source the control loop runs on: a video file or a sequence of images.
+    Args:
+        paths:  The path of one video file, or the paths of the images.
+        repeat: The number of times a sequence of images is read.
+    Returns:
+        source: An object with the read(), isOpened() and release() methods of cv2.VideoCapture.
+    '''
+
+    # Check if the paths are images.
+    if all(path.lower().endswith(IMAGE_EXTENSIONS) for path in paths):
+        return ImageSequence(paths, repeat)
+
+    # Otherwise open the video file.
+    if len(paths) != 1:
+        raise ValueError('only one video file can be replayed at a time')
+    return cv2.VideoCapture(paths[0])
@@ -0,0 +1,150 @@
+#import necessary modules
+import itertools
+from time import perf_counter
+import cv2
+import numpy as np
+
+# The pixel formats tried, the compressed MJPG usually keeps the frame rate at large sizes over USB 2.
+FOURCCS = ('MJPG', 'YUYV')
+
+# The frame rates and driver buffer depths tried. A shallow buffer holds fewer frames of lag, but some drivers
+# drop to a lower frame rate with it.
+FRAME_RATES = (60.0, 30.0)
+BUFFER_SIZES = (1, 3)
+
+
+def fourccCode(name):
+    return cv2.VideoWriter_fourcc(*name)
+
+
+def fourccName(code):
+    '''
+    This function decodes the FOURCC property of a capture object.
+    '''
+
+    return int(code).to_bytes(4, 'little').decode('ascii', 'replace').strip('\x00')
+
+
+def candidateModes(width, height, fourccs=FOURCCS, rates=FRAME_RATES, buffer_sizes=BUFFER_SIZES):
+    '''
+    This function lists the capture modes tried for a frame size.
+    Returns:
+        modes: A list of dictionaries with the fourcc, width, height, fps and buffer_size requested.
+    '''
+
+    return [{'fourcc': fourcc, 'width': width, 'height': height, 'fps': fps, 'buffer_size': buffer_size}
+            for fourcc, fps, buffer_size in itertools.product(fourccs, rates, buffer_sizes)]
+
+
+def applyMode(capture, mode):
+    '''
+    This function requests a capture mode and reads back the mode the driver actually chose.
+    Args:
+        capture: The cv2.VideoCapture object, or an object with the same set() and get() methods.
+        mode:    The dictionary of the requested mode.
+    Returns:
+        mode: The dictionary of the mode in effect. The buffer_size is None if the driver does not report it.
+    '''
+
+    # The FOURCC goes first, some drivers reset it when the size changes and others only accept sizes of it.
+    capture.set(cv2.CAP_PROP_FOURCC, fourccCode(mode['fourcc']))
+    capture.set(cv2.CAP_PROP_FRAME_WIDTH, mode['width'])
+    capture.set(cv2.CAP_PROP_FRAME_HEIGHT, mode['height'])
+    capture.set(cv2.CAP_PROP_FPS, mode['fps'])
+    capture.set(cv2.CAP_PROP_BUFFERSIZE, mode['buffer_size'])
+
+    buffer_size = capture.get(cv2.CAP_PROP_BUFFERSIZE)
+    return {'fourcc': fourccName(capture.get(cv2.CAP_PROP_FOURCC)),
+            'width': int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'fps': capture.get(cv2.CAP_PROP_FPS),
+            'buffer_size': int(buffer_size) if buffer_size > 0 else None}
+
+
+def measureMode(capture, frames=30, warmup=5):
+    '''
+    This function measures the frame rate a capture object delivers in its current mode.
+    Args:
+        capture: The cv2.VideoCapture object.
+        frames:  The number of frames measured.
+        warmup:  The number of frames read first and not measured, the driver may still hold frames of the
+                 previous mode.
+    Returns:
+        measures: A dictionary with the measured fps, the mean and 95th percentile interval_ms between frames and
+                  the number of failed reads.
+    '''
+
+    failures = 0
+    for _ in range(warmup):
+        failures += not capture.read()[0]
+
+    times = [perf_counter()]
+    for _ in range(frames):
+        ok, _ = capture.read()
+        if not ok:
+            failures += 1
+            continue
+        times.append(perf_counter())
+
+    intervals = np.diff(times) * 1000
+    if len(intervals) == 0:
+        return {'fps': 0.0, 'interval_ms': float('inf'), 'p95_interval_ms': float('inf'), 'failures': failures}
+    return {'fps': 1000 / intervals.mean(), 'interval_ms': float(intervals.mean()),
+            'p95_interval_ms': float(np.percentile(intervals, 95)), 'failures': failures}
+
+
+def latencyEstimate(mode, measures):
+    '''
+    This function estimates the lag the driver adds to a frame in a mode: the frames queued in its buffer and the
+    one being delivered, at the measured frame interval. A driver not reporting its buffer counts as 4 frames deep.
+    Returns:
+        latency_ms: The estimated lag in milliseconds.
+    '''
+
+    buffered = mode['buffer_size'] if mode['buffer_size'] is not None else 4
+    return (buffered + 1) * measures['interval_ms']
+
+
+def negotiateCapture(capture, width=1280, height=960, target_fps=30.0, modes=None, frames=30, report=None):
+    '''
+    This function tries the capture modes on a camera and leaves it in the one with the lowest estimated lag among
+    the ones delivering the frame size at the target frame rate.
+    Args:
+        capture:    The opened cv2.VideoCapture object, or an object with the same methods.
+        width:      The frame width needed.
+        height:     The frame height needed.
+        target_fps: The frame rate a mode must deliver, with a 10% tolerance.
+        modes:      The requested modes tried, candidateModes() of the frame size by default.
+        frames:     The number of frames measured per mode.
+        report:     An optional function called with each mode tried.
+    Returns:
+        result: A dictionary with the requested mode, the mode in effect, its measures, its latency_ms and whether
+                it meets the target, or None if no mode delivered frames. If no mode meets the target the one with
+                the highest frame rate is chosen.
+    '''
+
+    results = []
+    for requested in candidateModes(width, height) if modes is None else modes:
+        mode = applyMode(capture, requested)
+        measures = measureMode(capture, frames)
+        result = {'requested': requested, 'mode': mode, 'measures': measures,
+                  'latency_ms': latencyEstimate(mode, measures),
+                  'meets_target': ((mode['width'], mode['height']) == (width, height) and
+                                   measures['fps'] >= 0.9 * target_fps)}
+        results.append(result)
+        if report is not None:
+            report(result)
+
+    # Pick the lowest lag among the modes meeting the target, or the fastest mode.
+    delivering = [result for result in results if result['measures']['fps'] > 0]
+    if not delivering:
+        return None
+    meeting = [result for result in delivering if result['meets_target']]
+    if meeting:
+        best = min(meeting, key=lambda result: result['latency_ms'])
+    else:
+        best = max(delivering, key=lambda result: result['measures']['fps'])
+
+    # Leave the capture object in the chosen mode.
+    applyMode(capture, best['requested'])
+    return best
@@ -0,0 +1,224 @@
+#import necessary modules
+import argparse
+import itertools
+import json
+import os
+import sys
+from time import perf_counter
+import numpy as np
+from backends import syntheticPoses
+from geometry import pixelPoints
+from landmarks import LandmarkFrame, LEFT_SHOULDER, RIGHT_SHOULDER
+from pose_detection import (classifyLeftRight, classifyHandsJoined, classifyJumpCrouch, classifyShouldersJoined,
+                            findAngle, measurePoses)
+
+# The file storing the time per call of each benchmark measured on the reference machine.
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'classifier_baselines.json')
+
+# The frame sizes the synthetic poses are classified at, the classifiers compare pixel distances.
+FRAME_SIZES = ((640, 480), (1280, 960), (1920, 1080))
+
+# The classifiers, called with the landmarks and the shoulder height of the standing pose.
+CLASSIFIERS = {'left_right': lambda landmarks, mid_y: classifyLeftRight(landmarks)[0],
+               'hands_joined': lambda landmarks, mid_y: classifyHandsJoined(landmarks)[0],
+               'jump_crouch': lambda landmarks, mid_y: classifyJumpCrouch(landmarks, mid_y)[0],
+               'shoulders_joined': lambda landmarks, mid_y: classifyShouldersJoined(landmarks)[0]}
+
+# The labels of each synthetic pose, at every frame size unless SIZE_LABELS says otherwise.
+EXPECTED_LABELS = {
+    'standing': {'left_right': 'Standing', 'hands_joined': 'Hands Not Joined', 'jump_crouch': 'Standing',
+                 'shoulders_joined': 'Game'},
+    'hands_joined': {'left_right': 'Standing', 'hands_joined': 'Hands Joined', 'jump_crouch': 'Standing',
+                     'shoulders_joined': 'Game'},
+    'lean_left': {'left_right': 'Hands Left', 'hands_joined': 'Hands Not Joined', 'jump_crouch': 'Standing',
+                  'shoulders_joined': 'Game'},
+    'lean_right': {'left_right': 'Hands Right', 'hands_joined': 'Hands Not Joined', 'jump_crouch': 'Standing',
+                   'shoulders_joined': 'Game'},
+    'jump': {'left_right': 'Standing', 'hands_joined': 'Hands Not Joined', 'jump_crouch': 'Jumping',
+             'shoulders_joined': 'Game'},
+    'crouch': {'left_right': 'Standing', 'hands_joined': 'Hands Not Joined', 'jump_crouch': 'Crouching',
+               'shoulders_joined': 'Game'},
+    'quit': {'left_right': 'Standing', 'hands_joined': 'Hands Not Joined', 'jump_crouch': 'Standing',
+             'shoulders_joined': 'Quit'}}
+
+# The labels that depend on the frame size: at 640 pixels wide the crossed wrists of the quit pose are closer than
+# the hands joined distance. The rules only read hands_joined while waiting and the quit pose while playing.
+SIZE_LABELS = {((640, 480), 'quit'): {'hands_joined': 'Hands Joined'}}
+
+
+def shoulderHeight(width, height):
+    '''
+    This function computes the shoulder height the game records at its start, on the standing pose.
+    '''
+
+    landmarks = LandmarkFrame(width, height, syntheticPoses()['standing'])
+    left_y, right_y = (landmarks.data[[RIGHT_SHOULDER, LEFT_SHOULDER], 1] * height).astype(int).tolist()
+    return abs(right_y + left_y) // 2
+
+
+def expectedLabels(pose, size):
+    '''
+    This function returns the labels each classifier should give to a synthetic pose at a frame size.
+    '''
+
+    return {**EXPECTED_LABELS[pose], **SIZE_LABELS.get((tuple(size), pose), {})}
+
+
+def classifyPoses(sizes=FRAME_SIZES):
+    '''
+    This function classifies every synthetic pose at every frame size.
+    Args:
+        sizes: The (width, height) of the frames.
+    Returns:
+        labels: A dictionary from each (size, pose) to the dictionary of the label of each classifier.
+    '''
+
+    poses = syntheticPoses()
+    labels = {}
+    for width, height in sizes:
+        mid_y = shoulderHeight(width, height)
+        for name in EXPECTED_LABELS:
+            landmarks = LandmarkFrame(width, height, poses[name].copy())
+            labels[(width, height), name] = {classifier: classify(landmarks, mid_y)
+                                             for classifier, classify in CLASSIFIERS.items()}
+    return labels
+
+
+def timePerCall(function, number, repeat):
+    '''
+    This function measures the time of one call of a function, the best of some rounds of many calls.
+    Returns:
+        seconds: The time in seconds per call.
+    '''
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, perf_counter() - start)
+    return best / number
+
+
+def calibrate(number=2000, repeat=5):
+    '''
+    This function measures the speed of this machine on a small NumPy kernel like the classifiers run, so the
+    baselines measured on another machine can be scaled to this one.
+    Returns:
+        us: The time in microseconds per call of the kernel.
+    '''
+
+    points = np.array([[420.0, 530.0], [512.0, 384.0], [700.0, 530.0]])
+    return timePerCall(lambda: np.sqrt(((points[[0, 2]] - points[[1, 1]]) ** 2).sum(axis=-1)).tolist(),
+                       number, repeat) * 1e6
+
+
+def benchmark(number=2000, repeat=5, batch=1000):
+    '''
+    This function measures the time per call of each classifier on the synthetic poses at 1280x960, of findAngle,
+    and of measurePoses on a batch of frames, as recording.py measures a recording.
+    Args:
+        number: The number of calls of each round.
+        repeat: The number of rounds, the fastest one is kept.
+        batch:  The number of frames measured at once by measurePoses.
+    Returns:
+        timings: A dictionary from each benchmark to its time in microseconds per call, or per frame for the batch.
+    '''
+
+    poses = syntheticPoses()
+    frames = [LandmarkFrame(1280, 960, poses[name].copy()) for name in EXPECTED_LABELS]
+    mid_y = shoulderHeight(1280, 960)
+
+    timings = {}
+    for name, classify in CLASSIFIERS.items():
+
+        # Cycle through the poses, so every branch of the classifier runs.
+        poses_cycle = itertools.cycle(frames)
+        timings[name] = timePerCall(lambda: classify(next(poses_cycle), mid_y), number, repeat) * 1e6
+
+    timings['find_angle'] = timePerCall(lambda: findAngle(420.0, 530.0, 512.0, 384.0), number, repeat) * 1e6
+
+    data = np.stack([frame.data for frame in frames] * (batch // len(frames) + 1))[:batch]
+    points = pixelPoints(data, 1280, 960)
+    timings['measure_poses_batch'] = timePerCall(lambda: measurePoses(points), 1, repeat) * 1e6 / batch
+    return timings
+
+
+def loadBaselines(path=BASELINE_PATH):
+    '''
+    This function reads the stored baselines.
+    Returns:
+        baselines: A dictionary with the tolerance factor, the calibration_us of the reference machine and the
+                   us_per_call of each benchmark.
+    '''
+
+    with open(path) as file:
+        return json.load(file)
+
+
+def regressions(timings, baselines, calibration_us=None):
+    '''
+    This function compares the measured times with the baselines.
+    Args:
+        timings:        The dictionary of the microseconds per call of each benchmark.
+        baselines:      The dictionary with the tolerance factor, the calibration_us of the reference machine and
+                        the us_per_call of each benchmark.
+        calibration_us: The time of the calibration kernel on this machine, to scale the baselines to it. The
+                        baselines are taken as they are by default.
+    Returns:
+        regressions: The list of (benchmark, measured, baseline) of the benchmarks slower than their scaled
+                     baseline times the tolerance factor.
+    '''
+
+    scale = 1.0 if calibration_us is None else calibration_us / baselines['calibration_us']
+    limit = baselines['tolerance'] * scale
+    return [(name, timings[name], baseline * scale) for name, baseline in baselines['us_per_call'].items()
+            if name in timings and timings[name] > baseline * limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the classifications of the synthetic poses and measure the '
+                                                 'time per call of the classifiers against the stored baselines.')
+    parser.add_argument('--number', type=int, default=2000, help='The number of calls of each round.')
+    parser.add_argument('--repeat', type=int, default=5, help='The number of rounds, the fastest one is kept.')
+    parser.add_argument('--baselines', default=BASELINE_PATH, help='The JSON file of the baselines.')
+    parser.add_argument('--update', action='store_true', help='Store the measured times as the new baselines.')
+    args = parser.parse_args()
+
+    # Check the classifications first, a fast wrong classifier is not worth timing.
+    wrong = [(size, pose, labels) for (size, pose), labels in classifyPoses().items()
+             if labels != expectedLabels(pose, size)]
+    for size, pose, labels in wrong:
+        print(f'{pose} at {size[0]}x{size[1]}: {labels}, expected {expectedLabels(pose, size)}')
+
+    calibration_us = calibrate(args.number, args.repeat)
+    timings = benchmark(args.number, args.repeat)
+    if os.path.exists(args.baselines):
+        baselines = loadBaselines(args.baselines)
+        scale = calibration_us / baselines['calibration_us']
+    else:
+        baselines, scale = {'tolerance': 2.5, 'calibration_us': calibration_us, 'us_per_call': {}}, 1.0
+    print(f'{"calibration":<22}{calibration_us:9.2f} us, baselines scaled by {scale:4.2f}')
+    for name, us in timings.items():
+        baseline = baselines['us_per_call'].get(name)
+        baseline = baseline * scale if baseline else None
+        print(f"{name:<22}{us:9.2f} us {1e6 / us:12.0f} calls/s" +
+              (f'  baseline {baseline:7.2f} us ({us / baseline:4.2f}x)' if baseline else ''))
+
+    if args.update:
+        baselines['calibration_us'] = round(calibration_us, 3)
+        baselines['us_per_call'] = {name: round(us, 3) for name, us in timings.items()}
+        with open(args.baselines, 'w') as file:
+            json.dump(baselines, file, indent=2)
+        print(f'Baselines written to {args.baselines}')
+        slow = []
+    else:
+        slow = regressions(timings, baselines, calibration_us)
+        for name, us, baseline in slow:
+            print(f'{name} regressed: {us:.2f} us against {baseline:.2f} us x {baselines["tolerance"]}')
+
+    sys.exit(1 if wrong or slow else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,22 @@
+#import necessary modules
+import numpy as np
+from landmarks import LandmarkFrame, NUM_LANDMARKS
+
+
+def constantLandmarks(x, visibility=1.0, width=640, height=480):
+    '''
+    This function builds the landmarks of a frame with every landmark at the same x coordinate, the y and z
+    coordinates at 0.
+    Args:
+        x:          The normalized x coordinate of the landmarks.
+        visibility: The visibility of the landmarks.
+        width:      The width of the frame.
+        height:     The height of the frame.
+    Returns:
+        landmarks: The LandmarkFrame object.
+    '''
+
+    data = np.zeros((NUM_LANDMARKS, 4), dtype=np.float32)
+    data[:, 0] = x
+    data[:, 3] = visibility
+    return LandmarkFrame(width, height, data)
@@ -0,0 +1,296 @@
+#import necessary modules
+import multiprocessing
+import queue
+import traceback
+from multiprocessing import shared_memory
+from time import perf_counter, time
+import cv2
+import numpy as np
+from backends import asBackend
+from landmarks import LandmarkFrame
+from models import getVideoPose
+from pipeline import Pipeline
+
+
+class FrameRing:
+    '''
+    This class stores frames in slots of one shared memory block, so the processes pass slot numbers instead of
+    pickling the frames. Each slot holds one frame of at most slot_bytes bytes, of any shape.
+    Args:
+        slots:      The number of slots.
+        slot_bytes: The size in bytes of each slot.
+        name:       The name of an existing block to attach to, or None to create a new one.
+    '''
+
+    def __init__(self, slots, slot_bytes, name=None):
+
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.owner = name is None
+        self.memory = shared_memory.SharedMemory(name=name, create=self.owner, size=slots * slot_bytes)
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def view(self, slot, shape):
+        '''
+        This function returns a contiguous array over the start of a slot.
+        Args:
+            slot:  The index of the slot.
+            shape: The shape of the uint8 frame stored in it.
+        Returns:
+            frame: The array sharing the memory of the slot.
+        '''
+
+        return np.ndarray(shape, dtype=np.uint8, buffer=self.memory.buf, offset=slot * self.slot_bytes)
+
+    def close(self):
+        '''
+        This function detaches from the block, and frees it if this object created it.
+        '''
+
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+
+def inferenceWorker(ring_name, slots, slot_bytes, tasks, results, pose_factory, pose_config):
+    '''
+    This function is the body of an inference process: it runs the pose detection on the frames of the ring slots
+    it is given and sends back the landmarks.
+    Args:
+        ring_name:    The name of the shared memory block of the FrameRing.
+        slots:        The number of slots of the ring.
+        slot_bytes:   The size in bytes of each slot.
+        tasks:        The queue of (seq, slot, shape) of the frames to process, None to stop.
+        results:      The queue the (seq, detected, landmarks, seconds) of each frame are put in, or
+                      (seq, None, error, 0) if the detection failed.
+        pose_factory: The function building the pose backend or function in this process.
+        pose_config:  The keyword arguments of the pose factory.
+    '''
+
+    ring = FrameRing(slots, slot_bytes, ring_name)
+    landmarks = LandmarkFrame()
+    try:
+        backend = asBackend(pose_factory(**pose_config))
+
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            seq, slot, shape = task
+
+            # Perform the Pose Detection on the RGB frame of the slot, without copying it.
+            start = perf_counter()
+            try:
+                backend.detect(ring.view(slot, shape), landmarks)
+            except Exception:
+                results.put((seq, None, traceback.format_exc(), 0.0))
+                continue
+            results.put((seq, landmarks.detected, landmarks.data.copy(), perf_counter() - start))
+    finally:
+        ring.close()
+
+
+class ProcessPipeline(Pipeline):
+    '''
+    This class runs the control loop stages like Pipeline, with the pose detection in worker processes. The frames
+    are cropped and converted in this process straight into the slots of a shared memory ring, and the
+    results are classified in the order of the frames, whatever the order the workers finish them in. While the
+    workers detect the next frames, this process classifies and draws the previous ones, so process() returns the
+    frame submitted some calls earlier, or None while the first results are on their way.
+    Args:
+        controller:   The GameController object turning the landmarks into game input.
+        workers:      The number of inference processes.
+        depth:        The maximum number of frames in flight, workers + 1 by default.
+        pose_factory: A module level function building the pose backend or function in each worker, such as
+                      createBackend, getVideoPose by default.
+        pose_config:  The keyword arguments of the pose factory.
+        options:      The other keyword arguments of Pipeline (tracker, draw, mirror, recorder, smoother, profiler,
+                      render). The scheduler and the motion gate are not supported, the workers already keep the
+                      detection off the loop.
+    The time the workers spend in the detection is measured as the worker stage, and the time this process waits
+    for a free slot as the wait stage.
+    '''
+
+    def __init__(self, controller, workers=1, depth=None, pose_factory=getVideoPose, pose_config=None, **options):
+
+        if options.get('scheduler') is not None:
+            raise ValueError('the ProcessPipeline does not support a scheduler')
+        if options.get('motion') is not None:
+            raise ValueError('the ProcessPipeline does not support a motion gate')
+        super().__init__(None, controller, **options)
+
+        self.workers = workers
+        self.depth = workers + 1 if depth is None else depth
+        self.pose_factory = pose_factory
+        self.pose_config = pose_config or {}
+
+        # The ring and the processes are started on the first frame, once the frame size is known.
+        self.context = multiprocessing.get_context('spawn')
+        self.ring = None
+        self.processes = []
+        self.tasks = None
+        self.results = None
+
+        # Initialize the sequence number of the next frame submitted and of the next frame classified, the frames
+        # in flight by sequence number, and the results received ahead of their turn.
+        self.next_seq = 0
+        self.next_result = 0
+        self.in_flight = {}
+        self.ready = {}
+
+    def start(self, frame_shape):
+        '''
+        This function creates the shared memory ring and starts the inference processes.
+        Args:
+            frame_shape: The shape of the camera frames, the largest image a slot has to hold.
+        '''
+
+        self.ring = FrameRing(self.depth, int(np.prod(frame_shape)))
+        self.tasks = self.context.Queue()
+        self.results = self.context.Queue()
+        for index in range(self.workers):
+            process = self.context.Process(target=inferenceWorker, name=f'PoseWorker-{index}', daemon=True,
+                                           args=(self.ring.name, self.ring.slots, self.ring.slot_bytes, self.tasks,
+                                                 self.results, self.pose_factory, self.pose_config))
+            process.start()
+            self.processes.append(process)
+
+    def process(self, frame, overlay=None, timestamp=None):
+        '''
+        This function submits one frame to the workers and classifies the frames whose results arrived.
+        Args:
+            frame:     The BGR frame read from the camera.
+            overlay:   An optional Overlay object holding the draw commands of the frame so far, drawn on the
+                       newest classified frame.
+            timestamp: The time the frame was captured, the current time by default.
+        Returns:
+            frame:   The newest classified frame, with the classifications drawn if it was specified, or None if
+                     no result arrived yet.
+            playing: A boolean value that is false once the player quit the game.
+        '''
+
+        timestamp = time() if timestamp is None else timestamp
+        if self.ring is None:
+            self.start(frame.shape)
+
+        # Wait for the result of the oldest frame if every slot is in flight, its slot is reused for this frame.
+        t = perf_counter()
+        while len(self.in_flight) >= self.depth and self.next_result not in self.ready:
+            self.receive(block=True)
+        t = self.lap(t, 'wait')
+
+        # Crop the frame around the person if it is specified and convert it into RGB format in a slot of the ring.
+        crop = frame if self.tracker is None else self.tracker.crop(frame)
+        seq = self.next_seq
+        slot = seq % self.ring.slots
+        cv2.cvtColor(crop, cv2.COLOR_BGR2RGB, dst=self.ring.view(slot, crop.shape))
+        box = None if self.tracker is None else self.tracker.current
+        self.in_flight[seq] = (frame, timestamp, box)
+        self.tasks.put((seq, slot, crop.shape))
+        self.next_seq += 1
+        self.lap(t, 'convert')
+
+        # Classify the frames whose results arrived, in order.
+        self.receive(block=False)
+        return self.classifyReady(overlay)
+
+    def flush(self, overlay=None):
+        '''
+        This function waits for every frame in flight and classifies them.
+        Args:
+            overlay: An optional Overlay object drawn on the last frame.
+        Returns:
+            frame:   The last frame, or None if no frame was in flight.
+            playing: A boolean value that is false once the player quit the game.
+        '''
+
+        while len(self.ready) < len(self.in_flight):
+            self.receive(block=True)
+        return self.classifyReady(overlay)
+
+    def receive(self, block):
+        '''
+        This function moves the results sent by the workers to the ready results.
+        Args:
+            block: A boolean value that is if set to true the function waits for at least one result.
+        '''
+
+        while len(self.ready) < len(self.in_flight):
+            try:
+                seq, detected, data, seconds = self.results.get(block=block, timeout=5.0 if block else None)
+            except queue.Empty:
+                if block:
+                    raise RuntimeError('the pose workers stopped answering')
+                return
+
+            # Check if the detection failed in the worker.
+            if detected is None:
+                raise RuntimeError(f'the pose detection failed on frame {seq}:\n{data}')
+
+            self.profiler.record('worker', seconds)
+            self.ready[seq] = (detected, data)
+            block = False
+
+    def classifyReady(self, overlay):
+        '''
+        This function classifies the ready results in the order of the frames, stopping at the first one missing.
+        Args:
+            overlay: An optional Overlay object drawn on the last classified frame.
+        Returns:
+            frame:   The last classified frame, or None if no result was ready.
+            playing: A boolean value that is false once the player quit the game.
+        '''
+
+        output, playing = None, True
+        while self.next_result in self.ready:
+            seq = self.next_result
+            detected, data = self.ready.pop(seq)
+            frame, timestamp, box = self.in_flight.pop(seq)
+            self.next_result += 1
+
+            # Copy the result into the landmark frame and map it back to the full frame, from the region cropped
+            # on that frame.
+            frame_height, frame_width, _ = frame.shape
+            self.landmarks.data[:] = data
+            self.landmarks.detected = detected
+            self.landmarks.extrapolated = False
+            self.landmarks.width, self.landmarks.height = frame_width, frame_height
+            if self.tracker is not None:
+                self.tracker.current = box
+                self.tracker.update(self.landmarks, frame_width, frame_height)
+            if self.mirror:
+                self.landmarks.mirror()
+
+            # Only the last ready frame is drawn, the others are only classified.
+            last = self.next_result not in self.ready
+            output, playing = self.finish(frame, overlay if last else None, timestamp, perf_counter())
+            if not playing:
+                break
+
+        return output, playing
+
+    def close(self):
+        '''
+        This function stops the inference processes and frees the shared memory ring.
+        '''
+
+        for _ in self.processes:
+            self.tasks.put(None)
+        for process in self.processes:
+            process.join(timeout=5.0)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
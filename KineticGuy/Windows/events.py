@@ -0,0 +1,242 @@
+#import necessary modules
+import argparse
+import socket
+import struct
+import threading
+from time import time
+from input_dispatch import InputDispatcher
+from pipeline import START_CLICK, RESTART_CLICK, QUIT_CLICK
+
+# The gesture events, a packet carries the index of its event in this tuple.
+EVENT_NAMES = ('left', 'right', 'jump_start', 'jump_end', 'start', 'restart', 'quit')
+
+# The packet of one event: the magic bytes, the format version, the event index, the player index, the sequence
+# number of the event and the time of the frame it was detected on, 16 bytes.
+MAGIC = b'KG'
+VERSION = 1
+PACKET = struct.Struct('<2sBBBxHd')
+
+# The default port the events are sent to.
+DEFAULT_PORT = 5005
+
+# The input the reference receiver injects for each event, the same as the GameController injects itself.
+EVENT_INPUT = {'left': ('press', ('left',)),
+               'right': ('press', ('right',)),
+               'jump_start': ('keyDown', ('up',)),
+               'jump_end': ('keyUp', ('up',)),
+               'start': ('click', (*START_CLICK, 'left')),
+               'restart': ('click', (*RESTART_CLICK, 'left')),
+               'quit': ('click', (*QUIT_CLICK, 'left'))}
+
+
+def encodeEvent(name, timestamp, seq, player=0):
+    '''
+    This function packs a gesture event.
+    Args:
+        name:      The name of the event, one of EVENT_NAMES.
+        timestamp: The time of the frame the event was detected on.
+        seq:       The sequence number of the event, wrapping at 65536.
+        player:    The index of the player.
+    Returns:
+        packet: The bytes of the event.
+    '''
+
+    return PACKET.pack(MAGIC, VERSION, EVENT_NAMES.index(name), player, seq & 0xFFFF, timestamp)
+
+
+def decodeEvent(packet):
+    '''
+    This function unpacks a gesture event.
+    Args:
+        packet: The bytes of the event.
+    Returns:
+        event: A dictionary with the name, timestamp, seq and player of the event, or None if the bytes are not an
+               event of this version.
+    '''
+
+    if len(packet) != PACKET.size:
+        return None
+    magic, version, index, player, seq, timestamp = PACKET.unpack(packet)
+    if magic != MAGIC or version != VERSION or index >= len(EVENT_NAMES):
+        return None
+    return {'name': EVENT_NAMES[index], 'timestamp': timestamp, 'seq': seq, 'player': player}
+
+
+def parseAddress(text):
+    '''
+    This function parses a HOST:PORT address, the port being DEFAULT_PORT if it is not given.
+    '''
+
+    host, _, port = text.rpartition(':') if ':' in text else (text, '', '')
+    return host or '127.0.0.1', int(port) if port else DEFAULT_PORT
+
+
+class UdpEventSender:
+    '''
+    This class streams the gesture events of the GameController over UDP to a receiver, such as the game machine
+    running EventReceiver, instead of injecting the input on this machine. Sending never waits for the receiver.
+    Args:
+        address: The (host, port) of the receiver.
+        player:  The index of the player, sent with every event.
+        repeat:  The number of times each packet is sent, more than once on lossy networks; the receiver drops the
+                 copies by their sequence number.
+    '''
+
+    def __init__(self, address, player=0, repeat=1):
+
+        self.address = address
+        self.player = player
+        self.repeat = repeat
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setblocking(False)
+
+        # Initialize the sequence number of the next event, and the counters of the packets sent and failed.
+        self.seq = 0
+        self.sent = 0
+        self.failed = 0
+
+    def send(self, name, timestamp):
+        '''
+        This function sends one gesture event.
+        Args:
+            name:      The name of the event.
+            timestamp: The time of the frame the event was detected on.
+        '''
+
+        packet = encodeEvent(name, timestamp, self.seq, self.player)
+        self.seq = (self.seq + 1) & 0xFFFF
+        for _ in range(self.repeat):
+            try:
+                self.socket.sendto(packet, self.address)
+                self.sent += 1
+            except OSError:
+                self.failed += 1
+
+    def close(self):
+        self.socket.close()
+
+
+class EventReceiver:
+    '''
+    This class is the reference receiver of the gesture events: it listens on a UDP port on its own thread and
+    injects the input of each event with an InputDispatcher, in the order the events arrive. Copies and events
+    older than the newest one of their player are dropped.
+    Args:
+        port:       The UDP port to listen on, 0 for any free port.
+        host:       The address to listen on, every interface by default.
+        dispatcher: The InputDispatcher object injecting the input, one injecting with pyautogui by default.
+    '''
+
+    def __init__(self, port=DEFAULT_PORT, host='0.0.0.0', dispatcher=None):
+
+        self.dispatcher = InputDispatcher() if dispatcher is None else dispatcher
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind((host, port))
+        self.socket.settimeout(0.1)
+
+        # Initialize the (sequence number, timestamp) of the newest event of each player, and the list storing
+        # (arrival time, event) of the events injected.
+        self.last = {}
+        self.events = []
+        self.dropped = 0
+
+        self.running = False
+        self.thread = None
+
+    @property
+    def address(self):
+        return self.socket.getsockname()
+
+    def start(self):
+        '''
+        This function starts the receive thread.
+        Returns:
+            receiver: The same EventReceiver object, so it can be chained on construction.
+        '''
+
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self.run, name='EventReceiver', daemon=True)
+            self.thread.start()
+
+        return self
+
+    def run(self):
+        '''
+        This function is the body of the receive thread.
+        '''
+
+        while self.running:
+            try:
+                packet = self.socket.recv(64)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self.handle(packet, time())
+
+    def handle(self, packet, arrival):
+        '''
+        This function injects the input of one received packet.
+        Args:
+            packet:  The bytes received.
+            arrival: The time the packet arrived.
+        Returns:
+            event: The decoded event, or None if the packet was dropped.
+        '''
+
+        event = decodeEvent(packet)
+        if event is None:
+            self.dropped += 1
+            return None
+
+        # Drop the copies and the late events. The sequence numbers wrap so only the next half counts as ahead,
+        # and an event of a newer frame behind the newest one means the sender was restarted.
+        last = self.last.get(event['player'])
+        if last is not None:
+            ahead = 0 < (event['seq'] - last[0]) & 0xFFFF < 0x8000
+            if not ahead and event['timestamp'] <= last[1]:
+                self.dropped += 1
+                return None
+        self.last[event['player']] = (event['seq'], event['timestamp'])
+
+        action, args = EVENT_INPUT[event['name']]
+        getattr(self.dispatcher, action)(*args, timestamp=event['timestamp'])
+        self.events.append((arrival, event))
+        return event
+
+    def stop(self):
+        '''
+        This function stops the receive thread and closes the socket.
+        '''
+
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+        self.socket.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Receive the gesture events of main.py --send-events and inject '
+                                                 'the game input on this machine.')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='The UDP port to listen on.')
+    parser.add_argument('--host', default='0.0.0.0', help='The address to listen on.')
+    args = parser.parse_args()
+
+    dispatcher = InputDispatcher().start()
+    receiver = EventReceiver(args.port, args.host, dispatcher).start()
+    print(f'Listening on {receiver.address[0]}:{receiver.address[1]}, Ctrl+C to stop.')
+    try:
+        while receiver.thread.is_alive():
+            receiver.thread.join(timeout=1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        receiver.stop()
+        dispatcher.stop()
+    print(f'{len(receiver.events)} events received, {receiver.dropped} dropped.')
+
+
+if __name__ == '__main__':
+    main()
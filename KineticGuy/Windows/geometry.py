@@ -0,0 +1,119 @@
+#import necessary modules
+import numpy as np
+
+# The lengths under which a vector has no direction, in the units of the points.
+MIN_LENGTH = 1e-6
+
+
+def pixelPoints(landmarks, width, height):
+    '''
+    This function converts normalized landmarks into pixel coordinates, for one frame or many.
+    Args:
+        landmarks: An array shaped (..., landmarks, 2 or more) of the normalized x and y coordinates first.
+        width:     The width of the frames, a number or an array shaped like landmarks without its last two axes.
+        height:    The height of the frames, same as width.
+    Returns:
+        points: A float32 array shaped (..., landmarks, 2) of the x and y coordinates in pixels.
+    '''
+
+    size = np.stack(np.broadcast_arrays(np.asarray(width, dtype=np.float32), np.asarray(height, dtype=np.float32)),
+                    axis=-1)
+    return landmarks[..., :2] * size[..., np.newaxis, :]
+
+
+def relativePositions(points, indexes, origins):
+    '''
+    This function computes the positions of landmarks relative to other landmarks.
+    Args:
+        points:  An array shaped (..., landmarks, 2) of the coordinates of the landmarks.
+        indexes: The indexes of the landmarks.
+        origins: The indexes of the landmark each position is measured from, one per index.
+    Returns:
+        vectors: An array shaped (..., len(indexes), 2) of the vectors from each origin to its landmark.
+    '''
+
+    return points[..., indexes, :] - points[..., origins, :]
+
+
+def distances(points, first, second):
+    '''
+    This function computes the euclidean distances between pairs of landmarks.
+    Args:
+        points: An array shaped (..., landmarks, 2) of the coordinates of the landmarks.
+        first:  The indexes of the first landmark of each pair.
+        second: The indexes of the second landmark of each pair.
+    Returns:
+        distances: An array shaped (..., len(first)) of the distances.
+    '''
+
+    vectors = relativePositions(points, first, second)
+    return np.sqrt((vectors ** 2).sum(axis=-1))
+
+
+def manhattanDistances(points, first, second):
+    '''
+    This function computes the manhattan distances between pairs of landmarks.
+    Args:
+        points: An array shaped (..., landmarks, 2) of the coordinates of the landmarks.
+        first:  The indexes of the first landmark of each pair.
+        second: The indexes of the second landmark of each pair.
+    Returns:
+        distances: An array shaped (..., len(first)) of the distances.
+    '''
+
+    return np.abs(relativePositions(points, first, second)).sum(axis=-1)
+
+
+def vectorAngles(vectors, reference):
+    '''
+    This function computes the unsigned angles between vectors and a reference direction.
+    Args:
+        vectors:   An array shaped (..., 2) of the vectors.
+        reference: An array shaped (..., 2) of the reference directions, broadcast against the vectors.
+    Returns:
+        angles: An array shaped (...) of the angles in degrees between 0 and 180, NaN where a vector or its
+                reference has no length.
+    '''
+
+    vectors = np.asarray(vectors, dtype=np.float64)
+    reference = np.asarray(reference, dtype=np.float64)
+    lengths = np.sqrt((vectors ** 2).sum(axis=-1) * (reference ** 2).sum(axis=-1))
+    dots = (vectors * reference).sum(axis=-1)
+
+    # Clip the cosines, the rounding can push them past 1 on (anti)parallel vectors, and leave the degenerate ones
+    # undefined instead of dividing by zero.
+    valid = lengths > MIN_LENGTH
+    cosines = np.clip(np.divide(dots, lengths, out=np.zeros_like(dots), where=valid), -1.0, 1.0)
+    return np.where(valid, np.degrees(np.arccos(cosines)), np.nan)
+
+
+def jointAngles(points, joints, ends, others):
+    '''
+    This function computes the angles of joints, such as the elbows between the shoulders and the wrists.
+    Args:
+        points: An array shaped (..., landmarks, 2) of the coordinates of the landmarks.
+        joints: The indexes of the landmarks at the vertex of each angle.
+        ends:   The indexes of the landmarks at the end of the first side of each angle.
+        others: The indexes of the landmarks at the end of the second side of each angle.
+    Returns:
+        angles: An array shaped (..., len(joints)) of the angles in degrees between 0 and 180, NaN where a side has
+                no length.
+    '''
+
+    return vectorAngles(relativePositions(points, ends, joints), relativePositions(points, others, joints))
+
+
+def verticalAngles(points, indexes, origins):
+    '''
+    This function computes how far landmarks are raised around other landmarks: the angle between the direction
+    from each origin to its landmark and the downward vertical of the image.
+    Args:
+        points:  An array shaped (..., landmarks, 2) of the image coordinates of the landmarks, y pointing down.
+        indexes: The indexes of the landmarks.
+        origins: The indexes of the landmark each angle is measured around, one per index.
+    Returns:
+        angles: An array shaped (..., len(indexes)) of the angles in degrees, 0 right below the origin, 90 level
+                with it and 180 right above it, NaN where a landmark is on its origin.
+    '''
+
+    return vectorAngles(relativePositions(points, indexes, origins), (0.0, 1.0))
@@ -0,0 +1,110 @@
+#import necessary modules
+
+# The states of the game the gesture rules are bound to.
+WAITING = 'waiting'
+PLAYING = 'playing'
+
+
+class GestureRule:
+    '''
+    This class declares one gesture: the classifier it reads, the condition on the classification, how long the
+    condition must last and how often the gesture may fire, and the action it triggers.
+    Args:
+        name:       The name of the gesture, also the name of the event it emits.
+        state:      The game state (WAITING or PLAYING) in which the rule is evaluated, it is skipped otherwise.
+        classifier: The name of the classifier read by the rule (left_right, hands_joined, jump_crouch or
+                    shoulders_joined). Rules reading the same classifier share its result on each frame.
+        when:       A function of (label, controller) returning true if the gesture is made on this frame.
+        action:     A function of (controller, landmarks, timestamp) run when the gesture fires.
+        frames:     The number of consecutive frames the condition must hold (debounce).
+        hold:       The minimum time in seconds the condition must hold.
+        cooldown:   The minimum time in seconds between two firings.
+        measured:   A boolean value that is if set to true the rule skips the frames whose landmarks were
+                    extrapolated instead of detected, for gestures that should not fire on a prediction.
+    '''
+
+    def __init__(self, name, state, classifier, when, action, frames=1, hold=0.0, cooldown=0.0, measured=False):
+
+        self.name = name
+        self.state = state
+        self.classifier = classifier
+        self.when = when
+        self.action = action
+        self.frames = frames
+        self.hold = hold
+        self.cooldown = cooldown
+        self.measured = measured
+
+        # Initialize the number of consecutive frames the condition held, since when, and the last firing time.
+        self.count = 0
+        self.since = None
+        self.last_fired = None
+
+    def reset(self):
+        '''
+        This function forgets the frames the condition held so far, the cooldown is kept.
+        '''
+
+        self.count = 0
+        self.since = None
+
+    def step(self, label, controller, timestamp):
+        '''
+        This function evaluates the rule on one frame.
+        Args:
+            label:      The classification read by the rule.
+            controller: The GameController object, for conditions on the position of the character.
+            timestamp:  The time of the frame.
+        Returns:
+            fired: A boolean value that is true if the gesture fires on this frame.
+        '''
+
+        # Check if the gesture is not made, then start over.
+        if not self.when(label, controller):
+            self.reset()
+            return False
+
+        self.count += 1
+        if self.since is None:
+            self.since = timestamp
+
+        # Check if the gesture did not last long enough yet, or fired too recently.
+        if self.count < self.frames or timestamp - self.since < self.hold:
+            return False
+        if self.last_fired is not None and timestamp - self.last_fired < self.cooldown:
+            return False
+
+        # Fire, the gesture must be made again for the same number of frames to fire again.
+        self.reset()
+        self.last_fired = timestamp
+        return True
+
+
+class GestureEngine:
+    '''
+    This class groups the gesture rules by game state, so only the rules of the current state are evaluated.
+    Args:
+        rules: The list of GestureRule objects, evaluated in order.
+    '''
+
+    def __init__(self, rules):
+
+        self.rules = list(rules)
+        self.states = {}
+        for rule in self.rules:
+            self.states.setdefault(rule.state, []).append(rule)
+
+    def active(self, state):
+        '''
+        This function returns the rules evaluated in a game state, in order.
+        '''
+
+        return self.states.get(state, ())
+
+    def reset(self):
+        '''
+        This function forgets the frames the conditions of every rule held so far.
+        '''
+
+        for rule in self.rules:
+            rule.reset()
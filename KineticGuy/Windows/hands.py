@@ -0,0 +1,95 @@
+#import necessary modules
+import numpy as np
+
+# The number of landmarks of a hand.
+NUM_HAND_LANDMARKS = 21
+
+# The landmarks at the tips of the thumb, index, middle, ring and pinky fingers, and the joints they are compared
+# with: the thumb tip with its IP joint sideways, the other tips with their PIP joints vertically.
+TIP_IDS = np.array([4, 8, 12, 16, 20])
+JOINT_IDS = np.array([3, 6, 10, 14, 18])
+
+# The direction each tip moves away from its joint when the finger opens, per hand, in (x, y) image coordinates.
+# On the mirrored frame the thumb of the right hand opens to the left and the one of the left hand to the right.
+OPEN_DIRECTIONS = {'Right': np.array([[-1, 0], [0, -1], [0, -1], [0, -1], [0, -1]], dtype=np.float32),
+                   'Left': np.array([[1, 0], [0, -1], [0, -1], [0, -1], [0, -1]], dtype=np.float32)}
+
+# The finger states of the two-finger (V) sign starting the game: only the index and middle fingers are open.
+V_SIGN = (False, True, True, False, False)
+
+
+def fingerStates(points, handedness):
+    '''
+    This function checks which fingers of a hand are open, on one hand or many at once.
+    Args:
+        points:     An array shaped (..., 21, 2 or 3) of the pixel coordinates of the hand landmarks.
+        handedness: The hand, 'Left' or 'Right'.
+    Returns:
+        fingers: A boolean array shaped (..., 5) that is true for the open fingers, from the thumb to the pinky.
+    '''
+
+    moves = points[..., TIP_IDS, :2] - points[..., JOINT_IDS, :2]
+    return (moves * OPEN_DIRECTIONS[handedness]).sum(axis=-1) > 0
+
+
+class HandState:
+    '''
+    This class holds one detected hand: its landmarks as one array, which hand it is and its open fingers.
+    Args:
+        points:     The (21, 3) float32 array of the x and y pixel coordinates and the z depth of the landmarks.
+        handedness: The hand, 'Left' or 'Right'.
+    '''
+
+    __slots__ = ('points', 'handedness', 'fingers')
+
+    def __init__(self, points, handedness):
+
+        self.points = points
+        self.handedness = handedness
+        self.fingers = fingerStates(points, handedness)
+
+    @classmethod
+    def fromLandmarks(cls, hand_landmarks, handedness, width, height, x0=0, y0=0, size=None):
+        '''
+        This function converts the mediapipe landmarks of one hand.
+        Args:
+            hand_landmarks: The landmarks of the hand, or None if the hand is not detected.
+            handedness:     The hand, 'Left' or 'Right'.
+            width:          The width of the image the landmarks are normalized to.
+            height:         The height of the image the landmarks are normalized to.
+            x0, y0:         The top-left corner of the crop the landmarks were detected on, in frame pixels.
+            size:           The size of the square crop, or None if the landmarks were detected on the whole frame.
+        Returns:
+            hand: The new HandState object, or None if the hand is not detected.
+        '''
+
+        if hand_landmarks is None:
+            return None
+
+        # Copy the x, y and z values of all the landmarks in one pass, and scale them to frame pixels.
+        points = np.fromiter((value for landmark in hand_landmarks.landmark
+                              for value in (landmark.x, landmark.y, landmark.z)),
+                             dtype=np.float32, count=NUM_HAND_LANDMARKS * 3).reshape(NUM_HAND_LANDMARKS, 3)
+        scale_x, scale_y = (width, height) if size is None else (size, size)
+        points[:, 0] = x0 + points[:, 0] * scale_x
+        points[:, 1] = y0 + points[:, 1] * scale_y
+        return cls(points, handedness)
+
+    @property
+    def count(self):
+        '''
+        The number of open fingers.
+        '''
+
+        return int(self.fingers.sum())
+
+    def matches(self, fingers):
+        '''
+        This function checks whether the fingers of the hand are exactly in some states.
+        Args:
+            fingers: The five states, true for an open finger, from the thumb to the pinky.
+        Returns:
+            matches: A boolean value that is true if every finger is in its state.
+        '''
+
+        return bool((self.fingers == np.asarray(fingers, dtype=bool)).all())
@@ -0,0 +1,216 @@
+#import necessary modules
+import queue
+import threading
+from time import perf_counter, time
+
+
+class PyAutoGuiBackend:
+    '''
+    This class injects the input events into the OS with pyautogui, without pyautogui's pause after each call.
+    '''
+
+    def __init__(self):
+
+        # Import pyautogui only when input is actually injected, and turn off its sleep after every call.
+        import pyautogui
+        pyautogui.PAUSE = 0
+        self.pyautogui = pyautogui
+
+    def press(self, key):
+        self.pyautogui.press(key)
+
+    def keyDown(self, key):
+        self.pyautogui.keyDown(key)
+
+    def keyUp(self, key):
+        self.pyautogui.keyUp(key)
+
+    def click(self, x=None, y=None, button='left'):
+        self.pyautogui.click(x=x, y=y, button=button)
+
+
+class NullBackend:
+    '''
+    This class drops every input event, to run the control loop without touching the OS input.
+    '''
+
+    def press(self, key):
+        pass
+
+    def keyDown(self, key):
+        pass
+
+    def keyUp(self, key):
+        pass
+
+    def click(self, x=None, y=None, button='left'):
+        pass
+
+
+class RecordingBackend:
+    '''
+    This class stores every input event it receives, so the emitted input can be checked without a game.
+    '''
+
+    def __init__(self):
+
+        # Initialize the list storing (time of injection, action, arguments) of the received events.
+        self.events = []
+
+    def press(self, key):
+        self.events.append((time(), 'press', (key,)))
+
+    def keyDown(self, key):
+        self.events.append((time(), 'keyDown', (key,)))
+
+    def keyUp(self, key):
+        self.events.append((time(), 'keyUp', (key,)))
+
+    def click(self, x=None, y=None, button='left'):
+        self.events.append((time(), 'click', (x, y, button)))
+
+    def actions(self):
+        '''
+        This function returns the received events without their time.
+        Returns:
+            actions: The list of (action, arguments) of the received events.
+        '''
+
+        return [(action, args) for _, action, args in self.events]
+
+
+class InputDispatcher:
+    '''
+    This class queues the input events of the control loop and injects them on a dedicated thread, so the vision
+    loop never waits for the OS. Redundant events, a keyDown of a held key or a keyUp of a released key, are dropped.
+    Args:
+        backend:  The object injecting the events, a PyAutoGuiBackend by default.
+        profiler: An optional Profiler object measuring the injection of each event as the inject stage, and the
+                  time from the frame of each event to its injection as the latency stage.
+    '''
+
+    def __init__(self, backend=None, profiler=None):
+
+        self.backend = PyAutoGuiBackend() if backend is None else backend
+        self.profiler = profiler
+
+        # Initialize the queue storing (timestamp, action, arguments) of the events to inject.
+        self.queue = queue.Queue()
+
+        # Initialize the set of the keys held down, as seen by the control loop.
+        self.held = set()
+
+        # Initialize the counters of the dispatched and dropped events, and the latency of the last event.
+        self.dispatched = 0
+        self.coalesced = 0
+        self.last_latency = 0.0
+
+        self.thread = None
+
+    def start(self):
+        '''
+        This function starts the dispatch thread.
+        Returns:
+            dispatcher: The same InputDispatcher object, so it can be chained on construction.
+        '''
+
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name='InputDispatcher', daemon=True)
+            self.thread.start()
+
+        return self
+
+    def run(self):
+        '''
+        This function is the body of the dispatch thread, it injects the queued events in order.
+        '''
+
+        while True:
+            event = self.queue.get()
+
+            # Check if the dispatcher is stopped.
+            if event is None:
+                break
+
+            self.inject(event)
+
+    def inject(self, event):
+        '''
+        This function injects one event with the backend.
+        Args:
+            event: The (timestamp, action, arguments) of the event.
+        '''
+
+        timestamp, action, args = event
+        start = perf_counter()
+        getattr(self.backend, action)(*args)
+        self.last_latency = time() - timestamp
+        if self.profiler is not None:
+            self.profiler.record('inject', perf_counter() - start)
+            self.profiler.record('latency', self.last_latency)
+        self.dispatched += 1
+
+    def emit(self, action, *args, timestamp=None):
+        '''
+        This function queues one input event and returns immediately.
+        Args:
+            action:    The name of the backend method (press, keyDown, keyUp or click).
+            args:      The arguments of the backend method.
+            timestamp: The time the event refers to, the current time by default.
+        '''
+
+        self.queue.put((time() if timestamp is None else timestamp, action, args))
+
+        # Inject the event on the calling thread if the dispatch thread is not running.
+        if self.thread is None:
+            self.runPending()
+
+    def runPending(self):
+        '''
+        This function injects the queued events on the calling thread.
+        '''
+
+        while True:
+            try:
+                event = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            self.inject(event)
+
+    def press(self, key, timestamp=None):
+        self.emit('press', key, timestamp=timestamp)
+
+    def keyDown(self, key, timestamp=None):
+
+        # Drop the event if the key is already held.
+        if key in self.held:
+            self.coalesced += 1
+            return
+        self.held.add(key)
+        self.emit('keyDown', key, timestamp=timestamp)
+
+    def keyUp(self, key, timestamp=None):
+
+        # Drop the event if the key is not held.
+        if key not in self.held:
+            self.coalesced += 1
+            return
+        self.held.discard(key)
+        self.emit('keyUp', key, timestamp=timestamp)
+
+    def click(self, x=None, y=None, button='left', timestamp=None):
+        self.emit('click', x, y, button, timestamp=timestamp)
+
+    def stop(self):
+        '''
+        This function injects the events still queued, releases the held keys and stops the dispatch thread.
+        '''
+
+        # Release the keys still held, so the game does not keep receiving them.
+        for key in list(self.held):
+            self.keyUp(key)
+
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
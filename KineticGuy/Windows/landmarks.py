@@ -0,0 +1,161 @@
+#import necessary modules
+import numpy as np
+
+# Indexes of the 33 pose landmarks, in the order returned by mediapipe.
+NOSE = 0
+LEFT_EYE_INNER = 1
+LEFT_EYE = 2
+LEFT_EYE_OUTER = 3
+RIGHT_EYE_INNER = 4
+RIGHT_EYE = 5
+RIGHT_EYE_OUTER = 6
+LEFT_EAR = 7
+RIGHT_EAR = 8
+MOUTH_LEFT = 9
+MOUTH_RIGHT = 10
+LEFT_SHOULDER = 11
+RIGHT_SHOULDER = 12
+LEFT_ELBOW = 13
+RIGHT_ELBOW = 14
+LEFT_WRIST = 15
+RIGHT_WRIST = 16
+LEFT_PINKY = 17
+RIGHT_PINKY = 18
+LEFT_INDEX = 19
+RIGHT_INDEX = 20
+LEFT_THUMB = 21
+RIGHT_THUMB = 22
+LEFT_HIP = 23
+RIGHT_HIP = 24
+LEFT_KNEE = 25
+RIGHT_KNEE = 26
+LEFT_ANKLE = 27
+RIGHT_ANKLE = 28
+LEFT_HEEL = 29
+RIGHT_HEEL = 30
+LEFT_FOOT_INDEX = 31
+RIGHT_FOOT_INDEX = 32
+
+NUM_LANDMARKS = 33
+
+# The index of the landmark on the other side of the body, for each landmark: a person seen in a mirror has the
+# landmarks of their left side where the right ones would be.
+MIRROR_INDEXES = np.array([0, 4, 5, 6, 1, 2, 3, 8, 7, 10, 9, 12, 11, 14, 13, 16, 15, 18, 17, 20, 19, 22, 21, 24, 23,
+                           26, 25, 28, 27, 30, 29, 32, 31])
+
+# Pairs of landmark indexes connected in the pose skeleton, the same as mediapipe's POSE_CONNECTIONS.
+POSE_CONNECTIONS = ((0, 1), (1, 2), (2, 3), (3, 7), (0, 4), (4, 5), (5, 6), (6, 8), (9, 10), (11, 12), (11, 13),
+                    (13, 15), (15, 17), (15, 19), (15, 21), (17, 19), (12, 14), (14, 16), (16, 18), (16, 20),
+                    (16, 22), (18, 20), (11, 23), (12, 24), (23, 24), (23, 25), (24, 26), (25, 27), (26, 28),
+                    (27, 29), (28, 30), (29, 31), (30, 32), (27, 31), (28, 32))
+
+
+class LandmarkFrame:
+    '''
+    This class stores the pose landmarks of one frame in a single (33, 4) float32 array of normalized
+    (x, y, z, visibility) values, together with the size of the frame they were detected on. The extrapolated
+    flag is set when the landmarks were predicted from the previous detections instead of detected on the frame.
+    Args:
+        width:  The width of the frame.
+        height: The height of the frame.
+        data:   An optional (33, 4) float32 array to use instead of a new zero filled one.
+    '''
+
+    __slots__ = ('data', 'width', 'height', 'detected', 'extrapolated')
+
+    def __init__(self, width=0, height=0, data=None):
+
+        # Initialize the array storing the landmarks, and whether a person was detected.
+        self.data = np.zeros((NUM_LANDMARKS, 4), dtype=np.float32) if data is None else data
+        self.width = width
+        self.height = height
+        self.detected = data is not None
+        self.extrapolated = False
+
+    @classmethod
+    def fromResults(cls, results, width, height):
+        '''
+        This function creates a landmark frame from the output of the mediapipe pose detection.
+        Args:
+            results: The output of the pose landmarks detection on the frame.
+            width:   The width of the frame.
+            height:  The height of the frame.
+        Returns:
+            landmarks: The new LandmarkFrame object.
+        '''
+
+        return cls(width, height).update(results, width, height)
+
+    def update(self, results, width, height):
+        '''
+        This function copies the output of the mediapipe pose detection into the preallocated array in place.
+        Args:
+            results: The output of the pose landmarks detection on the frame.
+            width:   The width of the frame.
+            height:  The height of the frame.
+        Returns:
+            landmarks: The same LandmarkFrame object.
+        '''
+
+        self.width = width
+        self.height = height
+        self.detected = bool(results.pose_landmarks)
+        self.extrapolated = False
+
+        # Copy the x, y, z and visibility values of all the landmarks in one pass.
+        if self.detected:
+            values = np.fromiter((value for landmark in results.pose_landmarks.landmark
+                                  for value in (landmark.x, landmark.y, landmark.z, landmark.visibility)),
+                                 dtype=np.float32, count=NUM_LANDMARKS * 4)
+            self.data[:] = values.reshape(NUM_LANDMARKS, 4)
+
+        return self
+
+    def mirror(self):
+        '''
+        This function mirrors the landmarks horizontally in place, so the landmarks detected on a frame become the
+        landmarks of the flipped frame: the x-coordinates are reversed and the left and right landmarks swapped.
+        Returns:
+            landmarks: The same LandmarkFrame object.
+        '''
+
+        if self.detected:
+            self.data[:] = self.data[MIRROR_INDEXES]
+            self.data[:, 0] = 1 - self.data[:, 0]
+
+        return self
+
+    def pixel(self, index):
+        '''
+        This function returns the pixel coordinates of one landmark.
+        Args:
+            index: The index of the landmark.
+        Returns:
+            x: The x-coordinate of the landmark in pixels.
+            y: The y-coordinate of the landmark in pixels.
+        '''
+
+        return float(self.data[index, 0]) * self.width, float(self.data[index, 1]) * self.height
+
+    def pixels(self, indexes=slice(None)):
+        '''
+        This function returns the pixel coordinates of several landmarks as one array.
+        Args:
+            indexes: The indexes of the landmarks, all of them by default.
+        Returns:
+            points: A (len(indexes), 2) float array of the x and y coordinates in pixels.
+        '''
+
+        return self.data[indexes, :2] * np.array((self.width, self.height), dtype=np.float32)
+
+    def copy(self):
+        '''
+        This function returns a copy of the landmark frame that does not share its array.
+        Returns:
+            landmarks: The new LandmarkFrame object.
+        '''
+
+        landmarks = LandmarkFrame(self.width, self.height, self.data.copy())
+        landmarks.detected = self.detected
+        landmarks.extrapolated = self.extrapolated
+        return landmarks
@@ -0,0 +1,145 @@
+#import necessary modules
+import argparse
+import json
+from time import perf_counter
+import cv2
+from backends import BACKENDS, createBackend
+from capture import FrameGrabber, SyntheticCamera, openSource
+from capture_modes import negotiateCapture
+from input_dispatch import InputDispatcher, RecordingBackend
+from pipeline import GameController, Pipeline
+from profiler import Profiler
+
+
+def measureLatency(grabber, backend, frames=None, duration=None, driver_ms=0.0, num_of_frames=10):
+    '''
+    This function runs the control loop headless on a started FrameGrabber and measures the time from the capture
+    of each frame to the injection of the input of the gestures detected on it, on the dispatch thread as in the game.
+    Args:
+        grabber:       The started FrameGrabber object.
+        backend:       The pose backend, a SyntheticBackend object plays gestures on frames without a person.
+        frames:        The number of frames processed, until the grabber is closed by default.
+        duration:      The time in seconds the loop runs, until the grabber is closed by default.
+        driver_ms:     The estimated time in ms a frame spends in the camera driver before it is captured, added to
+                       the measured latency for the glass-to-action estimate.
+        num_of_frames: The number of consecutive frames with the hands joined needed to start the game.
+    Returns:
+        report: A dictionary with the number of frames, the frame rate, the frame-to-action and the estimated
+                glass-to-action latency, the time of each stage, the frame counters of the grabber and the events.
+    '''
+
+    # The game input is recorded instead of injected, after the same queue and thread as in the game.
+    profiler = Profiler(window=100000)
+    dispatcher = InputDispatcher(RecordingBackend(), profiler=profiler).start()
+    controller = GameController(dispatcher, num_of_frames=num_of_frames)
+    pipeline = Pipeline(backend, controller, draw=False, profiler=profiler)
+
+    start = perf_counter()
+    try:
+        while grabber.isOpened():
+
+            # Check if enough frames were processed or the time is over.
+            if frames is not None and pipeline.frames >= frames:
+                break
+            if duration is not None and perf_counter() - start >= duration:
+                break
+
+            with profiler.stage('capture'):
+                ok, frame = grabber.read()
+            if not ok:
+                continue
+
+            # Run the control loop stages with the time the frame was captured.
+            _, playing = pipeline.process(frame, timestamp=grabber.timestamp)
+            if not playing:
+                break
+    finally:
+        elapsed = perf_counter() - start
+        dispatcher.stop()
+
+    stages = profiler.summary()
+    latency = stages.pop('latency', None)
+    report = {'frames': pipeline.frames,
+              'seconds': elapsed,
+              'fps': pipeline.frames / elapsed if elapsed > 0 else 0.0,
+              'frame_to_action': latency,
+              'driver_ms': driver_ms,
+              'glass_to_action_ms': None,
+              'stages': stages,
+              'grabber': grabber.stats(),
+              'events': [{'time': timestamp, 'event': name} for timestamp, name in controller.events]}
+
+    # Add the estimated time in the driver to the measured latencies.
+    if latency is not None:
+        report['glass_to_action_ms'] = {key: value + driver_ms for key, value in latency.items() if key != 'count'}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the time from the capture of a frame to the input of the '
+                                                 'gestures detected on it.')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--camera', type=int, default=None, help='The index of the webcam.')
+    source.add_argument('--paths', nargs='+', help='A video file, or images such as sample.png.')
+    parser.add_argument('--backend', choices=BACKENDS, default='synthetic',
+                        help='The pose backend, synthetic plays scripted gestures on any frames.')
+    parser.add_argument('--backend-model', help='The model file of the opencv backend.')
+    parser.add_argument('--frames', type=int, default=300, help='The number of frames processed.')
+    parser.add_argument('--repeat', type=int, default=30, help='The number of times a sequence of images is read.')
+    parser.add_argument('--width', type=int, default=1280, help='The capture width.')
+    parser.add_argument('--height', type=int, default=960, help='The capture height.')
+    parser.add_argument('--target-fps', type=float, default=30.0, help='The capture frame rate needed.')
+    parser.add_argument('--negotiate', action='store_true',
+                        help='Try the capture modes of the camera first and measure in the lowest-latency one.')
+    parser.add_argument('--json', help='The path of a JSON file the report is written to.')
+    args = parser.parse_args()
+
+    # Open the camera, the video or images, or a synthetic camera by default.
+    if args.paths:
+        capture, live = openSource(args.paths, args.repeat), False
+    else:
+        capture = SyntheticCamera() if args.camera is None else cv2.VideoCapture(args.camera)
+        live = True
+
+    # Negotiate the capture mode of a camera if it is specified, and take its estimated driver latency.
+    driver_ms, mode = 0.0, None
+    if args.negotiate and live:
+        chosen = negotiateCapture(capture, args.width, args.height, args.target_fps,
+                                  report=lambda tried: print(f"Tried {tried['mode']}: {tried['measures']['fps']:.1f} "
+                                                             f"FPS, ~{tried['latency_ms']:.1f} ms in the driver"))
+        if chosen is not None:
+            driver_ms, mode = chosen['latency_ms'], chosen['mode']
+            print(f'Chose {mode}')
+        grabber = FrameGrabber(capture, width=None, height=None, live=True).start()
+    else:
+        grabber = FrameGrabber(capture, width=args.width if live else None, height=args.height if live else None,
+                               live=live).start()
+
+    config = {'model': args.backend_model} if args.backend == 'opencv' else {}
+    try:
+        report = measureLatency(grabber, createBackend(args.backend, **config), args.frames, driver_ms=driver_ms)
+    finally:
+        grabber.release()
+    report['mode'] = mode
+
+    print(f"{report['frames']} frames in {report['seconds']:.2f} s, {report['fps']:.1f} FPS, "
+          f"{len(report['events'])} events, grabber {report['grabber']}")
+    for stage, timing in report['stages'].items():
+        print(f"{stage:<18}{timing['mean_ms']:8.2f} ms mean {timing['p95_ms']:8.2f} ms p95 "
+              f"{timing['max_ms']:8.2f} ms max")
+    if report['frame_to_action'] is None:
+        print('No input was dispatched, no latency measured.')
+    else:
+        latency, glass = report['frame_to_action'], report['glass_to_action_ms']
+        print(f"{'frame-to-action':<18}{latency['p50_ms']:8.2f} ms p50 {latency['p95_ms']:8.2f} ms p95 "
+              f"{latency['max_ms']:8.2f} ms max over {latency['count']} inputs")
+        print(f"{'glass-to-action':<18}{glass['p50_ms']:8.2f} ms p50 {glass['p95_ms']:8.2f} ms p95 "
+              f"(~{driver_ms:.1f} ms in the driver)")
+
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
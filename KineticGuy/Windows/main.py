@@ -1,270 +1,267 @@
+import argparse
 import cv2
-import pyautogui
-from pose_detection import detectPose, checkLeftRight, checkHandsJoined, checkJumpCrouch, checkShouldersJoined
-import mediapipe as mp
+from input_dispatch import InputDispatcher, NullBackend
+from events import UdpEventSender, parseAddress
+from overlay import Overlay, textCommand
+from backends import BACKENDS, createBackend
+from capture import FrameGrabber
+from capture_modes import negotiateCapture
+from roi import RoiTracker
+from pipeline import GameController, Pipeline
+from recording import LandmarkRecorder
+from profiler import Profiler
+from smoothing import OneEuroFilter
+from preview import PreviewRenderer, DISPLAY_MODES
+from scheduler import InferenceScheduler
+from motion import MotionGate
 from time import time
 import os
+from engine import ProcessPipeline
+from tuning import tunedSettings, confidences, DEFAULT_CLIP, PROFILE_PATH
 from tkinter import *
 
-calories=0
-# Initialize mediapipe pose class.
-mp_pose = mp.solutions.pose
-
-# Setup the Pose function for images.
-pose_image = mp_pose.Pose(static_image_mode=True, min_detection_confidence=0.5, model_complexity=1)
-
-# Setup the Pose function for videos.
-pose_video = mp_pose.Pose(static_image_mode=False, model_complexity=1, min_detection_confidence=0.7,
-                          min_tracking_confidence=0.7)
-
-# Initialize mediapipe drawing class.
-mp_drawing = mp.solutions.drawing_utils 
-
-
-# Initialize the VideoCapture object to read from the webcam.
-camera_video = cv2.VideoCapture(0)
-camera_video.set(3,1280)
-camera_video.set(4,960)
-
-# Create named window for resizing purposes.
-cv2.namedWindow('Kinetic Guy with Pose Detection', cv2.WINDOW_NORMAL)
-
-# Initialize a variable to store the time of the previous frame.
-time1 = 0
-
-# Initialize a variable to store the state of the game (started or not).
-game_started = False   
-
-# Initialize a variable to store the index of the current horizontal position of the person.
-# At Start the character is at center so the index is 1 and it can move left (value 0) and right (value 2).
-x_pos_index = 1
-
-# Initialize a variable to store the index of the current vertical posture of the person.
-# At Start the person is standing so the index is 1 and he can crouch (value 0) and jump (value 2).
-y_pos_index = 1
-
-# Declare a variable to store the intial y-coordinate of the mid-point of both shoulders of the person.
-MID_Y = None
-
-# Initialize a counter to store count of the number of consecutive frames with person's hands joined.
-counter = 0
-
-# Initialize the number of consecutive frames on which we want to check if person hands joined before starting the game.
-num_of_frames = 10
-
-# Iterate until the webcam is accessed successfully.
-while camera_video.isOpened():
-    
-    # Read a frame.
-    ok, frame = camera_video.read()
-    
-    # Check if frame is not read properly then continue to the next iteration to read the next frame.
-    if not ok:
-        
-        continue
-    
-    # Flip the frame horizontally for natural (selfie-view) visualization.
-    frame = cv2.flip(frame, 1)
-    
-    # Get the height and width of the frame of the webcam video.
-    frame_height, frame_width, _ = frame.shape
-    
-    # Perform the pose detection on the frame.
-    frame, results = detectPose(frame, pose_video, draw=game_started)
-    
-    # Check if the pose landmarks in the frame are detected.
-    if results.pose_landmarks:
-        
-        # Check if the game has started
-        if game_started:
-            
-            
-            
-            
-            # Commands to control the horizontal movements of the character.
-            #--------------------------------------------------------------------------------------------------------------
-            
-            # Get horizontal position of the person in the frame.
-            frame, horizontal_position = checkLeftRight(frame, results, draw=True)
-            
-            
-            
-            # Check if the person has moved to left from center or to center from right.
-            if (horizontal_position=='Hands Left' and x_pos_index!=0) or (horizontal_position=='Center' and x_pos_index==2):
-                calories=calories+0.33
-                
-                # Press the left arrow key.
-                pyautogui.press('left')
-                
-                # Update the horizontal position index of the character.
-                x_pos_index = x_pos_index - 1              
-
-            # Check if the person has moved to Right from center or to center from left.
-            elif (horizontal_position=='Hands Right' and x_pos_index!=2) or (horizontal_position=='Center' and x_pos_index==0):
-                calories=calories+0.33
-                # Press the right arrow key.
-                pyautogui.press('right')
-                
-                # Update the horizontal position index of the character.
-                x_pos_index = x_pos_index + 1
-                        
-            #--------------------------------------------------------------------------------------------------------------
-            frame, game_stats = checkShouldersJoined(frame, results, draw=True)
-            if game_stats == "Quit":
-                pyautogui.click(969,645)
-                break
-                
-                
-        # Otherwise if the game has not started    
-        else:
-            
-            # Write the text representing the way to start the game on the frame. 
-            cv2.putText(frame, 'JOIN BOTH HANDS TO START THE GAME.', (5, frame_height - 10), cv2.FONT_HERSHEY_PLAIN,
-                        2, (0, 255, 0), 3)
-            
-        
-        # Command to Start or resume the game.
-        
-        #------------------------------------------------------------------------------------------------------------------
-  
-        # Check if the left and right hands are joined.
-        if checkHandsJoined(frame, results)[1] == 'Hands Joined':
-
-            # Increment the count of consecutive frames with +ve condition.
-            counter += 1
-            
-            # Check if the counter is equal to the required number of consecutive frames.  
-            if counter == num_of_frames:
-
-                # Command to Start the game first time.
-                #----------------------------------------------------------------------------------------------------------
-                
-                # Check if the game has not started yet.
-                if not(game_started):
-                    #os.startfile("D:\\Games\\KineticGuy\\KineticGuy\\Windows\\NinjaRun.exe")
-                    #pyautogui.keyDown('winleft')
-                    #pyautogui.press('down')
-                    #pyautogui.press('down')
-                    #pyautogui.keyUp('winleft')
-
-                    # Update the value of the variable that stores the game state.
-                    game_started = True
-
-                    # Retreive the y-coordinate of the left shoulder landmark.
-                    left_y = int(results.pose_landmarks.landmark[mp_pose.PoseLandmark.RIGHT_SHOULDER].y * frame_height)
-
-                    # Retreive the y-coordinate of the right shoulder landmark.
-                    right_y = int(results.pose_landmarks.landmark[mp_pose.PoseLandmark.LEFT_SHOULDER].y * frame_height)
-
-                    # Calculate the intial y-coordinate of the mid-point of both shoulders of the person.
-                    MID_Y = abs(right_y + left_y) // 2
-
-                    # Move to 1300, 800, then click the left mouse button to start the game.
-                    pyautogui.click(x=1300, y=800, button='left')
-                
-                #----------------------------------------------------------------------------------------------------------
-
-                # Command to resume the game after death of the character.
-                #----------------------------------------------------------------------------------------------------------
-                
-                # Otherwise if the game has started
-                
-                
-                else:
-                    
-                    # Press the restart key.
-                    pyautogui.click(963,500) 
-                
-                #----------------------------------------------------------------------------------------------------------
-                
-                # Update the counter value to zero.
-                counter = 0
-
-        # Otherwise if the left and right hands are not joined.        
-        else:
-
-            # Update the counter value to zero.
-            counter = 0
-            
-        
-            
-        #------------------------------------------------------------------------------------------------------------------
-
-        # Commands to control the vertical movements of the character.
-        #------------------------------------------------------------------------------------------------------------------
-            
-        
-        # Check if the intial y-coordinate of the mid-point of both shoulders of the person has a value.
-        if MID_Y:
-            
-            # Get posture (jumping, crouching or standing) of the person in the frame. 
-            frame, posture = checkJumpCrouch(frame, results, MID_Y, draw=True)
-            
-            # Check if the person has jumped.
-            if posture == 'Jumping' and y_pos_index == 1:
-                calories=calories+0.166
-                # Press the up arrow key
-                pyautogui.keyDown('up')
-                
-                # Update the veritcal position index of  the character.
-                y_pos_index += 1 
-
-            
-            # Check if the person has stood.
-            elif posture == 'Standing' and y_pos_index   != 1:
-                pyautogui.keyUp('up')
-                # Update the veritcal position index of the character.
-                y_pos_index = 1
-        
-        #------------------------------------------------------------------------------------------------------------------
-    
-    
-    # Otherwise if the pose landmarks in the frame are not detected.       
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Play the game with body movements.')
+    parser.add_argument('--camera', type=int, default=0, help='The index of the webcam.')
+    parser.add_argument('--negotiate-capture', action='store_true',
+                        help='Try the pixel formats, frame rates and buffer sizes of the webcam and keep the mode with '
+                             'the lowest latency delivering --capture-fps.')
+    parser.add_argument('--capture-fps', type=float, default=30.0,
+                        help='The frame rate the negotiated capture mode must deliver.')
+    parser.add_argument('--inference-width', type=int, default=None,
+                        help='The width of the image the pose function sees, the preview keeps the camera resolution. '
+                             'By default it is tuned for this machine.')
+    parser.add_argument('--record', help='The path of a file the landmarks of each frame are recorded to, '
+                                         'for replaying the session with recording.py.')
+    parser.add_argument('--model-complexity', type=int, choices=(0, 1, 2), default=None,
+                        help='The complexity of the pose model, 0 is the fastest and the least accurate. '
+                             'By default it is tuned for this machine.')
+    parser.add_argument('--backend', choices=BACKENDS, default='mediapipe',
+                        help='The pose backend. synthetic plays scripted poses, to try the game without a camera '
+                             'or a model.')
+    parser.add_argument('--backend-model', help='The model file of the opencv backend.')
+    parser.add_argument('--target-ms', type=float, default=33.0,
+                        help='The frame time the settings of this machine are tuned for, on the first launch.')
+    parser.add_argument('--retune', action='store_true', help='Tune the settings of this machine again.')
+    parser.add_argument('--machine-profile', default=PROFILE_PATH,
+                        help='The file the settings tuned for this machine are stored in.')
+    parser.add_argument('--no-smoothing', action='store_true',
+                        help='Classify the raw landmarks instead of the landmarks smoothed over time.')
+    parser.add_argument('--latency-budget', type=float, default=30.0,
+                        help='The average time in ms the pose detection may take per frame, it is skipped on some '
+                             'frames and the landmarks extrapolated when it takes longer. 0 runs it on every frame.')
+    parser.add_argument('--motion-threshold', type=float, default=8.0,
+                        help='The change in grey levels of the player region under which the player counts as still, '
+                             'the pose detection is then skipped and the last landmarks reused. 0 runs it on every '
+                             'frame.')
+    parser.add_argument('--max-skip', type=float, default=0.5,
+                        help='The maximum time in seconds the pose detection is skipped while the player is still.')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='The number of processes running the pose detection, while this one captures, '
+                             'classifies and draws. 0 runs everything in this process.')
+    parser.add_argument('--display', choices=DISPLAY_MODES, default='preview',
+                        help='full: draw and show every frame. preview: show the newest frame at --preview-rate from '
+                             'another thread. headless: draw and show nothing, stop with the quit pose or Ctrl+C.')
+    parser.add_argument('--preview-rate', type=float, default=10.0, help='The frames shown per second in preview mode.')
+    parser.add_argument('--send-events', metavar='HOST[:PORT]',
+                        help='Stream the gesture events over UDP to events.py running on the game machine, instead of '
+                             'injecting the input on this machine.')
+    parser.add_argument('--profile', action='store_true',
+                        help='Measure each stage of the loop and write its p50, p95 and p99 times on the frame.')
+    parser.add_argument('--profile-dump', help='The path of a CSV or JSON file the stage times are written to every '
+                                               'few seconds, implies --profile.')
+    args = parser.parse_args()
+
+    # Read the settings tuned for this machine, tuning them on the first launch, unless the model or the width is
+    # given: the tuned values were chosen together, one does not fit a choice of the other. Only the mediapipe
+    # models are tuned.
+    if args.backend == 'mediapipe' and ((args.model_complexity is None and args.inference_width is None) or
+                                        args.retune):
+        settings = tunedSettings(DEFAULT_CLIP, args.target_ms, args.machine_profile, retune=args.retune,
+                                 report=lambda tried: print('Tuning: {}'.format(tried)))
+    else:
+        settings = {'model_complexity': 1, 'inference_width': 480, 'capture_width': 1280, 'capture_height': 960}
+    model_complexity = settings['model_complexity'] if args.model_complexity is None else args.model_complexity
+    inference_width = settings['inference_width'] if args.inference_width is None else args.inference_width
+    if args.backend == 'mediapipe':
+
+        # Take the confidences of the complexity in use, the lite model needs lower ones.
+        pose_config = {'backend': 'mediapipe', 'model_complexity': model_complexity,
+                       **confidences(model_complexity)}
+    elif args.backend == 'opencv':
+        pose_config = {'backend': 'opencv', 'model': args.backend_model}
     else:
+        pose_config = {'backend': 'synthetic'}
+
+    # Initialize the Profiler object measuring the stages of the loop, which records nothing unless it is enabled.
+    profiler = Profiler(enabled=args.profile or bool(args.profile_dump), dump_path=args.profile_dump)
+
+    # Initialize the InputDispatcher object injecting the key presses and clicks on its own thread, or dropping them
+    # if the gesture events are streamed to the game machine.
+    sender = UdpEventSender(parseAddress(args.send_events)) if args.send_events else None
+    dispatcher = InputDispatcher(NullBackend() if sender else None, profiler=profiler).start()
+
+    # Initialize the FrameGrabber object to read the newest frames from the webcam on its own thread, in the
+    # negotiated capture mode if it is specified.
+    if args.negotiate_capture:
+        capture = cv2.VideoCapture(args.camera)
+        chosen = negotiateCapture(capture, settings['capture_width'], settings['capture_height'], args.capture_fps)
+        if chosen is not None:
+            print('Capture mode: {} (~{:.1f} ms in the driver)'.format(chosen['mode'], chosen['latency_ms']))
+        camera_video = FrameGrabber(capture, width=None, height=None, live=True).start()
+    else:
+        camera_video = FrameGrabber(args.camera, width=settings['capture_width'],
+                                    height=settings['capture_height']).start()
+
+    # Record the landmarks of the session if it is specified.
+    recorder = LandmarkRecorder(args.record) if args.record else None
+
+    # Initialize the GameController object keeping the game state, and the Pipeline object running the control loop
+    # stages on each frame, cropping it around the person found on the previous one.
+    # In preview mode the draw commands are collected but drawn by the render thread.
+    controller = GameController(dispatcher, num_of_frames=10, output=sender)
+    options = dict(tracker=RoiTracker(inference_width=inference_width), recorder=recorder,
+                   smoother=None if args.no_smoothing else OneEuroFilter(), profiler=profiler,
+                   draw=args.display != 'headless', render=args.display == 'full')
+
+    # Run the pose detection in worker processes if it is specified, the frames reach them through shared memory.
+    if args.workers > 0:
+        pipeline = ProcessPipeline(controller, workers=args.workers, pose_factory=createBackend,
+                                   pose_config=pose_config, **options)
+
+    # Otherwise build the pose backend, with the shared Pose function for videos, the only model the loop uses.
+    else:
+        backend = createBackend(**pose_config)
+        scheduler = InferenceScheduler(args.latency_budget / 1000) if args.latency_budget > 0 else None
+        motion = MotionGate(args.motion_threshold, max_skip=args.max_skip) if args.motion_threshold > 0 else None
+        pipeline = Pipeline(backend, controller, scheduler=scheduler, motion=motion, **options)
+
+    # Initialize the Overlay object collecting the draw commands of each frame, unless nothing is shown.
+    overlay = None if args.display == 'headless' else Overlay()
+
+    # Create named window for resizing purposes, or start the thread showing the preview.
+    preview = None
+    if args.display == 'full':
+        cv2.namedWindow('Kinetic Guy with Pose Detection', cv2.WINDOW_NORMAL)
+    elif args.display == 'preview':
+        preview = PreviewRenderer('Kinetic Guy with Pose Detection', max_rate=args.preview_rate,
+                                  mirror=True).start()
+
+    # Initialize a variable to store the time of the previous frame.
+    time1 = 0
+
+    # Iterate until the webcam is accessed successfully.
+    try:
+        while camera_video.isOpened():
+
+            # Read the newest frame.
+            with profiler.stage('capture'):
+                ok, frame = camera_video.read()
+
+            # Check if frame is not read properly then continue to the next iteration to read the next frame.
+            if not ok:
+
+                continue
+
+            # Write the frame rate and the camera counters on the frame, unless nothing is shown.
+            if overlay is not None:
+
+                # Remove the draw commands of the previous frame.
+                overlay.clear()
+
+                # Calculate the frames updates in one second
+                #------------------------------------------------------------------------------------------------------
+
+                # Set the time for this frame to the current time.
+                time2 = time()
+
+                # Check if the difference between the previous and this frame time > 0 to avoid division by zero.
+                if (time2 - time1) > 0:
+
+                    # Calculate the number of frames per second.
+                    frames_per_second = 1.0 / (time2 - time1)
+
+                    # Write the calculated number of frames per second on the frame.
+                    overlay.add([textCommand('FPS: {}'.format(int(frames_per_second)), (10, 30), (0, 255, 0))])
+
+                # Write the number of camera frames dropped and reads without a new frame on the frame.
+                capture_stats = camera_video.stats()
+                overlay.add([textCommand('Dropped: {} Stale: {}'.format(capture_stats['dropped'],
+                                                                        capture_stats['stale']),
+                                         (10, 110), (0, 255, 0))])
+
+                # Write the stage times measured so far on the frame, if the profiler is enabled.
+                overlay.add(profiler.hudCommands())
+
+                # Update the previous frame time to this frame time.
+                # As this frame will become previous frame in next iteration.
+                time1 = time2
+
+                #------------------------------------------------------------------------------------------------------
+
+            # Detect the pose, mirror the landmarks, emit the game input and draw the overlay on the flipped frame.
+            # With worker processes an earlier frame is returned, or None until the first results arrive.
+            frame, playing = pipeline.process(frame, overlay, timestamp=camera_video.timestamp)
+
+            # Write the stage times to the dump file if it is due.
+            profiler.tick()
+
+            # Check if the player quit the game.
+            if not playing:
+                break
+            if frame is None:
+                continue
+
+            # Hand the frame over to the preview thread, and check if 'ESC' was pressed in its window.
+            if preview is not None:
+                preview.submit(frame, overlay.commands)
+                if preview.closed:
+                    break
+
+            # Otherwise display the frame.
+            elif args.display == 'full':
+                with profiler.stage('imshow'):
+                    cv2.imshow('Kinetic Guy with Pose Detection', frame)
+
+                # Wait for 1ms. If a a key is pressed, retreive the ASCII code of the key.
+                with profiler.stage('waitKey'):
+                    k = cv2.waitKey(1) & 0xFF
+
+                # Check if 'ESC' is pressed and break the loop.
+                if(k == 27):
+                    break
+
+    # Stop a headless run with Ctrl+C.
+    except KeyboardInterrupt:
+        pass
+
+    # Stop the capture thread, release the VideoCapture Object and close the windows.
+
+    camera_video.release()
+    if args.workers > 0:
+        pipeline.close()
+    if preview is not None:
+        preview.stop()
+    dispatcher.stop()
+    if sender is not None:
+        sender.close()
+    if recorder is not None:
+        recorder.close()
+    if profiler.dump_path:
+        profiler.dump()
+    cv2.destroyAllWindows()
+    gui=Tk()
+    var=StringVar()
+    calories=controller.calories
+    msg = Message(gui,textvariable=var,relief=RAISED)
+    capture_stats = camera_video.stats()
+    var.set(f"Congratulations! You have burnt {round(calories,2)} calories\n"
+            f"Camera frames: {capture_stats['captured']} captured, {capture_stats['dropped']} dropped")
+    msg.pack()
+    gui.mainloop()
+
 
-        # Update the counter value to zero.
-        counter = 0
-        
-    # Calculate the frames updates in one second
-    #----------------------------------------------------------------------------------------------------------------------
-    
-    
-    
-    # Set the time for this frame to the current time.
-    time2 = time()
-    
-    # Check if the difference between the previous and this frame time > 0 to avoid division by zero.
-    if (time2 - time1) > 0:
-    
-        # Calculate the number of frames per second.
-        frames_per_second = 1.0 / (time2 - time1)
-        
-        # Write the calculated number of frames per second on the frame. 
-        cv2.putText(frame, 'FPS: {}'.format(int(frames_per_second)), (10, 30),cv2.FONT_HERSHEY_PLAIN, 2, (0, 255, 0), 3)
-    
-    # Update the previous frame time to this frame time.
-    # As this frame will become previous frame in next iteration.
-    time1 = time2
-    
-    #----------------------------------------------------------------------------------------------------------------------
-    
-    # Display the frame.            
-    cv2.imshow('Kinetic Guy with Pose Detection', frame)
-    
-    # Wait for 1ms. If a a key is pressed, retreive the ASCII code of the key.
-    k = cv2.waitKey(1) & 0xFF    
-    
-    # Check if 'ESC' is pressed and break the loop.
-    if(k == 27):
-        break
-# Release the VideoCapture Object and close the windows.  
-
-camera_video.release()
-cv2.destroyAllWindows()
-gui=Tk()
-var=StringVar()
-calories=calories
-msg = Message(gui,textvariable=var,relief=RAISED)
-var.set(f"Congratulations! You have burnt {round(calories,2)} calories")
-msg.pack()
-gui.mainloop()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
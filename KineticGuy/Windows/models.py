@@ -0,0 +1,72 @@
+#import necessary modules
+import threading
+
+# The configuration of the Pose function for images.
+IMAGE_CONFIG = dict(static_image_mode=True, min_detection_confidence=0.5, model_complexity=1)
+
+# The configuration of the Pose function for videos.
+VIDEO_CONFIG = dict(static_image_mode=False, model_complexity=1, min_detection_confidence=0.7,
+                    min_tracking_confidence=0.7)
+
+# Initialize the registry storing the Pose functions built so far, by configuration.
+_models = {}
+_lock = threading.Lock()
+
+
+def getPose(**config):
+    '''
+    This function returns the mediapipe Pose function of a configuration, building it on the first request only.
+    Args:
+        config: The keyword arguments passed to mediapipe's Pose, for example model_complexity=0.
+    Returns:
+        pose: The Pose function shared by every caller asking for the same configuration.
+    '''
+
+    key = tuple(sorted(config.items()))
+
+    with _lock:
+
+        # Check if the Pose function of this configuration is not built yet.
+        if key not in _models:
+
+            # Import mediapipe only when a model is actually needed.
+            import mediapipe as mp
+
+            _models[key] = mp.solutions.pose.Pose(**config)
+
+        return _models[key]
+
+
+def getVideoPose(**overrides):
+    '''
+    This function returns the Pose function for videos, optionally with some settings changed.
+    Args:
+        overrides: The settings replacing the ones of VIDEO_CONFIG.
+    Returns:
+        pose: The shared Pose function.
+    '''
+
+    return getPose(**dict(VIDEO_CONFIG, **overrides))
+
+
+def getImagePose(**overrides):
+    '''
+    This function returns the Pose function for images, optionally with some settings changed.
+    Args:
+        overrides: The settings replacing the ones of IMAGE_CONFIG.
+    Returns:
+        pose: The shared Pose function.
+    '''
+
+    return getPose(**dict(IMAGE_CONFIG, **overrides))
+
+
+def closeModels():
+    '''
+    This function closes and forgets all the Pose functions built so far.
+    '''
+
+    with _lock:
+        for pose in _models.values():
+            pose.close()
+        _models.clear()
@@ -0,0 +1,146 @@
+#import necessary modules
+import cv2
+import numpy as np
+from landmarks import NUM_LANDMARKS
+
+
+class MotionGate:
+    '''
+    This class skips the pose detection while nothing moves around the player. Each frame is shrunk to a small
+    grayscale copy and compared block by block with the copy of the frame of the last detection: while no block of
+    the player region changed more than a threshold, the landmarks of that detection are reused. A detection is
+    forced after a maximum time, so a slow drift or a missed motion is caught up.
+    Args:
+        threshold: The mean absolute difference in grey levels over a block above which the block moved.
+        width:     The width in pixels of the grayscale copy, its height keeps the aspect ratio of the frame.
+        block:     The size in pixels of the square blocks of the copy the differences are averaged over.
+        max_skip:  The maximum time in seconds between two detections.
+    '''
+
+    def __init__(self, threshold=8.0, width=80, block=8, max_skip=0.5):
+
+        self.threshold = threshold
+        self.width = width
+        self.block = block
+        self.max_skip = max_skip
+
+        # Initialize the buffers of the shrunk frame, its grayscale copy and the copy of the last detection.
+        self.small = None
+        self.gray = None
+        self.reference = None
+        self.scale = 1.0
+
+        # Initialize the landmarks of the last detection, its timestamp and the motion score of the last frame.
+        self.last = np.zeros((NUM_LANDMARKS, 4), dtype=np.float32)
+        self.last_time = None
+        self.last_detected = False
+        self.last_width = 0
+        self.last_height = 0
+        self.motion = None
+
+        # Initialize the counters of the detected and reused frames.
+        self.inferred = 0
+        self.held = 0
+
+    def shrink(self, frame):
+        '''
+        This function writes the small grayscale copy of a frame into the gray buffer.
+        Args:
+            frame: The BGR frame as captured.
+        Returns:
+            gray: The grayscale copy.
+        '''
+
+        height, width, _ = frame.shape
+        small_height = max(1, round(height * self.width / width))
+        if self.small is None or self.small.shape[:2] != (small_height, self.width):
+            self.small = np.empty((small_height, self.width, 3), dtype=np.uint8)
+            self.gray = np.empty((small_height, self.width), dtype=np.uint8)
+            self.reference = None
+        self.scale = self.width / width
+
+        # Shrink first, the colour conversion then runs on a few thousand pixels only.
+        cv2.resize(frame, (self.width, small_height), dst=self.small, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(self.small, cv2.COLOR_BGR2GRAY, dst=self.gray)
+
+    def score(self, region=None):
+        '''
+        This function measures the motion between the current copy and the copy of the last detection.
+        Args:
+            region: The (x1, y1, x2, y2) region of the player in frame pixels, the whole frame by default.
+        Returns:
+            motion: The largest mean absolute difference in grey levels over a block of the region.
+        '''
+
+        gray, reference = self.gray, self.reference
+        if region is not None:
+            x1, y1, x2, y2 = (int(round(value * self.scale)) for value in region)
+            window = (slice(y1, max(y2, y1 + 1)), slice(x1, max(x2, x1 + 1)))
+            gray, reference = gray[window], reference[window]
+        difference = cv2.absdiff(gray, reference)
+
+        # Average the differences over the whole blocks, or over the whole region if it is smaller than a block.
+        rows, columns = difference.shape[0] // self.block, difference.shape[1] // self.block
+        if rows == 0 or columns == 0:
+            return float(difference.mean()) if difference.size else 0.0
+        blocks = difference[:rows * self.block, :columns * self.block].reshape(rows, self.block, columns, self.block)
+        return float(blocks.mean(axis=(1, 3)).max())
+
+    def shouldInfer(self, frame, timestamp, region=None):
+        '''
+        This function checks whether the detection runs on a frame.
+        Args:
+            frame:     The BGR frame as captured.
+            timestamp: The time the frame was captured.
+            region:    The (x1, y1, x2, y2) region of the player in frame pixels, the whole frame by default.
+        Returns:
+            infer: A boolean value that is true if the detection runs, false if the landmarks are reused.
+        '''
+
+        self.shrink(frame)
+
+        # Run the detection if there is no detection to compare with, or the last one is too old.
+        if self.reference is None or timestamp - self.last_time >= self.max_skip:
+            self.motion = None
+            return True
+
+        self.motion = self.score(region)
+        return self.motion > self.threshold
+
+    def observe(self, landmarks, timestamp):
+        '''
+        This function stores the landmarks of a detection and its frame as the reference of the next frames.
+        Args:
+            landmarks: The LandmarkFrame object storing the detected landmarks.
+            timestamp: The time the frame was captured.
+        '''
+
+        # Swap the buffers, the copy of this frame becomes the reference.
+        if self.reference is None:
+            self.reference = np.empty_like(self.gray)
+        self.reference, self.gray = self.gray, self.reference
+
+        self.last[:] = landmarks.data
+        self.last_time = timestamp
+        self.last_detected = landmarks.detected
+        self.last_width = landmarks.width
+        self.last_height = landmarks.height
+        self.inferred += 1
+
+    def hold(self, landmarks):
+        '''
+        This function writes the landmarks of the last detection, in place.
+        Args:
+            landmarks: The LandmarkFrame object the landmarks are written to.
+        Returns:
+            landmarks: The same LandmarkFrame object.
+        '''
+
+        landmarks.data[:] = self.last
+        landmarks.width = self.last_width
+        landmarks.height = self.last_height
+        landmarks.detected = self.last_detected
+        landmarks.extrapolated = False
+
+        self.held += 1
+        return landmarks
@@ -0,0 +1,160 @@
+#import necessary modules
+import cv2
+import numpy as np
+from landmarks import POSE_CONNECTIONS
+
+
+def textCommand(text, org, color=(255, 255, 255), scale=2, thickness=3):
+    '''
+    This function creates a draw command writing a text on the image.
+    Args:
+        text:      The text to write.
+        org:       The bottom-left corner (x, y) of the text.
+        color:     The BGR color of the text.
+        scale:     The font scale of the text.
+        thickness: The thickness of the text strokes.
+    Returns:
+        command: The draw command applied by the Overlay compositor.
+    '''
+
+    return ('text', text, (int(org[0]), int(org[1])), color, scale, thickness)
+
+
+def lineCommand(pt1, pt2, color=(255, 255, 255), thickness=2):
+    '''
+    This function creates a draw command drawing a line on the image.
+    Args:
+        pt1:       The first end (x, y) of the line.
+        pt2:       The second end (x, y) of the line.
+        color:     The BGR color of the line.
+        thickness: The thickness of the line.
+    Returns:
+        command: The draw command applied by the Overlay compositor.
+    '''
+
+    return ('line', (int(pt1[0]), int(pt1[1])), (int(pt2[0]), int(pt2[1])), color, thickness)
+
+
+def circleCommand(center, radius, color=(255, 255, 255), thickness=2):
+    '''
+    This function creates a draw command drawing a circle on the image.
+    Args:
+        center:    The center (x, y) of the circle.
+        radius:    The radius of the circle.
+        color:     The BGR color of the circle.
+        thickness: The thickness of the circle.
+    Returns:
+        command: The draw command applied by the Overlay compositor.
+    '''
+
+    return ('circle', (int(center[0]), int(center[1])), int(radius), color, thickness)
+
+
+def landmarksCommand(landmarks):
+    '''
+    This function creates a draw command drawing the pose landmarks and their connections on the image.
+    Args:
+        landmarks: The LandmarkFrame object storing the pose landmarks to draw.
+    Returns:
+        command: The draw command applied by the Overlay compositor.
+    '''
+
+    # Store the pixel coordinates and visibility, so the command stays valid when the landmark frame is updated in place.
+    return ('landmarks', landmarks.pixels().astype(np.int32), landmarks.data[:, 3] >= 0.5)
+
+
+def drawLandmarks(image, points, visible):
+    '''
+    This function draws the visible pose landmarks and their connections on the image in place.
+    Args:
+        image:   The image to draw on.
+        points:  A (33, 2) array of the landmark coordinates in pixels.
+        visible: A (33,) boolean array that is true for the landmarks to draw.
+    '''
+
+    points = points.tolist()
+
+    # Draw the connections between the visible landmarks.
+    for start, end in POSE_CONNECTIONS:
+        if visible[start] and visible[end]:
+            cv2.line(image, tuple(points[start]), tuple(points[end]), (49,125,237), 2)
+
+    # Draw the visible landmarks.
+    for point, shown in zip(points, visible.tolist()):
+        if shown:
+            cv2.circle(image, tuple(point), 3, (255,255,255), 3)
+
+
+def applyCommands(image, commands):
+    '''
+    This function applies a list of draw commands on the image in place.
+    Args:
+        image:    The image to draw on.
+        commands: The draw commands created by textCommand, lineCommand, circleCommand and landmarksCommand.
+    Returns:
+        image: The same image with the commands drawn.
+    '''
+
+    for command in commands:
+
+        kind = command[0]
+
+        # Write a text on the image.
+        if kind == 'text':
+            _, text, org, color, scale, thickness = command
+            cv2.putText(image, text, org, cv2.FONT_HERSHEY_PLAIN, scale, color, thickness)
+
+        # Draw a line on the image.
+        elif kind == 'line':
+            _, pt1, pt2, color, thickness = command
+            cv2.line(image, pt1, pt2, color, thickness)
+
+        # Draw a circle on the image.
+        elif kind == 'circle':
+            _, center, radius, color, thickness = command
+            cv2.circle(image, center, radius, color, thickness)
+
+        # Draw the pose landmarks on the image.
+        elif kind == 'landmarks':
+            drawLandmarks(image, command[1], command[2])
+
+    return image
+
+
+class Overlay:
+    '''
+    This class collects the draw commands of one frame, so they are drawn on the frame only once and only
+    when it is shown.
+    '''
+
+    def __init__(self):
+
+        # Initialize the list storing the draw commands of the current frame.
+        self.commands = []
+
+    def add(self, commands):
+        '''
+        This function adds draw commands to the current frame.
+        Args:
+            commands: A list of draw commands.
+        '''
+
+        self.commands.extend(commands)
+
+    def apply(self, image):
+        '''
+        This function draws all the commands of the current frame on the image in place.
+        Args:
+            image: The image to draw on.
+        Returns:
+            image: The same image with the commands drawn.
+        '''
+
+        return applyCommands(image, self.commands)
+
+    def clear(self):
+        '''
+        This function removes the draw commands of the current frame.
+        '''
+
+        self.commands = []
@@ -1,164 +1,196 @@
 
+import argparse
+from contextlib import ExitStack
 import cv2
 import mediapipe as mp
-import pyautogui
+import numpy as np
+from hands import HandState, V_SIGN
+from input_dispatch import InputDispatcher
+from overlay import applyCommands, circleCommand, lineCommand
+from preview import PreviewRenderer, DISPLAY_MODES
 
 
+parser = argparse.ArgumentParser(description='Control Subway Surfers with body movements.')
+# holistic: one Holistic model, the finger state comes from its hand landmarks.
+# pose:     one Pose model, Hands runs on crops around the wrists only while waiting for the start gesture.
+# both:     Holistic and Hands on every frame.
+parser.add_argument('--mode', choices=['holistic', 'pose', 'both'], default='holistic',
+                    help='The models run on each frame.')
+parser.add_argument('--display', choices=DISPLAY_MODES, default='preview',
+                    help='full: draw and show every frame. preview: show the newest frame at --preview-rate from '
+                         'another thread. headless: draw and show nothing.')
+parser.add_argument('--preview-rate', type=float, default=10.0, help='The frames shown per second in preview mode.')
+args = parser.parse_args()
+
 mp_drawing = mp.solutions.drawing_utils
 mp_holistic = mp.solutions.holistic
 mp_hands = mp.solutions.hands
+mp_pose = mp.solutions.pose
 cap = cv2.VideoCapture(0)
-tipIds = [4, 8, 12, 16, 20]
+dispatcher = InputDispatcher().start()
 game_started = 1
 charac_pos = [0,1,0]
 index_pos = 1
 fixedx = None
 fixedy = None
 rec = None
-with mp_hands.Hands(min_detection_confidence=0.5, min_tracking_confidence=0.5) as hands:
-    with mp_holistic.Holistic(min_detection_confidence=0.5,min_tracking_confidence=0.5) as holistic:
-        while True:
-            success, frame = cap.read()
-            frame = cv2.flip(frame, 1)
-            frame = cv2.resize(frame, (440,330))
-            height, width, channel = frame.shape
-            img = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results_holistic = holistic.process(img)
-            results_hands = hands.process(img)
-            img = cv2.cvtColor(img,cv2.COLOR_RGB2BGR)
-            width_hf = int(width/2)
-            height_hf = int(height/2)
-            # Extracting Shoulder Landmarks
-            if results_holistic.pose_landmarks:
-                right_x = int(results_holistic.pose_landmarks.landmark[mp_holistic.PoseLandmark.LEFT_SHOULDER].x * width)-7
-                right_y = int(results_holistic.pose_landmarks.landmark[mp_holistic.PoseLandmark.LEFT_SHOULDER].y * height)
-                # cv2.circle(img, (right_x, right_y), 5, (0, 0, 0), 2)
-                left_x = int(results_holistic.pose_landmarks.landmark[mp_holistic.PoseLandmark.RIGHT_SHOULDER].x * width)+7
-                left_y = int(results_holistic.pose_landmarks.landmark[mp_holistic.PoseLandmark.RIGHT_SHOULDER].y * height)
-                # cv2.circle(img, (left_x, left_y), 5, (0, 0, 0), 2)
-                # cv2.line(img, (left_x,left_y), (right_x,right_y), (255, 0, 255), 2)
-                mid_x = left_x + int(abs(right_x - left_x) / 2)
-                mid_y = int(abs(right_y + left_y) / 2)
-                # cv2.circle(img, (mid_x, mid_y), 2, (255, 255, 0), 2)
-                if rec != None:
-                    # Sideways movement command
-                    if right_x < width_hf and index_pos > 0 and charac_pos[index_pos-1] == 0:
-                        charac_pos[index_pos] = 0
-                        charac_pos[index_pos-1] = 1
-                        pyautogui.press('left')
-                        index_pos -= 1
-                        print("Left key")
-                        print(charac_pos)
-                    if left_x > width_hf and index_pos < 2 and charac_pos[index_pos+1] == 0:
-                        print("Right key")
-                        charac_pos[index_pos] = 0
-                        charac_pos[index_pos+1] = 1
-                        pyautogui.press('right')
-                        index_pos += 1
-                        print(charac_pos)
-                    if right_x > width_hf and left_x < width_hf and index_pos == 0:
-                        charac_pos[index_pos] = 0
-                        charac_pos[index_pos +1] = 1
-                        index_pos += 1
-                        pyautogui.press('right')
-                        print(charac_pos)
-                        print('left to center')
-                    if right_x > width_hf and left_x < width_hf and index_pos == 2:
-                        charac_pos[index_pos] = 0
-                        charac_pos[index_pos -1] = 1
-                        index_pos -= 1
-                        pyautogui.press('left')
-                        print('right to center')
-                        print(charac_pos)
+# Size of the square crop around each wrist in the pose mode, as a fraction of the frame height.
+wrist_crop = 0.4
+
 
-            hand_cor_list_right = []
-            hand_cor_list_left = []
-            hand_type1 = None
-            hand_type2 = None
-            fingers_right = []
-            fingers_left = []
-            # Detection of both hands and extracting both hand landmarks
-            try:
-                hand_type1 = results_hands.multi_handedness[0].classification[0].label
-                hand_type2 = results_hands.multi_handedness[1].classification[0].label
-                for hand_no, hand_landmarks in enumerate(results_hands.multi_hand_landmarks):
-                    if hand_no == 0:
-                        if hand_type1 == 'Left':
-                            for id, lm in enumerate(hand_landmarks.landmark):
-                                cx, cy = int(lm.x * width), int(lm.y * height)
-                                # cv2.circle(img, (cx,cy),2, (100,255,100),2)
-                                hand_cor_list_left.append([id,cx,cy])
-                        elif hand_type1 == 'Right':
-                            for id, lm in enumerate(hand_landmarks.landmark):
-                                cx, cy = int(lm.x * width), int(lm.y * height)
-                                # cv2.circle(img, (cx,cy),2, (100,255,100),2)
-                                hand_cor_list_right.append([id,cx,cy])
-                    if hand_no == 1:
-                        if hand_type2 == 'Left':
-                            for id, lm in enumerate(hand_landmarks.landmark):
-                                cx, cy = int(lm.x * width), int(lm.y * height)
-                                # cv2.circle(img, (cx,cy),2, (100,255,100),2)
-                                hand_cor_list_left.append([id,cx,cy])
-                        elif hand_type2 == 'Right':
-                            for id, lm in enumerate(hand_landmarks.landmark):
-                                cx, cy = int(lm.x * width), int(lm.y * height)
-                                # cv2.circle(img, (cx,cy),2, (100,255,100),2)
-                                hand_cor_list_right.append([id,cx,cy])
-                if hand_cor_list_right != []:
-                    # Right Hand Thumb open Detection
-                    if hand_cor_list_right[tipIds[0]][1] < hand_cor_list_right[tipIds[0] - 1][1]:
-                        fingers_right.append(1)
-                    else:
-                        fingers_right.append(0)
+def wristCrop(img, pose_landmarks, wrist, width, height):
+    '''
+    This function crops a square around one wrist of the pose, where the Hands model looks for the hand.
+    Args:
+        img:            The frame, the RGB image the pose was detected on.
+        pose_landmarks: The pose landmarks of the person.
+        wrist:          The PoseLandmark of the wrist.
+        width:          The width of the frame.
+        height:         The height of the frame.
+    Returns:
+        crop:   The crop around the wrist.
+        x0, y0: The top-left corner of the crop in frame pixels.
+        size:   The size of the square crop in pixels.
+    '''
+    size = int(wrist_crop * height)
+    x0 = min(max(int(pose_landmarks.landmark[wrist].x * width) - size // 2, 0), width - size)
+    y0 = min(max(int(pose_landmarks.landmark[wrist].y * height) - size // 2, 0), height - size)
+    return img[y0:y0 + size, x0:x0 + size], x0, y0, size
 
-                    # Right Hand 4 Fingers open Detection
-                    for id in range(1, 5):
-                        if hand_cor_list_right[tipIds[id]][2] < hand_cor_list_right[tipIds[id] - 2][2]:
-                            fingers_right.append(1)
-                        else:
-                            fingers_right.append(0)
-                    totalFingers_right = fingers_right.count(1)
 
-                if hand_cor_list_left != []:
-                    # Left hand Thumb open detection
-                    if hand_cor_list_left[tipIds[0]][1] > hand_cor_list_left[tipIds[0] - 1][1]:
-                        fingers_left.append(1)
-                    else:
-                        fingers_left.append(0)
+with ExitStack() as stack:
+    # Build only the models the selected mode runs.
+    if args.mode == 'pose':
+        pose = stack.enter_context(mp_pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5))
+        # One Hands model per wrist, so each keeps tracking its own crop.
+        hands_crops = [stack.enter_context(mp_hands.Hands(max_num_hands=1, min_detection_confidence=0.5,
+                                                          min_tracking_confidence=0.5)) for _ in range(2)]
+    else:
+        holistic = stack.enter_context(mp_holistic.Holistic(min_detection_confidence=0.5,min_tracking_confidence=0.5))
+    if args.mode == 'both':
+        hands = stack.enter_context(mp_hands.Hands(min_detection_confidence=0.5, min_tracking_confidence=0.5))
+    # Show the frames from another thread at a capped rate in the preview mode.
+    preview = None
+    if args.display == 'preview':
+        preview = PreviewRenderer('Subway Surfers', max_rate=args.preview_rate).start()
+        stack.callback(preview.stop)
+    # The buffers the scaled frame and its RGB conversion are written to on every frame.
+    small = np.empty((330, 440, 3), dtype=np.uint8)
+    rgb = np.empty((330, 440, 3), dtype=np.uint8)
+    while True:
+        success, frame = cap.read()
+        # Scale the frame down first, so the flip and the conversion run on the small frame. The flipped frame is
+        # a new image, it is handed over to the preview and drawn on.
+        cv2.resize(frame, (440,330), dst=small)
+        img = cv2.flip(small, 1)
+        height, width, channel = img.shape
+        cv2.cvtColor(img, cv2.COLOR_BGR2RGB, dst=rgb)
+        if args.mode == 'pose':
+            results_holistic = pose.process(rgb)
+        else:
+            results_holistic = holistic.process(rgb)
+        if args.mode == 'both':
+            results_hands = hands.process(rgb)
+        width_hf = int(width/2)
+        height_hf = int(height/2)
+        # Extracting Shoulder Landmarks
+        if results_holistic.pose_landmarks:
+            right_x = int(results_holistic.pose_landmarks.landmark[mp_holistic.PoseLandmark.LEFT_SHOULDER].x * width)-7
+            right_y = int(results_holistic.pose_landmarks.landmark[mp_holistic.PoseLandmark.LEFT_SHOULDER].y * height)
+            # cv2.circle(img, (right_x, right_y), 5, (0, 0, 0), 2)
+            left_x = int(results_holistic.pose_landmarks.landmark[mp_holistic.PoseLandmark.RIGHT_SHOULDER].x * width)+7
+            left_y = int(results_holistic.pose_landmarks.landmark[mp_holistic.PoseLandmark.RIGHT_SHOULDER].y * height)
+            # cv2.circle(img, (left_x, left_y), 5, (0, 0, 0), 2)
+            # cv2.line(img, (left_x,left_y), (right_x,right_y), (255, 0, 255), 2)
+            mid_x = left_x + int(abs(right_x - left_x) / 2)
+            mid_y = int(abs(right_y + left_y) / 2)
+            # cv2.circle(img, (mid_x, mid_y), 2, (255, 255, 0), 2)
+            if rec != None:
+                # Sideways movement command
+                if right_x < width_hf and index_pos > 0 and charac_pos[index_pos-1] == 0:
+                    charac_pos[index_pos] = 0
+                    charac_pos[index_pos-1] = 1
+                    dispatcher.press('left')
+                    index_pos -= 1
+                    print("Left key")
+                    print(charac_pos)
+                if left_x > width_hf and index_pos < 2 and charac_pos[index_pos+1] == 0:
+                    print("Right key")
+                    charac_pos[index_pos] = 0
+                    charac_pos[index_pos+1] = 1
+                    dispatcher.press('right')
+                    index_pos += 1
+                    print(charac_pos)
+                if right_x > width_hf and left_x < width_hf and index_pos == 0:
+                    charac_pos[index_pos] = 0
+                    charac_pos[index_pos +1] = 1
+                    index_pos += 1
+                    dispatcher.press('right')
+                    print(charac_pos)
+                    print('left to center')
+                if right_x > width_hf and left_x < width_hf and index_pos == 2:
+                    charac_pos[index_pos] = 0
+                    charac_pos[index_pos -1] = 1
+                    index_pos -= 1
+                    dispatcher.press('left')
+                    print('right to center')
+                    print(charac_pos)
 
-                    # Left Hand 4 Fingers open Detection
-                    for id in range(1, 5):
-                        if hand_cor_list_left[tipIds[id]][2] < hand_cor_list_left[tipIds[id] - 2][2]:
-                            fingers_left.append(1)
-                        else:
-                            fingers_left.append(0)
-                    totalFingers_left = fingers_left.count(1)
-            except:
-                pass
-            # Command to Start the game
-            if fingers_right.count(1) == 2 and fingers_left.count(1) == 2 and fingers_right[1] == 1 and fingers_right[2] == 1 and fingers_left[1] == 1 and fingers_left[1] == 1:
-                fixedx = left_x + int(abs(right_x - left_x) / 2)
-                fixedy = int(abs(right_y + left_y) / 2)
-                rec = 35
-                pyautogui.press('space')
+        # The HandState of each hand of the player found on this frame, by handedness.
+        hands_found = {}
+        # Holistic labels the hands like the pose, so on the mirrored frame its left hand is the player's right.
+        if args.mode == 'holistic':
+            hands_found['Right'] = HandState.fromLandmarks(results_holistic.left_hand_landmarks, 'Right', width, height)
+            hands_found['Left'] = HandState.fromLandmarks(results_holistic.right_hand_landmarks, 'Left', width, height)
+        # Look for the hands around the wrists only until the start gesture is seen.
+        elif args.mode == 'pose' and rec is None and results_holistic.pose_landmarks:
+            for hands_crop, wrist, handedness in ((hands_crops[0], mp_pose.PoseLandmark.LEFT_WRIST, 'Right'),
+                                                  (hands_crops[1], mp_pose.PoseLandmark.RIGHT_WRIST, 'Left')):
+                crop, x0, y0, size = wristCrop(rgb, results_holistic.pose_landmarks, wrist, width, height)
+                results_crop = hands_crop.process(np.ascontiguousarray(crop))
+                if results_crop.multi_hand_landmarks:
+                    hands_found[handedness] = HandState.fromLandmarks(results_crop.multi_hand_landmarks[0],
+                                                                      handedness, width, height, x0, y0, size)
+        # The Hands model labels each hand it detects itself.
+        elif args.mode == 'both' and results_hands.multi_hand_landmarks:
+            for hand_landmarks, handedness in zip(results_hands.multi_hand_landmarks, results_hands.multi_handedness):
+                label = handedness.classification[0].label
+                hands_found[label] = HandState.fromLandmarks(hand_landmarks, label, width, height)
+        hand_right = hands_found.get('Right')
+        hand_left = hands_found.get('Left')
+        # Command to Start the game, the two-finger sign with both hands.
+        if (hand_right is not None and hand_left is not None and hand_right.matches(V_SIGN) and
+                hand_left.matches(V_SIGN)):
+            fixedx = left_x + int(abs(right_x - left_x) / 2)
+            fixedy = int(abs(right_y + left_y) / 2)
+            rec = 35
+            dispatcher.press('space')
 
-            # Up and Down command
-            if fixedy is not None:
-                if (mid_y- fixedy) <= -24:
-                    pyautogui.press('up')
-                    print('jump')
-                elif (mid_y - fixedy) >= 40:
-                    pyautogui.press('down')
-                    print('down')
-            center_arrow = 10
-            cv2.circle(img,(width_hf,height_hf),2,(0,255,255),2)
-            cv2.line(img,(width_hf,height_hf -center_arrow),(width_hf,height_hf+center_arrow),(0,255,0),2)
-            cv2.line(img,(width_hf -center_arrow,height_hf),(width_hf+center_arrow,height_hf),(0,255,0),2)
-            # Lines to be crossed to detect up and down movement
-            # if rec is not None:
-            #     cv2.line(img, (0, fixedy), (width, fixedy), (0, 0, 0), 2)
-            #     cv2.line(img, (0, fixedy - 24), (width, fixedy - 24), (0, 0, 0), 2)
-            #     cv2.line(img, (0, fixedy + rec), (width, fixedy + rec), (0, 0, 0), 2)
+        # Up and Down command
+        if fixedy is not None:
+            if (mid_y- fixedy) <= -24:
+                dispatcher.press('up')
+                print('jump')
+            elif (mid_y - fixedy) >= 40:
+                dispatcher.press('down')
+                print('down')
+        # Nothing is drawn or shown in the headless mode.
+        if args.display == 'headless':
+            continue
+        center_arrow = 10
+        commands = [circleCommand((width_hf,height_hf),2,(0,255,255),2),
+                    lineCommand((width_hf,height_hf -center_arrow),(width_hf,height_hf+center_arrow),(0,255,0),2),
+                    lineCommand((width_hf -center_arrow,height_hf),(width_hf+center_arrow,height_hf),(0,255,0),2)]
+        # Lines to be crossed to detect up and down movement
+        # if rec is not None:
+        #     cv2.line(img, (0, fixedy), (width, fixedy), (0, 0, 0), 2)
+        #     cv2.line(img, (0, fixedy - 24), (width, fixedy - 24), (0, 0, 0), 2)
+        #     cv2.line(img, (0, fixedy + rec), (width, fixedy + rec), (0, 0, 0), 2)
 
-            cv2.imshow('Subway Surfers',img)
+        if preview is not None:
+            preview.submit(img, commands)
+            if preview.closed:
+                break
+        else:
+            cv2.imshow('Subway Surfers',applyCommands(img, commands))
             cv2.waitKey(1)
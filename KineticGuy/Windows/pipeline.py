@@ -0,0 +1,456 @@
+#import necessary modules
+from time import perf_counter, time
+import cv2
+import numpy as np
+from pose_detection import classifyLeftRight, classifyHandsJoined, classifyJumpCrouch, classifyShouldersJoined
+from overlay import textCommand, landmarksCommand
+from landmarks import LandmarkFrame, LEFT_SHOULDER, RIGHT_SHOULDER
+from backends import asBackend
+from profiler import Profiler
+from gestures import GestureEngine, GestureRule, WAITING, PLAYING
+
+# The screen positions clicked to start the game, to restart it after the death of the character and to quit it.
+START_CLICK = (1300, 800)
+RESTART_CLICK = (963, 500)
+QUIT_CLICK = (969, 645)
+
+# The thresholds of the classifiers, passed to them as keyword arguments.
+THRESHOLDS = {'left_right': {'angle': 95}, 'hands_joined': {'distance': 130}, 'jump_crouch': {'band': 35},
+              'shoulders_joined': {'distance': 100}}
+
+
+class GameController:
+    '''
+    This class turns the pose landmarks of each frame into the game input of one player, and keeps the state of
+    the game (started or not, the position of the character, the calories burnt). The gestures are the rules of a
+    GestureEngine, and only the rules of the current game state are evaluated on each frame.
+    Args:
+        dispatcher:    The InputDispatcher object the key presses and clicks are emitted through.
+        num_of_frames: The number of consecutive frames with the hands joined needed to start or resume the game.
+        thresholds:    An optional dictionary overriding some of the THRESHOLDS of the classifiers, for example
+                       {'jump_crouch': {'band': 30}}.
+        rules:         The list of GestureRule objects, the rules of defaultRules() by default.
+        output:        An optional object whose send(name, timestamp) is called with each gesture event, such as a
+                       UdpEventSender streaming them to the game machine.
+    '''
+
+    # The classifiers whose classification is written on the frame.
+    DRAWN = ('left_right', 'jump_crouch', 'shoulders_joined')
+
+    def __init__(self, dispatcher, num_of_frames=10, thresholds=None, rules=None, output=None):
+
+        self.dispatcher = dispatcher
+        self.output = output
+        self.num_of_frames = num_of_frames
+        self.thresholds = {name: dict(values, **(thresholds or {}).get(name, {}))
+                           for name, values in THRESHOLDS.items()}
+        self.engine = GestureEngine(defaultRules(num_of_frames) if rules is None else rules)
+
+        # Initialize a variable to store the state of the game (started or not).
+        self.game_started = False
+
+        # Initialize a variable to store the index of the current horizontal position of the person.
+        # At Start the character is at center so the index is 1 and it can move left (value 0) and right (value 2).
+        self.x_pos_index = 1
+
+        # Initialize a variable to store the index of the current vertical posture of the person.
+        # At Start the person is standing so the index is 1 and he can crouch (value 0) and jump (value 2).
+        self.y_pos_index = 1
+
+        # Declare a variable to store the intial y-coordinate of the mid-point of both shoulders of the person.
+        self.MID_Y = None
+
+        # Initialize the calories burnt and a variable to store whether the player quit the game.
+        self.calories = 0
+        self.quit = False
+
+        # Initialize the list storing (timestamp, name) of the gesture events emitted so far.
+        self.events = []
+
+        # Initialize the classifiers, replaced by measured ones if a profiler is attached.
+        self.instrument(None)
+
+    def instrument(self, profiler):
+        '''
+        This function measures each call of the classifiers as a stage of a profiler.
+        Args:
+            profiler: The Profiler object, or None to call the classifiers directly.
+        '''
+
+        self.classifiers = {'left_right': classifyLeftRight, 'hands_joined': classifyHandsJoined,
+                            'jump_crouch': classifyJumpCrouch, 'shoulders_joined': classifyShouldersJoined}
+        if profiler is not None:
+            self.classifiers = {name: profiler.timed(name)(classifier)
+                                for name, classifier in self.classifiers.items()}
+
+    @property
+    def state(self):
+        '''
+        The current game state, WAITING before the game is started and PLAYING after.
+        '''
+
+        return PLAYING if self.game_started else WAITING
+
+    def emit(self, name, timestamp):
+        '''
+        This function records a gesture event, and sends it to the output if there is one.
+        Args:
+            name:      The name of the event (left, right, jump_start, jump_end, start, restart or quit).
+            timestamp: The time of the frame the event was detected on.
+        '''
+
+        self.events.append((timestamp, name))
+        if self.output is not None:
+            self.output.send(name, timestamp)
+
+    def classify(self, name, landmarks, results, overlay):
+        '''
+        This function runs a classifier on the landmarks of a frame, once per frame however many rules read it.
+        Args:
+            name:      The name of the classifier.
+            landmarks: The LandmarkFrame object storing the pose landmarks of the frame.
+            results:   The dictionary of the classifications of this frame so far.
+            overlay:   An optional Overlay object the classification is written on.
+        Returns:
+            label: The classification.
+        '''
+
+        if name not in results:
+            draw = overlay is not None and name in self.DRAWN
+            args = (landmarks, self.MID_Y) if name == 'jump_crouch' else (landmarks,)
+            label, commands = self.classifiers[name](*args, draw=draw, **self.thresholds[name])
+            if draw:
+                overlay.add(commands)
+            results[name] = label
+
+        return results[name]
+
+    def update(self, landmarks, overlay=None, timestamp=None):
+        '''
+        This function classifies the landmarks of one frame and emits the resulting game input.
+        Args:
+            landmarks: The LandmarkFrame object storing the pose landmarks of the frame.
+            overlay:   An optional Overlay object the classifications are written on.
+            timestamp: The time of the frame, the current time by default.
+        Returns:
+            playing: A boolean value that is false once the player quit the game.
+        '''
+
+        timestamp = time() if timestamp is None else timestamp
+
+        # Check if the pose landmarks in the frame are not detected, then every gesture starts over.
+        if not landmarks.detected:
+            self.engine.reset()
+            return True
+
+        # Write the text representing the way to start the game on the frame.
+        if overlay is not None and not self.game_started:
+            overlay.add([textCommand('JOIN BOTH HANDS TO START THE GAME.', (5, landmarks.height - 10), (0, 255, 0))])
+
+        # Evaluate the rules of the current state and run the actions of the gestures made.
+        results = {}
+        for rule in self.engine.active(self.state):
+            if rule.measured and landmarks.extrapolated:
+                continue
+            label = self.classify(rule.classifier, landmarks, results, overlay)
+            if rule.step(label, self, timestamp):
+                rule.action(self, landmarks, timestamp)
+                self.emit(rule.name, timestamp)
+
+                # Check if the player quit the game.
+                if self.quit:
+                    return False
+
+        return True
+
+    # The actions of the gestures.
+    #----------------------------------------------------------------------------------------------------------------------
+
+    def moveLeft(self, landmarks, timestamp):
+        self.calories=self.calories+0.33
+
+        # Press the left arrow key and update the horizontal position index of the character.
+        self.dispatcher.press('left', timestamp=timestamp)
+        self.x_pos_index = self.x_pos_index - 1
+
+    def moveRight(self, landmarks, timestamp):
+        self.calories=self.calories+0.33
+
+        # Press the right arrow key and update the horizontal position index of the character.
+        self.dispatcher.press('right', timestamp=timestamp)
+        self.x_pos_index = self.x_pos_index + 1
+
+    def startGame(self, landmarks, timestamp):
+
+        # Update the value of the variable that stores the game state.
+        self.game_started = True
+
+        # Retreive the y-coordinates of the left and right shoulder landmarks.
+        left_y = int(landmarks.pixel(RIGHT_SHOULDER)[1])
+        right_y = int(landmarks.pixel(LEFT_SHOULDER)[1])
+
+        # Calculate the intial y-coordinate of the mid-point of both shoulders of the person.
+        self.MID_Y = abs(right_y + left_y) // 2
+
+        # Click the left mouse button at the start button to start the game.
+        self.dispatcher.click(*START_CLICK, button='left', timestamp=timestamp)
+
+    def restartGame(self, landmarks, timestamp):
+
+        # Press the restart button to resume the game after death of the character.
+        self.dispatcher.click(*RESTART_CLICK, timestamp=timestamp)
+
+    def quitGame(self, landmarks, timestamp):
+        self.dispatcher.click(*QUIT_CLICK, timestamp=timestamp)
+        self.quit = True
+
+    def jumpStart(self, landmarks, timestamp):
+        self.calories=self.calories+0.166
+
+        # Press the up arrow key and update the veritcal position index of the character.
+        self.dispatcher.keyDown('up', timestamp=timestamp)
+        self.y_pos_index += 1
+
+    def jumpEnd(self, landmarks, timestamp):
+
+        # Release the up arrow key and update the veritcal position index of the character.
+        self.dispatcher.keyUp('up', timestamp=timestamp)
+        self.y_pos_index = 1
+
+    #----------------------------------------------------------------------------------------------------------------------
+
+
+def defaultRules(num_of_frames=10):
+    '''
+    This function declares the gestures of the game.
+    Args:
+        num_of_frames: The number of consecutive frames with the hands joined needed to start or resume the game.
+    Returns:
+        rules: The list of GestureRule objects, in the order they are evaluated on each frame.
+    '''
+
+    return [
+        # Move to left from center or to center from right, and to right from center or to center from left.
+        GestureRule('left', PLAYING, 'left_right',
+                    lambda label, game: (label == 'Hands Left' and game.x_pos_index != 0) or
+                                        (label == 'Center' and game.x_pos_index == 2),
+                    GameController.moveLeft),
+        GestureRule('right', PLAYING, 'left_right',
+                    lambda label, game: (label == 'Hands Right' and game.x_pos_index != 2) or
+                                        (label == 'Center' and game.x_pos_index == 0),
+                    GameController.moveRight),
+
+        # Join the hands with the shoulders to quit, only on detected landmarks.
+        GestureRule('quit', PLAYING, 'shoulders_joined', lambda label, game: label == 'Quit', GameController.quitGame,
+                    measured=True),
+
+        # Join the hands for some frames to start the game, or to resume it after the death of the character.
+        GestureRule('start', WAITING, 'hands_joined', lambda label, game: label == 'Hands Joined',
+                    GameController.startGame, frames=num_of_frames),
+        GestureRule('restart', PLAYING, 'hands_joined', lambda label, game: label == 'Hands Joined',
+                    GameController.restartGame, frames=num_of_frames),
+
+        # Jump, and stand again.
+        GestureRule('jump_start', PLAYING, 'jump_crouch', lambda label, game: label == 'Jumping' and
+                    game.y_pos_index == 1, GameController.jumpStart),
+        GestureRule('jump_end', PLAYING, 'jump_crouch', lambda label, game: label == 'Standing' and
+                    game.y_pos_index != 1, GameController.jumpEnd),
+    ]
+
+
+def convertBuffer(image, buffer):
+    '''
+    This function returns a buffer an image of the same size can be converted into.
+    Args:
+        image:  The image to convert.
+        buffer: The buffer used on the previous frame, or None.
+    Returns:
+        buffer: The same buffer if it has the size of the image, otherwise a new one.
+    '''
+
+    if buffer is None or buffer.shape != image.shape:
+        buffer = np.empty_like(image)
+    return buffer
+
+
+class Pipeline:
+    '''
+    This class runs the stages of the control loop on one frame: colour conversion, pose detection, mirroring,
+    smoothing, classification and drawing, and measures the time spent in each of them. The detection runs on the
+    frame as captured, and the landmarks are mirrored instead of the frame; the frame is only flipped to be shown.
+    Args:
+        pose:       The pose backend, such as a SyntheticBackend object, or a mediapipe Pose function.
+        controller: The GameController object turning the landmarks into game input.
+        tracker:    An optional RoiTracker object cropping each frame around the person before the detection.
+        draw:       A boolean value that is if set to true the classifications are drawn on the returned frame.
+        render:     A boolean value that is if set to false the draw commands are only collected in the overlay,
+                    and drawn later by a PreviewRenderer.
+        mirror:     A boolean value that is if set to true the landmarks are mirrored horizontally (selfie-view),
+                    and the frame is flipped when the classifications are drawn on it.
+        recorder:   An optional LandmarkRecorder object the raw landmarks of each frame are written to.
+        smoother:   An optional OneEuroFilter object smoothing the landmarks before the classification.
+        scheduler:  An optional InferenceScheduler object skipping the detection on some frames, whose landmarks
+                    are then extrapolated.
+        motion:     An optional MotionGate object skipping the detection while nothing moves around the player,
+                    the landmarks of the last detection are then reused. Its check is measured as the motion stage.
+        profiler:   The Profiler object measuring the stages and the classifiers, an enabled one by default.
+    '''
+
+    # The names of the measured stages, in the order they run.
+    STAGES = ('convert', 'inference', 'mirror', 'smooth', 'classify', 'draw')
+
+    def __init__(self, pose, controller, tracker=None, draw=True, mirror=True, recorder=None, smoother=None,
+                 profiler=None, render=True, scheduler=None, motion=None):
+
+        self.pose = pose
+        self.backend = None if pose is None else asBackend(pose)
+        self.controller = controller
+        self.tracker = tracker
+        self.draw = draw
+        self.render = render
+        self.mirror = mirror
+        self.recorder = recorder
+        self.smoother = smoother
+        self.scheduler = scheduler
+        self.motion = motion
+
+        # Initialize the LandmarkFrame object the landmarks of each frame are copied into.
+        self.landmarks = LandmarkFrame()
+
+        # Initialize the buffers the RGB image and the flipped frame are written to, reused while the size is kept.
+        self.rgb = None
+        self.flipped = None
+
+        # Initialize the profiler measuring the time spent in each stage, and in each classifier.
+        self.profiler = Profiler() if profiler is None else profiler
+        self.controller.instrument(self.profiler)
+        self.frames = 0
+
+    def process(self, frame, overlay=None, timestamp=None):
+        '''
+        This function runs the control loop stages on one frame.
+        Args:
+            frame:     The BGR frame read from the camera.
+            overlay:   An optional Overlay object holding the draw commands of the frame so far. The classifications
+                       are added to it and all its commands are drawn on the frame, if draw is set.
+            timestamp: The time the frame was captured, the current time by default.
+        Returns:
+            frame:   The frame, flipped with the classifications drawn if it was specified, as captured otherwise.
+            playing: A boolean value that is false once the player quit the game.
+        '''
+
+        timestamp = time() if timestamp is None else timestamp
+        frame_height, frame_width, _ = frame.shape
+        t = perf_counter()
+
+        # Check if nothing moved around the player since the last detection, then reuse its landmarks.
+        still = False
+        if self.motion is not None:
+            still = not self.motion.shouldInfer(frame, timestamp, None if self.tracker is None else self.tracker.roi)
+            t = self.lap(t, 'motion')
+        if still:
+            self.motion.hold(self.landmarks)
+            t = self.lap(t, 'inference')
+
+        # Check if the scheduler skips the detection on this frame, then extrapolate the landmarks.
+        elif self.scheduler is not None and not self.scheduler.shouldInfer(timestamp):
+            self.scheduler.extrapolate(self.landmarks, timestamp)
+            t = self.lap(t, 'inference')
+
+        else:
+            start = t
+
+            # Crop the frame around the person if it is specified and convert it from BGR into RGB format.
+            crop = frame if self.tracker is None else self.tracker.crop(frame)
+            self.rgb = convertBuffer(crop, self.rgb)
+            imageRGB = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB, dst=self.rgb)
+
+            # Perform the Pose Detection, the backend writes the landmarks into the landmark frame.
+            t = self.lap(t, 'convert')
+            self.backend.detect(imageRGB, self.landmarks)
+            if self.tracker is not None:
+                self.tracker.update(self.landmarks, frame_width, frame_height)
+            t = self.lap(t, 'inference')
+
+            # Mirror the landmarks horizontally for natural (selfie-view) control, the tracker keeps the region in
+            # the coordinates of the captured frame.
+            if self.mirror:
+                self.landmarks.mirror()
+
+            # Give the scheduler the detected landmarks and the time the detection took, and the motion gate the
+            # landmarks to reuse while the player stands still.
+            if self.scheduler is not None:
+                self.scheduler.observe(self.landmarks, timestamp, perf_counter() - start)
+            if self.motion is not None:
+                self.motion.observe(self.landmarks, timestamp)
+
+        return self.finish(frame, overlay, timestamp, t)
+
+    def finish(self, frame, overlay, timestamp, t):
+        '''
+        This function runs the stages after the pose detection on one frame, whose landmarks are in self.landmarks.
+        Args:
+            frame:     The frame as captured.
+            overlay:   An optional Overlay object holding the draw commands of the frame so far.
+            timestamp: The time the frame was captured.
+            t:         The perf_counter() value when the mirror stage started.
+        Returns:
+            frame:   The frame, flipped with the classifications drawn if it was specified, as captured otherwise.
+            playing: A boolean value that is false once the player quit the game.
+        '''
+
+        draw = self.draw and overlay is not None
+
+        # Write the landmarks to the recording, so the gesture logic can be re-run on them without the detection.
+        if self.recorder is not None:
+            self.recorder.write(self.landmarks, timestamp)
+        t = self.lap(t, 'mirror')
+
+        # Smooth the landmarks, so the jitter of the detection does not flip the classifications.
+        if self.smoother is not None:
+            self.smoother.update(self.landmarks, timestamp)
+        t = self.lap(t, 'smooth')
+
+        # Draw the skeleton under the classifications once the game has started.
+        if draw and self.landmarks.detected and self.controller.game_started:
+            overlay.add([landmarksCommand(self.landmarks)])
+
+        # Classify the landmarks and emit the game input.
+        playing = self.controller.update(self.landmarks, overlay if draw else None, timestamp)
+        t = self.lap(t, 'classify')
+
+        # Flip the frame horizontally like the landmarks, and draw all the commands of this frame on it in place,
+        # unless a PreviewRenderer draws them.
+        if draw and self.render:
+            if self.mirror:
+                self.flipped = convertBuffer(frame, self.flipped)
+                frame = cv2.flip(frame, 1, dst=self.flipped)
+            overlay.apply(frame)
+        self.lap(t, 'draw')
+
+        self.frames += 1
+        return frame, playing
+
+    def lap(self, start, stage):
+        '''
+        This function records the time spent in a stage.
+        Args:
+            start: The perf_counter() value when the stage started.
+            stage: The name of the stage.
+        Returns:
+            end: The perf_counter() value when the stage ended, the start of the next stage.
+        '''
+
+        end = perf_counter()
+        self.profiler.record(stage, end - start)
+        return end
+
+    def summary(self):
+        '''
+        This function summarizes the time spent in each stage over the window of the profiler.
+        Returns:
+            summary: A dictionary with the mean, maximum and percentile times in milliseconds of each stage
+                     and each classifier.
+        '''
+
+        return self.profiler.summary()
@@ -1,374 +1,541 @@
 #import necessary modules
+import math
 import cv2
-from math import hypot
-import mediapipe as mp
-import matplotlib.pyplot as plt
-import math as m
+import numpy as np
+from models import getImagePose, getVideoPose
+from overlay import textCommand, lineCommand, landmarksCommand, applyCommands
+from geometry import MIN_LENGTH, distances, manhattanDistances, verticalAngles
+from backends import asBackend
+from landmarks import (LandmarkFrame, LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_ELBOW, RIGHT_ELBOW, LEFT_WRIST,
+                       RIGHT_WRIST, LEFT_THUMB, RIGHT_THUMB)
+
+# The landmark pairs the classifiers measure, in the order measurePoses() returns them.
+ELBOWS, SHOULDERS = [LEFT_ELBOW, RIGHT_ELBOW], [LEFT_SHOULDER, RIGHT_SHOULDER]
+THUMBS, OPPOSITE_SHOULDERS = [LEFT_THUMB, RIGHT_THUMB], [RIGHT_SHOULDER, LEFT_SHOULDER]
 
 def findAngle(x1, y1, x2, y2):
-    theta = m.acos( (y2 -y1)*(-y1) / (m.sqrt((x2 - x1)**2 + (y2 - y1)**2 ) * y1) )
-    degree = int(180/m.pi)*theta
-    return degree
+    '''
+    This function calculates the angle of the point (x1, y1) around the point (x2, y2) from the downward vertical.
+    Args:
+        x1, y1: The pixel coordinates of the point, such as an elbow.
+        x2, y2: The pixel coordinates of the point it turns around, such as the shoulder.
+    Returns:
+        degree: The angle in degrees, 0 right below and 180 right above, or NaN if the points are the same.
+    '''
+
+    # Measure the angle with plain math, the NumPy kernels only pay off on many angles at once. Like
+    # geometry.verticalAngles, clip the cosine the rounding can push past 1 and leave a zero length undefined.
+    dx, dy = x1 - x2, y1 - y2
+    length = math.hypot(dx, dy)
+    if length <= MIN_LENGTH:
+        return math.nan
+    return math.degrees(math.acos(min(max(dy / length, -1.0), 1.0)))
+
+def measurePoses(points):
+    '''
+    This function measures what the classifiers compare with their thresholds, on one frame or many at once.
+    Args:
+        points: An array shaped (..., landmarks, 2) of the pixel coordinates of the landmarks, such as
+                LandmarkFrame.pixels() or geometry.pixelPoints() of a recording.
+    Returns:
+        measures: A dictionary of arrays shaped (...): the left_angle and right_angle of the elbows around the
+                  shoulders, the wrist_distance, and the left_quit and right_quit manhattan distances between the
+                  thumbs and the opposite shoulders.
+    '''
+
+    left_angle, right_angle = np.moveaxis(verticalAngles(points, ELBOWS, SHOULDERS), -1, 0)
+    wrist_distance = distances(points, [LEFT_WRIST], [RIGHT_WRIST])[..., 0]
+    left_quit, right_quit = np.moveaxis(manhattanDistances(points, THUMBS, OPPOSITE_SHOULDERS), -1, 0)
+    return {'left_angle': left_angle, 'right_angle': right_angle, 'wrist_distance': wrist_distance,
+            'left_quit': left_quit, 'right_quit': right_quit}
+
+def __getattr__(name):
+    '''
+    This function builds the mediapipe objects this module used to create at import time, on first access only.
+    Args:
+        name: The name of the module attribute (pose_image, pose_video, mp_pose or mp_drawing).
+    Returns:
+        value: The requested object.
+    '''
+
+    # Return the shared Pose functions for images and videos from the model registry.
+    if name == 'pose_image':
+        return getImagePose()
+    if name == 'pose_video':
+        return getVideoPose()
+
+    # Return the mediapipe pose and drawing classes.
+    if name in ('mp_pose', 'mp_drawing'):
+        import mediapipe as mp
+        return mp.solutions.pose if name == 'mp_pose' else mp.solutions.drawing_utils
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def drawOutput(image, commands, draw):
+    '''
+    This function returns the image the check functions hand back, with their draw commands applied on a copy.
+    Args:
+        image:    The input image.
+        commands: The draw commands of the classification.
+        draw:     A boolean value that is if set to true the commands are drawn on a copy of the input image.
+    Returns:
+        output_image: A copy of the input image with the commands drawn, or the input image itself if nothing is drawn.
+    '''
+
+    # Check if nothing is specified to be drawn, then no copy of the image is needed.
+    if not draw:
+        return image
+
+    return applyCommands(image.copy(), commands)
+
+def displayOutput(output_image, image=None):
+    '''
+    This function displays the resultant image, next to the original image if it is passed, using matplotlib.
+    Args:
+        output_image: The resultant image.
+        image:        The original input image.
+    '''
 
-# Initialize mediapipe pose class.
-mp_pose = mp.solutions.pose
+    # Import matplotlib only when an image is actually displayed.
+    import matplotlib.pyplot as plt
 
-# Setup the Pose function for images.
-pose_image = mp_pose.Pose(static_image_mode=True, min_detection_confidence=0.5, model_complexity=1)
+    # Check if the original input image is passed to be displayed next to the resultant image.
+    if image is not None:
+        plt.figure(figsize=[22,22])
+        plt.subplot(121);plt.imshow(image[:,:,::-1]);plt.title("Original Image");plt.axis('off');
+        plt.subplot(122);plt.imshow(output_image[:,:,::-1]);plt.title("Output Image");plt.axis('off');
 
-# Setup the Pose function for videos.
-pose_video = mp_pose.Pose(static_image_mode=False, model_complexity=1, min_detection_confidence=0.7,
-                          min_tracking_confidence=0.7)
+    # Otherwise display only the resultant image.
+    else:
+        plt.figure(figsize=[10,10])
+        plt.imshow(output_image[:,:,::-1]);plt.title("Output Image");plt.axis('off');
 
-# Initialize mediapipe drawing class.
-mp_drawing = mp.solutions.drawing_utils 
+def toLandmarkFrame(results, width, height):
+    '''
+    This function returns the landmarks the classifiers work on, converting the mediapipe output if needed.
+    Args:
+        results: A LandmarkFrame object, or the output of the pose landmarks detection on the input image.
+        width:   The width of the input image.
+        height:  The height of the input image.
+    Returns:
+        landmarks: The LandmarkFrame object storing the pose landmarks.
+    '''
+
+    # Check if the landmarks are already extracted.
+    if isinstance(results, LandmarkFrame):
+        return results
+
+    return LandmarkFrame.fromResults(results, width, height)
 
 ## Step 1. Perform pose detection
 #defining a function for pose detection
 
+def runPose(image, pose):
+    '''
+    This function runs the pose function on a BGR image.
+    Args:
+        image: The input image with a prominent person whose pose landmarks needs to be detected.
+        pose:  The pose function required to perform the pose detection.
+    Returns:
+        results: The output of the pose landmarks detection on the input image.
+    '''
+
+    # Convert the image from BGR into RGB format.
+    imageRGB = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+    # Perform the Pose Detection.
+    return pose.process(imageRGB)
+
+def processPose(image, pose, draw=False, landmarks=None, tracker=None):
+    '''
+    This function performs the pose detection on the most prominent person in an image without modifying it, and
+    extracts the landmarks once into a LandmarkFrame.
+    Args:
+        image:     The input image with a prominent person whose pose landmarks needs to be detected.
+        pose:      The pose backend, or the pose function required to perform the pose detection.
+        draw:      A boolean value that is if set to true the function returns a command drawing the pose landmarks.
+        landmarks: An optional LandmarkFrame object that is updated in place instead of creating a new one.
+        tracker:   An optional RoiTracker object cropping the image around the person before the detection.
+    Returns:
+        landmarks: The LandmarkFrame object storing the detected pose landmarks.
+        commands:  The list of draw commands for the detected pose landmarks.
+    '''
+
+    # Get the height and width of the input image.
+    height, width, _ = image.shape
+
+    if landmarks is None:
+        landmarks = LandmarkFrame()
+
+    # Check if the image is specified to be cropped around the person first.
+    if tracker is not None:
+
+        # Perform the Pose Detection on the crop and map the landmarks back to the full image.
+        crop = tracker.crop(image)
+        asBackend(pose).detect(cv2.cvtColor(crop, cv2.COLOR_BGR2RGB), landmarks)
+        tracker.update(landmarks, width, height)
+
+    # Otherwise perform the Pose Detection on the full image and copy the landmarks into the landmark frame.
+    else:
+        asBackend(pose).detect(cv2.cvtColor(image, cv2.COLOR_BGR2RGB), landmarks)
+
+    # Check if any landmarks are detected and are specified to be drawn.
+    commands = []
+    if landmarks.detected and draw:
+        commands.append(landmarksCommand(landmarks))
+
+    return landmarks, commands
+
 def detectPose(image, pose, draw=False, display=False):
     '''
     This function performs the pose detection on the most prominent person in an image.
     Args:
         image:   The input image with a prominent person whose pose landmarks needs to be detected.
         pose:    The pose function required to perform the pose detection.
-        draw:    A boolean value that is if set to true the function draw pose landmarks on the output image. 
-        display: A boolean value that is if set to true the function displays the original input image, and the 
+        draw:    A boolean value that is if set to true the function draw pose landmarks on the output image.
+        display: A boolean value that is if set to true the function displays the original input image, and the
                  resultant image and returns nothing.
     Returns:
         output_image: The input image with the detected pose landmarks drawn if it was specified.
         results:      The output of the pose landmarks detection on the input image.
     '''
-    
-    # Create a copy of the input image.
-    output_image = image.copy()
-    
-    # Convert the image from BGR into RGB format.
-    imageRGB = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-    
+
+    # Get the height and width of the input image.
+    height, width, _ = image.shape
+
     # Perform the Pose Detection.
-    results = pose.process(imageRGB)
-    
+    results = runPose(image, pose)
+
     # Check if any landmarks are detected and are specified to be drawn.
+    commands = []
     if results.pose_landmarks and draw:
-    
-        # Draw Pose Landmarks on the output image.
-        mp_drawing.draw_landmarks(image=output_image, landmark_list=results.pose_landmarks,
-                                  connections=mp_pose.POSE_CONNECTIONS,
-                                  landmark_drawing_spec=mp_drawing.DrawingSpec(color=(255,255,255),
-                                                                               thickness=3, circle_radius=3),
-                                  connection_drawing_spec=mp_drawing.DrawingSpec(color=(49,125,237),
-                                                                               thickness=2, circle_radius=2))
-    
+        commands.append(landmarksCommand(LandmarkFrame.fromResults(results, width, height)))
+
+    # Draw the pose landmarks on a copy of the input image if it was specified.
+    output_image = drawOutput(image, commands, draw or display)
+
     # Check if the original input image and the resultant image are specified to be displayed.
     if display:
-    
+
         # Display the original input image and the resultant image.
-        plt.figure(figsize=[22,22])
-        plt.subplot(121);plt.imshow(image[:,:,::-1]);plt.title("Original Image");plt.axis('off');
-        plt.subplot(122);plt.imshow(output_image[:,:,::-1]);plt.title("Output Image");plt.axis('off');
-        
+        displayOutput(output_image, image)
+
  # Otherwise
     else:
 
         # Return the output image and the results of pose landmarks detection.
         return output_image, results
 
+def classifyLeftRight(landmarks, draw=False, angle=95):
+    '''
+    This function classifies whether the hands of the person are in left side or right side.
+    Args:
+        landmarks: The LandmarkFrame object storing the pose landmarks of the person.
+        draw:      A boolean value that is if set to true the function returns a command writing the hands status.
+        angle:     The angle of an elbow around its shoulder from which the hand counts as raised sideways.
+    Returns:
+        hand_status: The classified status of the hands (Hands Left, Hands Right or Standing).
+        commands:    The list of draw commands for the classification.
+    '''
+
+    # Calculate the angle of each elbow around its shoulder, an elbow on its shoulder has no angle and is not raised.
+    left_angle, right_angle = verticalAngles(landmarks.pixels(), ELBOWS, SHOULDERS).tolist()
+
+    # Compare the angles with a appropriate threshold to check which hand is raised sideways.
+    if left_angle>=angle and right_angle>=angle:
+        hand_status="Standing"
+    elif left_angle>=angle:
+        # Set the hands status to right.
+        hand_status = 'Hands Right'
+    # Otherwise.
+    elif right_angle>=angle:
+        # Set the hands status to left.
+        hand_status = 'Hands Left'
+    else:
+        hand_status="Standing"
+
+    # Check if the posture is specified to be written.
+    commands = []
+    if draw:
+
+        # Write the posture of the person on the image.
+        commands.append(textCommand(hand_status, (5, landmarks.height - 30)))
+
+    return hand_status, commands
+
 def checkLeftRight(image, results, draw=False, display=False):
     '''
     This function checks whether the hands of the person are in left side or right side.
         image:   The input image with a prominent person whose hands status (joined or not) needs to be classified.
         results: The output of the pose landmarks detection on the input image.
-        draw:    A boolean value that is if set to true the function writes the hands status & distance on the output image. 
+        draw:    A boolean value that is if set to true the function writes the hands status & distance on the output image.
         display: A boolean value that is if set to true the function displays the resultant image and returns nothing.
     Returns:
         output_image: The same input image but with the classified hands status written, if it was specified.
         hand_status:  The classified status of the hands whether they are joined or not.
     '''
-    
+
     # Get the height and width of the input image.
     height, width, _ = image.shape
-    
-    # Create a copy of the input image to write the hands status label on.
-    output_image = image.copy()
-    
-    # Get the left elbow landmark x and y coordinates.
-    left_hand_landmark = (results.pose_landmarks.landmark[mp_pose.PoseLandmark.LEFT_ELBOW].x * width,
-                          results.pose_landmarks.landmark[mp_pose.PoseLandmark.LEFT_ELBOW].y * height)
-
-    # Get the right elbow landmark x and y coordinates.
-    right_hand_landmark = (results.pose_landmarks.landmark[mp_pose.PoseLandmark.RIGHT_ELBOW].x * width,
-                           results.pose_landmarks.landmark[mp_pose.PoseLandmark.RIGHT_ELBOW].y * height)
-    
-    # Get the left shoulder landmark x and y coordinates.
-    left_shld_landmark = (results.pose_landmarks.landmark[mp_pose.PoseLandmark.LEFT_SHOULDER].x * width,
-                          results.pose_landmarks.landmark[mp_pose.PoseLandmark.LEFT_SHOULDER].y * height)
-
-    # Get the right shoulder landmark x and y coordinates.
-    right_shld_landmark = (results.pose_landmarks.landmark[mp_pose.PoseLandmark.RIGHT_SHOULDER].x * width,
-                           results.pose_landmarks.landmark[mp_pose.PoseLandmark.RIGHT_SHOULDER].y * height)
 
-    # Compare the distance between the wrists with a appropriate threshold to check if both hands are joined.
-    hand_status = 'Standing'
-    if findAngle(left_hand_landmark[0],left_hand_landmark[1],left_shld_landmark[0],left_shld_landmark[1])>=95 and findAngle(right_hand_landmark[0],right_hand_landmark[1],right_shld_landmark[0],right_shld_landmark[1])>=95:
-        hand_status="Standing"
-    elif findAngle(left_hand_landmark[0],left_hand_landmark[1],left_shld_landmark[0],left_shld_landmark[1])>=95:
-        # Set the hands status to joined.
-        hand_status = 'Hands Right' 
-    # Otherwise.    
-    elif findAngle(right_hand_landmark[0],right_hand_landmark[1],right_shld_landmark[0],right_shld_landmark[1])>=95:
-        # Set the hands status to not joined.
-        hand_status = 'Hands Left'
-    else:
-        hand_status="Standing"
-    # Check if the posture and a horizontal line at the threshold is specified to be drawn.
-    if draw:
+    # Classify the hands status and write it on a copy of the input image if it was specified.
+    hand_status, commands = classifyLeftRight(toLandmarkFrame(results, width, height), draw or display)
+    output_image = drawOutput(image, commands, draw or display)
 
-        # Write the posture of the person on the image. 
-        cv2.putText(output_image, hand_status, (5, height - 30), cv2.FONT_HERSHEY_PLAIN, 2, (255, 255, 255), 3)
-        
-        
     # Check if the output image is specified to be displayed.
     if display:
 
         # Display the output image.
-        plt.figure(figsize=[10,10])
-        plt.imshow(output_image[:,:,::-1]);plt.title("Output Image");plt.axis('off');
-    
+        displayOutput(output_image)
+
     # Otherwise
     else:
-    
+
         # Return the output image and posture indicating whether the person is standing straight or has jumped, or crouched.
         return output_image, hand_status
-    
-def checkHandsJoined(image, results, draw=False, display=False):
+
+def classifyHandsJoined(landmarks, draw=False, distance=130):
     '''
-    This function checks whether the hands of the person are joined or not in an image.
+    This function classifies whether the hands of the person are joined or not.
     Args:
-        image:   The input image with a prominent person whose hands status (joined or not) needs to be classified.
-        results: The output of the pose landmarks detection on the input image.
-        draw:    A boolean value that is if set to true the function writes the hands status & distance on the output image. 
-        display: A boolean value that is if set to true the function displays the resultant image and returns nothing.
+        landmarks: The LandmarkFrame object storing the pose landmarks of the person.
+        draw:      A boolean value that is if set to true the function returns commands writing the hands status &
+                   distance.
+        distance:  The distance in pixels between the wrists under which the hands count as joined.
     Returns:
-        output_image: The same input image but with the classified hands status written, if it was specified.
-        hand_status:  The classified status of the hands whether they are joined or not.
+        hand_status: The classified status of the hands whether they are joined or not.
+        commands:    The list of draw commands for the classification.
     '''
-    
-    # Get the height and width of the input image.
-    height, width, _ = image.shape
-    
-    # Create a copy of the input image to write the hands status label on.
-    output_image = image.copy()
-    
-    # Get the left wrist landmark x and y coordinates.
-    left_wrist_landmark = (results.pose_landmarks.landmark[mp_pose.PoseLandmark.LEFT_WRIST].x * width,
-                          results.pose_landmarks.landmark[mp_pose.PoseLandmark.LEFT_WRIST].y * height)
-
-    # Get the right wrist landmark x and y coordinates.
-    right_wrist_landmark = (results.pose_landmarks.landmark[mp_pose.PoseLandmark.RIGHT_WRIST].x * width,
-                           results.pose_landmarks.landmark[mp_pose.PoseLandmark.RIGHT_WRIST].y * height)
-    
+
     # Calculate the euclidean distance between the left and right wrist.
-    euclidean_distance = int(hypot(left_wrist_landmark[0] - right_wrist_landmark[0],
-                                   left_wrist_landmark[1] - right_wrist_landmark[1]))
-    
+    euclidean_distance = int(distances(landmarks.pixels(), [LEFT_WRIST], [RIGHT_WRIST])[0])
+
     # Compare the distance between the wrists with a appropriate threshold to check if both hands are joined.
-    if euclidean_distance < 130:
-        
+    if euclidean_distance < distance:
+
         # Set the hands status to joined.
         hand_status = 'Hands Joined'
-        
+
         # Set the color value to green.
         color = (0, 255, 0)
-        
-    # Otherwise.    
+
+    # Otherwise.
     else:
-        
+
         # Set the hands status to not joined.
         hand_status = 'Hands Not Joined'
-        
+
         # Set the color value to red.
         color = (0, 0, 255)
-        
-    # Check if the Hands Joined status and hands distance are specified to be written on the output image.
+
+    # Check if the Hands Joined status and hands distance are specified to be written.
+    commands = []
     if draw:
 
-        # Write the classified hands status on the image. 
-        cv2.putText(output_image, hand_status, (10, 30), cv2.FONT_HERSHEY_PLAIN, 2, color, 3)
-        
-        # Write the the distance between the wrists on the image. 
-        cv2.putText(output_image, f'Distance: {euclidean_distance}', (10, 70),
-                    cv2.FONT_HERSHEY_PLAIN, 2, color, 3)
-        
+        # Write the classified hands status on the image.
+        commands.append(textCommand(hand_status, (10, 30), color))
+
+        # Write the the distance between the wrists on the image.
+        commands.append(textCommand(f'Distance: {euclidean_distance}', (10, 70), color))
+
+    return hand_status, commands
+
+def checkHandsJoined(image, results, draw=False, display=False):
+    '''
+    This function checks whether the hands of the person are joined or not in an image.
+    Args:
+        image:   The input image with a prominent person whose hands status (joined or not) needs to be classified.
+        results: The output of the pose landmarks detection on the input image.
+        draw:    A boolean value that is if set to true the function writes the hands status & distance on the output image.
+        display: A boolean value that is if set to true the function displays the resultant image and returns nothing.
+    Returns:
+        output_image: The same input image but with the classified hands status written, if it was specified.
+        hand_status:  The classified status of the hands whether they are joined or not.
+    '''
+
+    # Get the height and width of the input image.
+    height, width, _ = image.shape
+
+    # Classify the hands status and write it on a copy of the input image if it was specified.
+    hand_status, commands = classifyHandsJoined(toLandmarkFrame(results, width, height), draw or display)
+    output_image = drawOutput(image, commands, draw or display)
+
     # Check if the output image is specified to be displayed.
     if display:
 
         # Display the output image.
-        plt.figure(figsize=[10,10])
-        plt.imshow(output_image[:,:,::-1]);plt.title("Output Image");plt.axis('off');
-    
+        displayOutput(output_image)
+
     # Otherwise
     else:
-    
+
         # Return the output image and the classified hands status indicating whether the hands are joined or not.
         return output_image, hand_status
 
-
-def checkJumpCrouch(image, results, MID_Y=250, draw=False, display=False):
+def classifyJumpCrouch(landmarks, MID_Y=250, draw=False, band=35):
     '''
-    This function checks the posture (Jumping, Crouching or Standing) of the person in an image.
+    This function classifies the posture (Jumping, Crouching or Standing) of the person.
     Args:
-        image:   The input image with a prominent person whose the posture needs to be checked.
-        results: The output of the pose landmarks detection on the input image.
-        MID_Y:   The intial center y-coordinate of both shoulders landmarks of the person recorded during starting
-                 the game. This will give the idea of the person's height when he is standing straight.
-        draw:    A boolean value that is if set to true the function writes the posture on the output image. 
-        display: A boolean value that is if set to true the function displays the resultant image and returns nothing.
+        landmarks: The LandmarkFrame object storing the pose landmarks of the person.
+        MID_Y:     The intial center y-coordinate of both shoulders landmarks of the person recorded during starting
+                   the game.
+        draw:      A boolean value that is if set to true the function returns commands writing the posture and the
+                   threshold line.
+        band:      The distance in pixels above or below MID_Y the shoulders move for a jump or a crouch.
     Returns:
-        output_image: The input image with the person's posture written, if it was specified.
-        posture:      The posture (Jumping, Crouching or Standing) of the person in an image.
+        posture:  The posture (Jumping, Crouching or Standing) of the person.
+        commands: The list of draw commands for the classification.
     '''
-    
-    # Get the height and width of the image.
-    height, width, _ = image.shape
-    
-    # Create a copy of the input image to write the posture label on.
-    output_image = image.copy()
-    
-    # Retreive the y-coordinate of the left shoulder landmark.
-    left_y = int(results.pose_landmarks.landmark[mp_pose.PoseLandmark.RIGHT_SHOULDER].y * height)
 
-    # Retreive the y-coordinate of the right shoulder landmark.
-    right_y = int(results.pose_landmarks.landmark[mp_pose.PoseLandmark.LEFT_SHOULDER].y * height)
+    # Retreive the y-coordinates of the left and right shoulder landmarks.
+    left_y, right_y = (landmarks.data[[RIGHT_SHOULDER, LEFT_SHOULDER], 1] * landmarks.height).astype(int).tolist()
 
     # Calculate the y-coordinate of the mid-point of both shoulders.
     actual_mid_y = abs(right_y + left_y) // 2
-    
+
     # Calculate the upper and lower bounds of the threshold.
-    lower_bound = MID_Y-35
-    upper_bound = MID_Y+35
-    
-    # Check if the person has jumped that is when the y-coordinate of the mid-point 
+    lower_bound = MID_Y-band
+    upper_bound = MID_Y+band
+
+    # Check if the person has jumped that is when the y-coordinate of the mid-point
     # of both shoulders is less than the lower bound.
     if (actual_mid_y < lower_bound):
-        
+
         # Set the posture to jumping.
         posture = 'Jumping'
-    
-    # Check if the person has crouched that is when the y-coordinate of the mid-point 
+
+    # Check if the person has crouched that is when the y-coordinate of the mid-point
     # of both shoulders is greater than the upper bound.
     elif (actual_mid_y > upper_bound):
-        
+
         # Set the posture to crouching.
         posture = 'Crouching'
-    
-    # Otherwise the person is standing and the y-coordinate of the mid-point 
-    # of both shoulders is between the upper and lower bounds.    
+
+    # Otherwise the person is standing and the y-coordinate of the mid-point
+    # of both shoulders is between the upper and lower bounds.
     else:
-        
+
         # Set the posture to Standing straight.
         posture = 'Standing'
-        
+
     # Check if the posture and a horizontal line at the threshold is specified to be drawn.
+    commands = []
     if draw:
 
-        # Write the posture of the person on the image. 
-        cv2.putText(output_image, posture, (5, height - 50), cv2.FONT_HERSHEY_PLAIN, 2, (255, 255, 255), 3)
-        
+        # Write the posture of the person on the image.
+        commands.append(textCommand(posture, (5, landmarks.height - 50)))
+
         # Draw a line at the intial center y-coordinate of the person (threshold).
-        cv2.line(output_image, (0, MID_Y),(width, MID_Y),(255, 255, 255), 2)
-        
+        commands.append(lineCommand((0, MID_Y), (landmarks.width, MID_Y)))
+
+    return posture, commands
+
+def checkJumpCrouch(image, results, MID_Y=250, draw=False, display=False):
+    '''
+    This function checks the posture (Jumping, Crouching or Standing) of the person in an image.
+    Args:
+        image:   The input image with a prominent person whose the posture needs to be checked.
+        results: The output of the pose landmarks detection on the input image.
+        MID_Y:   The intial center y-coordinate of both shoulders landmarks of the person recorded during starting
+                 the game. This will give the idea of the person's height when he is standing straight.
+        draw:    A boolean value that is if set to true the function writes the posture on the output image.
+        display: A boolean value that is if set to true the function displays the resultant image and returns nothing.
+    Returns:
+        output_image: The input image with the person's posture written, if it was specified.
+        posture:      The posture (Jumping, Crouching or Standing) of the person in an image.
+    '''
+
+    # Get the height and width of the image.
+    height, width, _ = image.shape
+
+    # Classify the posture and write it on a copy of the input image if it was specified.
+    posture, commands = classifyJumpCrouch(toLandmarkFrame(results, width, height), MID_Y, draw or display)
+    output_image = drawOutput(image, commands, draw or display)
+
     # Check if the output image is specified to be displayed.
     if display:
 
         # Display the output image.
-        plt.figure(figsize=[10,10])
-        plt.imshow(output_image[:,:,::-1]);plt.title("Output Image");plt.axis('off');
-    
+        displayOutput(output_image)
+
     # Otherwise
     else:
-    
+
         # Return the output image and posture indicating whether the person is standing straight or has jumped, or crouched.
         return output_image, posture
 
-def checkShouldersJoined(image, results, draw=False, display=False):
+def classifyShouldersJoined(landmarks, draw=False, distance=100):
     '''
-    This function checks whether the hands of the person are joined with their shoulders.
+    This function classifies whether the hands of the person are joined with their shoulders (the quit pose).
     Args:
-        image:   The input image with a prominent person whose hands status (joined or not) needs to be classified.
-        results: The output of the pose landmarks detection on the input image.
-        draw:    A boolean value that is if set to true the function writes the hands status & distance on the output image. 
-        display: A boolean value that is if set to true the function displays the resultant image and returns nothing.
+        landmarks: The LandmarkFrame object storing the pose landmarks of the person.
+        draw:      A boolean value that is if set to true the function returns a command writing the hands status.
+        distance:  The manhattan distance in pixels between each thumb and the opposite shoulder under which the
+                   hands count as joined with the shoulders.
     Returns:
-        output_image: The same input image but with the classified hands status written, if it was specified.
-        hand_status:  The classified status of the hands whether they are joined or not.
+        hand_status: The classified status of the hands (Quit or Game).
+        commands:    The list of draw commands for the classification.
     '''
-    
-    # Get the height and width of the input image.
-    height, width, _ = image.shape
-    
-    # Create a copy of the input image to write the hands status label on.
-    output_image = image.copy()
-    
-    # Get the left thumb landmark x and y coordinates.
-    left_thumb_landmark = (results.pose_landmarks.landmark[mp_pose.PoseLandmark.LEFT_THUMB].x * width,
-                          results.pose_landmarks.landmark[mp_pose.PoseLandmark.LEFT_THUMB].y * height)
-
-    # Get the right thumb landmark x and y coordinates.
-    right_thumb_landmark = (results.pose_landmarks.landmark[mp_pose.PoseLandmark.RIGHT_THUMB].x * width,
-                           results.pose_landmarks.landmark[mp_pose.PoseLandmark.RIGHT_THUMB].y * height)
-    
-    # Get the left shoulder landmark x and y coordinates.
-    left_shld_landmark = (results.pose_landmarks.landmark[mp_pose.PoseLandmark.LEFT_SHOULDER].x * width,
-                          results.pose_landmarks.landmark[mp_pose.PoseLandmark.LEFT_SHOULDER].y * height)
-
-    # Get the right shoulder landmark x and y coordinates.
-    right_shld_landmark = (results.pose_landmarks.landmark[mp_pose.PoseLandmark.RIGHT_SHOULDER].x * width,
-                           results.pose_landmarks.landmark[mp_pose.PoseLandmark.RIGHT_SHOULDER].y * height)
-    
-    
-    
-    
-    # Calculate the euclidean distance between the left and right hands and shoulders.
-    manhat_distance1 = int(abs(left_thumb_landmark[0] - right_shld_landmark[0])+abs(left_thumb_landmark[1] - right_shld_landmark[1]))
-    manhat_distance2= int(abs(right_thumb_landmark[0] - left_shld_landmark[0])+abs(right_thumb_landmark[1] - left_shld_landmark[1]))
-
-    
+
+    # Calculate the manhattan distance between each thumb and the opposite shoulder.
+    manhat_distance1, manhat_distance2 = \
+        manhattanDistances(landmarks.pixels(), THUMBS, OPPOSITE_SHOULDERS).astype(int).tolist()
+
     # Compare the distance between the wrists with a appropriate threshold to check if both hands are joined.
-    if manhat_distance1 < 100 and manhat_distance2 < 100:
-        
+    if manhat_distance1 < distance and manhat_distance2 < distance:
+
         # Set the hands status to joined.
         hand_status = 'Quit'
-        
+
         # Set the color value to green.
         color = (0, 255, 0)
-        
-    # Otherwise.    
+
+    # Otherwise.
     else:
-        
+
         # Set the hands status to not joined.
         hand_status = 'Game'
-        
+
         # Set the color value to red.
         color = (0, 0, 255)
-        
-    # Check if the Hands Joined status and hands distance are specified to be written on the output image.
+
+    # Check if the Hands Joined status is specified to be written.
+    commands = []
     if draw:
 
-        # Write the classified hands status on the image. 
-        cv2.putText(output_image, hand_status, (10, 30), cv2.FONT_HERSHEY_PLAIN, 2, color, 3)
-        
-        # Write the the distance between the wrists on the image. 
-        
+        # Write the classified hands status on the image.
+        commands.append(textCommand(hand_status, (10, 30), color))
+
+    return hand_status, commands
+
+def checkShouldersJoined(image, results, draw=False, display=False):
+    '''
+    This function checks whether the hands of the person are joined with their shoulders.
+    Args:
+        image:   The input image with a prominent person whose hands status (joined or not) needs to be classified.
+        results: The output of the pose landmarks detection on the input image.
+        draw:    A boolean value that is if set to true the function writes the hands status & distance on the output image.
+        display: A boolean value that is if set to true the function displays the resultant image and returns nothing.
+    Returns:
+        output_image: The same input image but with the classified hands status written, if it was specified.
+        hand_status:  The classified status of the hands whether they are joined or not.
+    '''
+
+    # Get the height and width of the input image.
+    height, width, _ = image.shape
+
+    # Classify the hands status and write it on a copy of the input image if it was specified.
+    hand_status, commands = classifyShouldersJoined(toLandmarkFrame(results, width, height), draw or display)
+    output_image = drawOutput(image, commands, draw or display)
+
     # Check if the output image is specified to be displayed.
     if display:
 
         # Display the output image.
-        plt.figure(figsize=[10,10])
-        plt.imshow(output_image[:,:,::-1]);plt.title("Output Image");plt.axis('off');
-    
+        displayOutput(output_image)
+
     # Otherwise
     else:
-    
+
         # Return the output image and the classified hands status indicating whether the hands are joined or not.
-        return output_image, hand_status
\ No newline at end of file
+        return output_image, hand_status
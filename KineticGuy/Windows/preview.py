@@ -0,0 +1,112 @@
+#import necessary modules
+import threading
+from time import perf_counter
+import cv2
+from overlay import applyCommands
+
+# The display modes of the control loops.
+# full:     the overlay is drawn and the frame shown on every frame, by the control loop.
+# preview:  the newest frame and overlay are drawn and shown at a capped rate, by the PreviewRenderer thread.
+# headless: nothing is drawn or shown.
+DISPLAY_MODES = ('full', 'preview', 'headless')
+
+
+class PreviewRenderer:
+    '''
+    This class shows the newest frame of the control loop with its draw commands on its own thread, at a capped
+    rate, so the control loop only hands over references and never waits for the window.
+    Args:
+        window:   The name of the window.
+        max_rate: The maximum number of frames shown per second.
+        mirror:   A boolean value that is if set to true the frames are flipped horizontally before the commands are
+                  drawn, for the control loops mirroring the landmarks instead of the frames.
+    '''
+
+    def __init__(self, window, max_rate=10.0, mirror=False):
+
+        self.window = window
+        self.interval = 1.0 / max_rate
+        self.mirror = mirror
+
+        # Initialize the newest (frame, commands) submitted, and the condition waking up the render thread.
+        self.latest = None
+        self.condition = threading.Condition()
+
+        # Initialize the variables storing the state of the render thread, and whether ESC was pressed.
+        self.running = False
+        self.closed = False
+        self.thread = None
+
+        # Initialize the counter of frames shown.
+        self.frames_shown = 0
+
+    def start(self):
+        '''
+        This function starts the render thread.
+        Returns:
+            renderer: The same PreviewRenderer object, so it can be chained on construction.
+        '''
+
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self.run, name='PreviewRenderer', daemon=True)
+            self.thread.start()
+
+        return self
+
+    def submit(self, frame, commands=()):
+        '''
+        This function hands the newest frame and its draw commands over to the render thread, replacing the ones
+        not shown yet. The frame is not copied, the control loop must not write to it afterwards.
+        Args:
+            frame:    The BGR frame.
+            commands: The list of draw commands of the frame.
+        '''
+
+        with self.condition:
+            self.latest = (frame, commands)
+            self.condition.notify()
+
+    def run(self):
+        '''
+        This function is the body of the render thread.
+        '''
+
+        cv2.namedWindow(self.window, cv2.WINDOW_NORMAL)
+
+        while True:
+
+            # Wait for a new frame.
+            with self.condition:
+                self.condition.wait_for(lambda: not self.running or self.latest is not None)
+                if not self.running:
+                    break
+                frame, commands = self.latest
+                self.latest = None
+            start = perf_counter()
+
+            # Draw the commands on a copy, flipped if the frame is mirrored, the frame may still be read by the control
+            # loop, and show it.
+            image = applyCommands(cv2.flip(frame, 1) if self.mirror else frame.copy(), commands)
+            cv2.imshow(self.window, image)
+            self.frames_shown += 1
+
+            # Keep the window responsive until the next frame is due, and check if 'ESC' is pressed.
+            wait = int(1000 * (self.interval - (perf_counter() - start)))
+            if (cv2.waitKey(max(wait, 1)) & 0xFF) == 27:
+                self.closed = True
+
+        cv2.destroyWindow(self.window)
+
+    def stop(self):
+        '''
+        This function stops the render thread and closes the window.
+        '''
+
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
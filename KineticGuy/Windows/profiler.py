@@ -0,0 +1,200 @@
+#import necessary modules
+import csv
+import json
+import threading
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from time import perf_counter, time
+import numpy as np
+from overlay import textCommand
+
+# The percentiles kept for each stage.
+PERCENTILES = (50, 95, 99)
+
+# The context returned by stage() when the profiler is disabled, shared so nothing is allocated per call.
+_NULL_CONTEXT = nullcontext()
+
+
+class Profiler:
+    '''
+    This class measures the time spent in the named stages of the control loop over a rolling window of frames,
+    and reports the percentiles of each stage on the frame (HUD) or to a CSV or JSON file.
+    A disabled profiler records nothing: stage() returns a shared empty context, timed() returns the function
+    unchanged and record() returns immediately.
+    Args:
+        enabled:       A boolean value that is if set to false nothing is measured.
+        window:        The number of most recent measurements of each stage the percentiles are computed over.
+        dump_path:     The path of the CSV or JSON file the percentiles are periodically written to, if specified.
+        dump_interval: The time in seconds between two writes of the dump file.
+    '''
+
+    def __init__(self, enabled=True, window=300, dump_path=None, dump_interval=5.0):
+
+        self.enabled = enabled
+        self.window = window
+        self.dump_path = dump_path
+        self.dump_interval = dump_interval
+
+        # Initialize the dictionary storing the recent durations in seconds of each stage, in first seen order.
+        self.samples = {}
+        self.lock = threading.Lock()
+
+        # Initialize the time of the last dump and the HUD text, refreshed at most twice a second.
+        self.last_dump = time()
+        self.hud = []
+        self.last_hud = 0.0
+
+    def record(self, stage, seconds):
+        '''
+        This function records one duration of a stage.
+        Args:
+            stage:   The name of the stage.
+            seconds: The time spent in the stage.
+        '''
+
+        if not self.enabled:
+            return
+
+        samples = self.samples.get(stage)
+        if samples is None:
+            with self.lock:
+                samples = self.samples.setdefault(stage, deque(maxlen=self.window))
+        samples.append(seconds)
+
+    def stage(self, name):
+        '''
+        This function returns a context manager measuring the code run inside it as a stage.
+        Args:
+            name: The name of the stage.
+        Returns:
+            context: The context manager.
+        '''
+
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._measure(name)
+
+    @contextmanager
+    def _measure(self, name):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, perf_counter() - start)
+
+    def timed(self, name):
+        '''
+        This function returns a decorator measuring each call of the decorated function as a stage.
+        Args:
+            name: The name of the stage.
+        Returns:
+            decorator: The decorator, which returns the function unchanged if the profiler is disabled.
+        '''
+
+        def decorator(function):
+
+            if not self.enabled:
+                return function
+
+            def wrapper(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.record(name, perf_counter() - start)
+
+            wrapper.__name__ = function.__name__
+            wrapper.__doc__ = function.__doc__
+            return wrapper
+
+        return decorator
+
+    def count(self, stage):
+        '''
+        This function returns the number of measurements of a stage in the window.
+        '''
+
+        return len(self.samples.get(stage, ()))
+
+    def summary(self):
+        '''
+        This function summarizes the durations of each stage in the window.
+        Returns:
+            summary: A dictionary with, for each stage, the number of measurements and the mean, maximum and
+                     percentile times in milliseconds.
+        '''
+
+        with self.lock:
+            stages = list(self.samples.items())
+
+        summary = {}
+        for stage, samples in stages:
+            if not samples:
+                continue
+            times = np.fromiter(samples, dtype=np.float64) * 1000
+            summary[stage] = {'count': len(times), 'mean_ms': float(times.mean()), 'max_ms': float(times.max())}
+            for percentile, value in zip(PERCENTILES, np.percentile(times, PERCENTILES)):
+                summary[stage][f'p{percentile}_ms'] = float(value)
+
+        return summary
+
+    def hudCommands(self, org=(10, 150), line_height=22):
+        '''
+        This function returns the commands writing the p50, p95 and p99 time of each stage on the frame.
+        Args:
+            org:         The bottom-left corner of the first line.
+            line_height: The height in pixels of each line.
+        Returns:
+            commands: The list of draw commands, empty if the profiler is disabled.
+        '''
+
+        if not self.enabled:
+            return []
+
+        # Refresh the text at most twice a second, the percentiles are not worth computing on every frame.
+        now = perf_counter()
+        if now - self.last_hud >= 0.5:
+            self.last_hud = now
+            self.hud = [f'{stage[:10]:<10} {timing["p50_ms"]:6.1f} {timing["p95_ms"]:6.1f} {timing["p99_ms"]:6.1f}'
+                        for stage, timing in self.summary().items()]
+            if self.hud:
+                self.hud.insert(0, f'{"ms":<10} {"p50":>6} {"p95":>6} {"p99":>6}')
+
+        x, y = org
+        return [textCommand(text, (x, y + index * line_height), (0, 255, 255), scale=0.5, thickness=1)
+                for index, text in enumerate(self.hud)]
+
+    def dump(self, path=None):
+        '''
+        This function writes the summary of each stage to a CSV file, or to a JSON file if the path ends in .json.
+        Args:
+            path: The path of the file, the dump_path by default.
+        '''
+
+        path = self.dump_path if path is None else path
+        summary = self.summary()
+
+        if path.lower().endswith('.json'):
+            with open(path, 'w') as file:
+                json.dump({'time': time(), 'stages': summary}, file, indent=2)
+            return
+
+        columns = ['count', 'mean_ms', 'max_ms'] + [f'p{percentile}_ms' for percentile in PERCENTILES]
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['stage'] + columns)
+            for stage, timing in summary.items():
+                writer.writerow([stage] + [round(timing[column], 3) for column in columns])
+
+    def tick(self):
+        '''
+        This function writes the dump file if it is specified and the dump interval has passed since the last write.
+        '''
+
+        if not self.enabled or self.dump_path is None:
+            return
+
+        now = time()
+        if now - self.last_dump >= self.dump_interval:
+            self.last_dump = now
+            self.dump()
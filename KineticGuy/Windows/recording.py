@@ -0,0 +1,265 @@
+#import necessary modules
+import argparse
+import itertools
+import json
+import struct
+from time import perf_counter
+import numpy as np
+from geometry import pixelPoints
+from input_dispatch import InputDispatcher, NullBackend
+from landmarks import LandmarkFrame, NUM_LANDMARKS
+from pipeline import GameController, THRESHOLDS
+from pose_detection import measurePoses
+
+# The header of a recording: the magic bytes, the format version and the number of landmarks per frame,
+# padded to 16 bytes so the records after it stay aligned.
+MAGIC = b'KGLM'
+VERSION = 1
+HEADER = struct.Struct('<4sHH8x')
+
+# The layout of one record, the landmarks of one frame.
+RECORD_DTYPE = np.dtype([('timestamp', '<f8'), ('width', '<u4'), ('height', '<u4'), ('detected', 'u1'),
+                         ('landmarks', '<f4', (NUM_LANDMARKS, 4))])
+
+
+class LandmarkRecorder:
+    '''
+    This class writes the landmarks of each frame to a binary file, which loadRecording() maps back into memory.
+    Args:
+        path: The path of the recording file, overwritten if it exists.
+    '''
+
+    def __init__(self, path):
+
+        self.path = path
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, NUM_LANDMARKS))
+
+        # Initialize the record reused for every frame, and the number of frames written.
+        self.record = np.zeros(1, dtype=RECORD_DTYPE)
+        self.frames = 0
+
+    def write(self, landmarks, timestamp):
+        '''
+        This function appends the landmarks of one frame to the recording.
+        Args:
+            landmarks: The LandmarkFrame object storing the pose landmarks of the frame.
+            timestamp: The time the frame was captured.
+        '''
+
+        record = self.record[0]
+        record['timestamp'] = timestamp
+        record['width'] = landmarks.width
+        record['height'] = landmarks.height
+        record['detected'] = landmarks.detected
+        record['landmarks'] = landmarks.data
+
+        self.file.write(self.record.tobytes())
+        self.frames += 1
+
+    def close(self):
+        '''
+        This function flushes and closes the recording file.
+        '''
+
+        if not self.file.closed:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def loadRecording(path):
+    '''
+    This function maps a recording written by LandmarkRecorder into memory without reading it.
+    Args:
+        path: The path of the recording file.
+    Returns:
+        records: A read-only structured array with the timestamp, width, height, detected and landmarks fields
+                 of each frame.
+    '''
+
+    # Read and check the header.
+    with open(path, 'rb') as file:
+        header = file.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError(f'{path} is not a landmark recording')
+    magic, version, num_landmarks = HEADER.unpack(header)
+    if magic != MAGIC or num_landmarks != NUM_LANDMARKS:
+        raise ValueError(f'{path} is not a landmark recording')
+    if version != VERSION:
+        raise ValueError(f'{path} has the unsupported recording version {version}')
+
+    # Check if the recording has no frames, which np.memmap can not map.
+    size = (np.memmap(path, dtype=np.uint8, mode='r').size - HEADER.size) // RECORD_DTYPE.itemsize
+    if size == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+
+    return np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER.size, shape=(size,))
+
+
+def replayRecording(records, num_of_frames=10, thresholds=None, smoother=None):
+    '''
+    This function runs the gesture logic on recorded landmarks, without the camera and the pose detection.
+    Args:
+        records:       The structured array returned by loadRecording().
+        num_of_frames: The number of consecutive frames with the hands joined needed to start the game.
+        thresholds:    An optional dictionary overriding some of the THRESHOLDS of the classifiers.
+        smoother:      An optional OneEuroFilter object smoothing the recorded landmarks, as in the game.
+    Returns:
+        report: A dictionary with the number of frames, the replay time, the frame rate and the gesture events.
+    '''
+
+    # The game input is dropped, only the gesture events are recorded.
+    controller = GameController(InputDispatcher(NullBackend()), num_of_frames=num_of_frames, thresholds=thresholds)
+
+    # Read the scalar fields once, and point a single landmark frame at each record in turn,
+    # or at a copy if the smoother writes to it.
+    timestamps = records['timestamp'].tolist()
+    widths = records['width'].tolist()
+    heights = records['height'].tolist()
+    detected = records['detected'].tolist()
+    data = records['landmarks']
+    landmarks = LandmarkFrame()
+
+    start = perf_counter()
+    frames = 0
+    for index, timestamp in enumerate(timestamps):
+        landmarks.data = data[index] if smoother is None else data[index].copy()
+        landmarks.width = widths[index]
+        landmarks.height = heights[index]
+        landmarks.detected = bool(detected[index])
+
+        if smoother is not None:
+            smoother.update(landmarks, timestamp)
+
+        frames += 1
+        if not controller.update(landmarks, timestamp=timestamp):
+            break
+    elapsed = perf_counter() - start
+
+    return {'frames': frames,
+            'seconds': elapsed,
+            'fps': frames / elapsed if elapsed > 0 else 0.0,
+            'events': [{'time': timestamp, 'event': name} for timestamp, name in controller.events]}
+
+
+def measureRecording(records):
+    '''
+    This function measures what the classifiers compare with their thresholds on every frame of a recording at once,
+    with the same geometry as the game.
+    Args:
+        records: The structured array returned by loadRecording().
+    Returns:
+        measures: The dictionary returned by measurePoses(), with arrays of one value per frame, NaN on the frames
+                  without a person.
+    '''
+
+    points = pixelPoints(records['landmarks'], records['width'], records['height'])
+    measures = measurePoses(points)
+    missing = records['detected'] == 0
+    for values in measures.values():
+        values[missing] = np.nan
+    return measures
+
+
+def sweep(recordings, grid, num_of_frames=10):
+    '''
+    This function replays recordings with every combination of classifier thresholds in a grid.
+    Args:
+        recordings:    A list of structured arrays returned by loadRecording().
+        grid:          A dictionary from a threshold name such as 'jump_crouch.band' to the list of values tried.
+        num_of_frames: The number of consecutive frames with the hands joined needed to start the game.
+    Returns:
+        results: A list with, for each combination, a dictionary with the thresholds tried and the number of each
+                 gesture event over all the recordings.
+    '''
+
+    names = list(grid)
+    for name in names:
+        classifier, _, parameter = name.partition('.')
+        if parameter not in THRESHOLDS.get(classifier, {}):
+            raise ValueError(f'unknown threshold {name}')
+
+    results = []
+    for values in itertools.product(*(grid[name] for name in names)):
+
+        # Build the thresholds overridden by this combination.
+        thresholds = {}
+        for name, value in zip(names, values):
+            classifier, _, parameter = name.partition('.')
+            thresholds.setdefault(classifier, {})[parameter] = value
+
+        # Count the gesture events over all the recordings.
+        counts = {}
+        for records in recordings:
+            for event in replayRecording(records, num_of_frames, thresholds)['events']:
+                counts[event['event']] = counts.get(event['event'], 0) + 1
+
+        results.append({'thresholds': dict(zip(names, values)), 'events': counts})
+
+    return results
+
+
+def parseParameter(text):
+    '''
+    This function parses a --param option such as jump_crouch.band=25,30,35.
+    Args:
+        text: The option value.
+    Returns:
+        name:   The name of the threshold.
+        values: The list of values tried.
+    '''
+
+    name, _, values = text.partition('=')
+    if not values:
+        raise argparse.ArgumentTypeError(f'expected NAME=VALUE[,VALUE...], got {text}')
+    return name, [float(value) for value in values.split(',')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay landmark recordings through the gesture logic, optionally '
+                                                 'sweeping the classifier thresholds.')
+    parser.add_argument('paths', nargs='+', help='The landmark recordings written with --record.')
+    parser.add_argument('--param', type=parseParameter, action='append', default=[],
+                        help='A threshold and the values tried, such as jump_crouch.band=25,30,35. Available: ' +
+                             ', '.join(f'{classifier}.{parameter}' for classifier, parameters in THRESHOLDS.items()
+                                       for parameter in parameters))
+    parser.add_argument('--frames', type=int, default=10,
+                        help='The number of consecutive frames with the hands joined needed to start the game.')
+    parser.add_argument('--json', help='The path of a JSON file the results are written to.')
+    args = parser.parse_args()
+
+    recordings = [loadRecording(path) for path in args.paths]
+
+    # Check if no threshold is swept, then report the events of each recording.
+    if not args.param:
+        results = []
+        for path, records in zip(args.paths, recordings):
+            report = replayRecording(records, args.frames)
+            print(f"{path}: {report['frames']} frames in {report['seconds']:.3f} s, {report['fps']:.0f} FPS")
+            for event in report['events']:
+                print(f"{event['time']:12.3f} s  {event['event']}")
+            results.append(dict(report, path=path))
+
+    # Otherwise report the number of each event for every combination of thresholds.
+    else:
+        start = perf_counter()
+        results = sweep(recordings, dict(args.param), args.frames)
+        for result in results:
+            thresholds = ' '.join(f'{name}={value:g}' for name, value in result['thresholds'].items())
+            events = ' '.join(f'{name}={count}' for name, count in sorted(result['events'].items()))
+            print(f'{thresholds}  {events}')
+        frames = sum(len(records) for records in recordings) * len(results)
+        print(f'{frames} frames replayed in {perf_counter() - start:.2f} s')
+
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#import necessary modules
+import argparse
+import json
+from time import perf_counter
+from capture import openSource
+from input_dispatch import InputDispatcher, NullBackend
+from models import getVideoPose
+from overlay import Overlay
+from pipeline import GameController, Pipeline
+from recording import LandmarkRecorder
+from roi import RoiTracker
+
+
+def replay(source, pose, fps=30.0, inference_width=None, draw=False, num_of_frames=10, recorder=None):
+    '''
+    This function runs the control loop headless on an offline source, as fast as possible.
+    Args:
+        source:          An object with the read() and isOpened() methods of cv2.VideoCapture.
+        pose:            The pose function required to perform the pose detection.
+        fps:             The frame rate the frame timestamps are computed from.
+        inference_width: The width of the image the pose function sees, or None to run on the whole frame.
+        draw:            A boolean value that is if set to true the overlay is drawn on each frame, as in the game.
+        num_of_frames:   The number of consecutive frames with the hands joined needed to start the game.
+        recorder:        An optional LandmarkRecorder object the landmarks of each frame are written to.
+    Returns:
+        report: A dictionary with the number of frames, the sustained frame rate, the time of each stage and the
+                gesture events.
+    '''
+
+    # The game input is dropped, only the gesture events are recorded.
+    controller = GameController(InputDispatcher(NullBackend()), num_of_frames=num_of_frames)
+    tracker = RoiTracker(inference_width=inference_width) if inference_width else None
+    pipeline = Pipeline(pose, controller, tracker=tracker, draw=draw, recorder=recorder)
+    overlay = Overlay() if draw else None
+
+    start = perf_counter()
+    while source.isOpened():
+
+        # Read a frame, the end of a video file stops the replay.
+        ok, frame = source.read()
+        if not ok:
+            break
+
+        if overlay is not None:
+            overlay.clear()
+
+        # Run the control loop stages with the timestamp the frame would have on a camera.
+        _, playing = pipeline.process(frame, overlay, timestamp=pipeline.frames / fps)
+        if not playing:
+            break
+    elapsed = perf_counter() - start
+
+    return {'frames': pipeline.frames,
+            'seconds': elapsed,
+            'fps': pipeline.frames / elapsed if elapsed > 0 else 0.0,
+            'stages': pipeline.summary(),
+            'events': [{'time': timestamp, 'event': name} for timestamp, name in controller.events]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the control loop headless on a video file or on images and '
+                                                 'report the time of each stage.')
+    parser.add_argument('paths', nargs='+', help='A video file, or one or more images such as sample.png.')
+    parser.add_argument('--repeat', type=int, default=30, help='The number of times a sequence of images is read.')
+    parser.add_argument('--fps', type=float, default=30.0, help='The frame rate the frame timestamps assume.')
+    parser.add_argument('--inference-width', type=int, default=None,
+                        help='The width of the image the pose function sees, the whole frame by default.')
+    parser.add_argument('--draw', action='store_true', help='Draw the overlay on each frame, as in the game.')
+    parser.add_argument('--json', help='The path of a JSON file the report is written to.')
+    parser.add_argument('--record', help='The path of a file the landmarks of each frame are recorded to.')
+    args = parser.parse_args()
+
+    recorder = LandmarkRecorder(args.record) if args.record else None
+    try:
+        report = replay(openSource(args.paths, args.repeat), getVideoPose(), args.fps, args.inference_width,
+                        args.draw, recorder=recorder)
+    finally:
+        if recorder is not None:
+            recorder.close()
+
+    print(f"{report['frames']} frames in {report['seconds']:.2f} s, {report['fps']:.1f} FPS")
+    for stage, timing in report['stages'].items():
+        print(f"{stage:<18}{timing['mean_ms']:8.2f} ms mean {timing['p95_ms']:8.2f} ms p95 "
+              f"{timing['max_ms']:8.2f} ms max")
+    for event in report['events']:
+        print(f"{event['time']:8.3f} s  {event['event']}")
+
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
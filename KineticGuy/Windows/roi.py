@@ -0,0 +1,121 @@
+#import necessary modules
+import cv2
+import numpy as np
+
+
+class RoiTracker:
+    '''
+    This class crops each frame around the person found on the previous frame before the pose detection, and scales
+    the crop down to the inference resolution. The landmarks detected on the crop are mapped back to the full frame.
+    When the person is lost the whole frame is used again.
+    Args:
+        inference_width: The width in pixels of the image the pose function sees, or None to keep the crop size.
+        margin:          The margin added around the bounding box of the landmarks, as a fraction of its size.
+        min_visibility:  The visibility a landmark needs to count in the bounding box.
+        smoothing:       The weight of the previous region when it is updated, to keep the crop stable.
+    '''
+
+    def __init__(self, inference_width=480, margin=0.3, min_visibility=0.5, smoothing=0.5):
+
+        self.inference_width = inference_width
+        self.margin = margin
+        self.min_visibility = min_visibility
+        self.smoothing = smoothing
+
+        # Initialize the region (x1, y1, x2, y2) in full frame pixels cropped on the next frame, None for the full frame.
+        self.roi = None
+
+        # Initialize the region used on the current frame.
+        self.current = None
+
+        # Initialize the buffer the crop is scaled into, reused while the crop keeps its size.
+        self.buffer = None
+
+    def crop(self, image):
+        '''
+        This function returns the part of the frame the pose detection should run on.
+        Args:
+            image: The full frame.
+        Returns:
+            crop: The region of the frame around the person, scaled to the inference resolution. The scaled crop
+                  is written to a buffer reused on the next frames.
+        '''
+
+        height, width, _ = image.shape
+
+        # Use the region of the previous frame, or the full frame if the person is not tracked.
+        if self.roi is None:
+            self.current = (0, 0, width, height)
+        else:
+            self.current = self.roi
+        x1, y1, x2, y2 = self.current
+        crop = image[y1:y2, x1:x2]
+
+        # Scale the crop down to the inference resolution, keeping its aspect ratio.
+        if self.inference_width and x2 - x1 > self.inference_width:
+            crop_height = max(1, round((y2 - y1) * self.inference_width / (x2 - x1)))
+            if self.buffer is None or self.buffer.shape != (crop_height, self.inference_width, 3):
+                self.buffer = np.empty((crop_height, self.inference_width, 3), dtype=np.uint8)
+            crop = cv2.resize(crop, (self.inference_width, crop_height), dst=self.buffer,
+                              interpolation=cv2.INTER_AREA)
+
+        return crop
+
+    def update(self, landmarks, width, height):
+        '''
+        This function maps the landmarks detected on the crop back to the full frame in place, and computes the
+        region to crop on the next frame from them.
+        Args:
+            landmarks: The LandmarkFrame object storing the landmarks detected on the crop.
+            width:     The width of the full frame.
+            height:    The height of the full frame.
+        Returns:
+            landmarks: The same LandmarkFrame object, in full frame coordinates.
+        '''
+
+        x1, y1, x2, y2 = self.current
+        landmarks.width = width
+        landmarks.height = height
+
+        # Check if the person is lost, then the next frame is searched whole.
+        if not landmarks.detected:
+            self.roi = None
+            return landmarks
+
+        # Map the normalized crop coordinates to normalized full frame coordinates.
+        data = landmarks.data
+        data[:, 0] = (x1 + data[:, 0] * (x2 - x1)) / width
+        data[:, 1] = (y1 + data[:, 1] * (y2 - y1)) / height
+        data[:, 2] *= (x2 - x1) / width
+
+        # Check if too few landmarks are visible to place the region, then the next frame is searched whole.
+        visible = data[:, 3] >= self.min_visibility
+        if np.count_nonzero(visible) < 4:
+            self.roi = None
+            return landmarks
+
+        # Get the bounding box of the visible landmarks in pixels and add the margin around it.
+        points = data[visible, :2] * (width, height)
+        (bx1, by1), (bx2, by2) = points.min(axis=0), points.max(axis=0)
+        pad = self.margin * max(bx2 - bx1, by2 - by1)
+        box = np.array((bx1 - pad, by1 - pad, bx2 + pad, by2 + pad))
+
+        # Grow the box to the aspect ratio of the frame, so the inference resolution stays the same between frames.
+        box_width, box_height = box[2] - box[0], box[3] - box[1]
+        if box_width * height < box_height * width:
+            extra = (box_height * width / height - box_width) / 2
+            box[[0, 2]] += (-extra, extra)
+        else:
+            extra = (box_width * height / width - box_height) / 2
+            box[[1, 3]] += (-extra, extra)
+
+        # Smooth the region with the previous one to keep the crop stable.
+        if self.roi is not None:
+            box = self.smoothing * np.array(self.roi) + (1 - self.smoothing) * box
+
+        # Clip the region to the frame, falling back to the full frame if it degenerates.
+        rx1, ry1 = max(0, int(box[0])), max(0, int(box[1]))
+        rx2, ry2 = min(width, int(np.ceil(box[2]))), min(height, int(np.ceil(box[3])))
+        self.roi = (rx1, ry1, rx2, ry2) if rx2 - rx1 >= 16 and ry2 - ry1 >= 16 else None
+
+        return landmarks
@@ -0,0 +1,223 @@
+#import necessary modules
+import argparse
+import json
+from time import perf_counter, sleep
+from capture import FrameGrabber
+from engine import ProcessPipeline
+from input_dispatch import InputDispatcher, NullBackend
+from models import getVideoPose
+from pipeline import GameController
+from profiler import Profiler
+from roi import RoiTracker
+from smoothing import OneEuroFilter
+
+
+class PlayerSession:
+    '''
+    This class holds everything one player needs: the camera, the pose detection processes, the calibration and
+    the gesture state, and the metrics of the session. Nothing is shared with the other sessions.
+    Args:
+        name:            The name of the session in the metrics.
+        source:          The camera index, the video path or the capture object read by the FrameGrabber.
+        dispatcher:      The InputDispatcher object of the player, one dropping the input by default.
+        workers:         The number of pose detection processes of the session.
+        inference_width: The width of the image the pose function sees.
+        num_of_frames:   The number of consecutive frames with the hands joined needed to start the game.
+        smoothing:       A boolean value that is if set to true the landmarks are smoothed before classification.
+        pose_factory:    A module level function building the pose function in the workers.
+        pose_config:     The keyword arguments of the pose factory.
+        live:            Whether the source is a live camera, see FrameGrabber.
+    '''
+
+    def __init__(self, name, source, dispatcher=None, workers=1, inference_width=480, num_of_frames=10,
+                 smoothing=True, pose_factory=getVideoPose, pose_config=None, live=None):
+
+        self.name = name
+        self.grabber = FrameGrabber(source, live=live)
+        self.dispatcher = InputDispatcher(NullBackend()) if dispatcher is None else dispatcher
+        self.controller = GameController(self.dispatcher, num_of_frames=num_of_frames)
+        self.profiler = Profiler()
+        self.pipeline = ProcessPipeline(self.controller, workers=workers, pose_factory=pose_factory,
+                                        pose_config=pose_config, tracker=RoiTracker(inference_width=inference_width),
+                                        smoother=OneEuroFilter() if smoothing else None, profiler=self.profiler,
+                                        draw=False)
+
+        # Initialize whether the player is still playing, and the time the session started.
+        self.playing = True
+        self.started = None
+
+    def start(self):
+        '''
+        This function starts the capture and input threads of the session.
+        Returns:
+            session: The same PlayerSession object.
+        '''
+
+        self.started = perf_counter()
+        self.grabber.start()
+        self.dispatcher.start()
+        return self
+
+    @property
+    def active(self):
+        '''
+        Whether the session still has frames to process.
+        '''
+
+        return self.playing and (self.grabber.isOpened() or bool(self.pipeline.in_flight))
+
+    def step(self):
+        '''
+        This function processes the newest frame of the session if one arrived, without waiting.
+        Returns:
+            processed: A boolean value that is true if a frame was processed.
+        '''
+
+        # Check if the camera has no new frame, then finish the frames still in flight once it is closed.
+        if not self.grabber.pending():
+            if not self.grabber.isOpened() and self.pipeline.in_flight:
+                _, self.playing = self.pipeline.flush()
+                return True
+            return False
+
+        ok, frame = self.grabber.read(timeout=0)
+        if not ok:
+            return False
+        _, playing = self.pipeline.process(frame, timestamp=self.grabber.timestamp)
+        self.playing = self.playing and playing
+        return True
+
+    def metrics(self):
+        '''
+        This function returns the metrics of the session.
+        Returns:
+            metrics: A dictionary with the frames classified and their rate, the camera counters, the gesture
+                     events, the calories and the stage times of the session.
+        '''
+
+        elapsed = perf_counter() - self.started if self.started is not None else 0.0
+        return {'name': self.name,
+                'frames': self.pipeline.frames,
+                'fps': self.pipeline.frames / elapsed if elapsed > 0 else 0.0,
+                'camera': self.grabber.stats(),
+                'events': len(self.controller.events),
+                'calories': self.controller.calories,
+                'stages': self.profiler.summary()}
+
+    def close(self):
+        '''
+        This function stops the session and frees its camera, processes and shared memory.
+        '''
+
+        self.grabber.release()
+        self.pipeline.close()
+        self.dispatcher.stop()
+
+
+class Runtime:
+    '''
+    This class runs several player sessions on one machine. The pose detection of each session runs in its own
+    processes, so the sessions spread over the cores, and this thread serves the sessions in turn: one frame per
+    session per round, starting from a different session each round, so a session with a faster camera can not
+    starve the others.
+    Args:
+        sessions: The list of PlayerSession objects.
+    '''
+
+    def __init__(self, sessions):
+
+        self.sessions = list(sessions)
+        self.rounds = 0
+
+    def run(self, duration=None, report_interval=5.0, report=None):
+        '''
+        This function serves the sessions until every one of them ended or the duration passed.
+        Args:
+            duration:        The maximum time in seconds to run, None to run until the sessions end.
+            report_interval: The time in seconds between two calls of report.
+            report:          An optional function called with the metrics of the sessions.
+        Returns:
+            metrics: The list of the metrics of each session at the end.
+        '''
+
+        for session in self.sessions:
+            session.start()
+
+        start = last_report = perf_counter()
+        try:
+            while any(session.active for session in self.sessions):
+
+                # Serve every active session once, rotating the first one.
+                processed = 0
+                count = len(self.sessions)
+                for index in range(count):
+                    session = self.sessions[(self.rounds + index) % count]
+                    if session.active:
+                        processed += session.step()
+                self.rounds += 1
+
+                # Check if no session had a new frame, then wait a little instead of spinning.
+                if not processed:
+                    sleep(0.002)
+
+                now = perf_counter()
+                if report is not None and now - last_report >= report_interval:
+                    last_report = now
+                    report(self.metrics())
+                if duration is not None and now - start >= duration:
+                    break
+        finally:
+            for session in self.sessions:
+                session.close()
+
+        return self.metrics()
+
+    def metrics(self):
+        return [session.metrics() for session in self.sessions]
+
+
+def printMetrics(metrics):
+    '''
+    This function prints one line of metrics per session.
+    '''
+
+    for session in metrics:
+        worker = session['stages'].get('worker', {})
+        print(f"{session['name']:<12}{session['frames']:7d} frames {session['fps']:6.1f} FPS "
+              f"{session['camera']['dropped']:6d} dropped {session['events']:4d} events "
+              f"worker p95 {worker.get('p95_ms', 0.0):6.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run one player session per camera on this machine.')
+    parser.add_argument('sources', nargs='+', help='The camera indexes or video paths, one per player.')
+    parser.add_argument('--workers', type=int, default=1, help='The pose detection processes of each session.')
+    parser.add_argument('--inference-width', type=int, default=480,
+                        help='The width of the image the pose function sees.')
+    parser.add_argument('--model-complexity', type=int, choices=(0, 1, 2), default=1,
+                        help='The complexity of the pose model, 0 is the fastest and the least accurate.')
+    parser.add_argument('--inject', action='store_true',
+                        help='Inject the game input of every session, by default the gestures are only counted.')
+    parser.add_argument('--duration', type=float, default=None, help='The time in seconds to run.')
+    parser.add_argument('--json', help='The path of a JSON file the final metrics are written to.')
+    args = parser.parse_args()
+
+    sessions = [PlayerSession(f'player{index}', int(source) if source.isdigit() else source,
+                              dispatcher=InputDispatcher() if args.inject else None, workers=args.workers,
+                              inference_width=args.inference_width,
+                              pose_config={'model_complexity': args.model_complexity})
+                for index, source in enumerate(args.sources)]
+
+    try:
+        metrics = Runtime(sessions).run(duration=args.duration, report=printMetrics)
+    except KeyboardInterrupt:
+        metrics = [session.metrics() for session in sessions]
+    printMetrics(metrics)
+
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(metrics, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#import necessary modules
+import math
+import numpy as np
+from landmarks import NUM_LANDMARKS
+
+
+class InferenceScheduler:
+    '''
+    This class decides on which frames the pose detection runs, so its average cost per frame stays within a
+    latency budget. The detection runs every N frames, N growing with the measured detection time, and on the
+    frames in between the landmarks are extrapolated from their velocity over the last two detections.
+    Args:
+        budget:       The average time in seconds the detection may take per frame.
+        max_interval: The maximum number of frames between two detections.
+        max_horizon:  The maximum time in seconds the landmarks are extrapolated past a detection.
+        smoothing:    The weight of the newest measurement in the running average of the detection time.
+    '''
+
+    def __init__(self, budget=0.03, max_interval=4, max_horizon=0.2, smoothing=0.2):
+
+        self.budget = budget
+        self.max_interval = max_interval
+        self.max_horizon = max_horizon
+        self.smoothing = smoothing
+
+        # Initialize the running average of the detection time and the current number of frames between detections.
+        self.inference_time = None
+        self.interval = 1
+
+        # Initialize the number of frames since the last detection.
+        self.skipped = 0
+
+        # Initialize the landmarks of the last detection, its timestamp, frame size and whether a person was detected.
+        self.last = np.zeros((NUM_LANDMARKS, 4), dtype=np.float32)
+        self.last_time = None
+        self.last_detected = False
+        self.width = 0
+        self.height = 0
+
+        # Initialize the velocity of the x, y and z coordinates of each landmark, per second.
+        self.velocity = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+
+        # Initialize the counters of the detected and extrapolated frames.
+        self.inferred = 0
+        self.extrapolated = 0
+
+    def shouldInfer(self, timestamp):
+        '''
+        This function checks whether the detection runs on a frame.
+        Args:
+            timestamp: The time the frame was captured.
+        Returns:
+            infer: A boolean value that is true if the detection runs, false if the landmarks are extrapolated.
+        '''
+
+        # Run the detection if the interval passed, there is no person to extrapolate or the last detection is old.
+        return (self.skipped + 1 >= self.interval or not self.last_detected or
+                timestamp - self.last_time > self.max_horizon)
+
+    def observe(self, landmarks, timestamp, seconds):
+        '''
+        This function stores the landmarks of a detection and adjusts the interval to the time it took.
+        Args:
+            landmarks: The LandmarkFrame object storing the detected landmarks, in full frame coordinates.
+            timestamp: The time the frame was captured.
+            seconds:   The time the detection took.
+        '''
+
+        # Update the running average of the detection time, and the interval keeping its share per frame in budget.
+        if self.inference_time is None:
+            self.inference_time = seconds
+        else:
+            self.inference_time += self.smoothing * (seconds - self.inference_time)
+        self.interval = min(max(math.ceil(self.inference_time / self.budget), 1), self.max_interval)
+
+        # Compute the velocity from the previous detection, if the person was seen on both.
+        if landmarks.detected and self.last_detected and timestamp > self.last_time:
+            self.velocity[:] = (landmarks.data[:, :3] - self.last[:, :3]) / (timestamp - self.last_time)
+        else:
+            self.velocity[:] = 0
+
+        self.last[:] = landmarks.data
+        self.last_time = timestamp
+        self.last_detected = landmarks.detected
+        self.width = landmarks.width
+        self.height = landmarks.height
+
+        self.skipped = 0
+        self.inferred += 1
+
+    def extrapolate(self, landmarks, timestamp):
+        '''
+        This function predicts the landmarks of a frame without the detection, in place.
+        Args:
+            landmarks: The LandmarkFrame object the predicted landmarks are written to.
+            timestamp: The time the frame was captured.
+        Returns:
+            landmarks: The same LandmarkFrame object, with the extrapolated flag set.
+        '''
+
+        landmarks.data[:] = self.last
+        landmarks.data[:, :3] += self.velocity * (timestamp - self.last_time)
+        landmarks.width = self.width
+        landmarks.height = self.height
+        landmarks.detected = self.last_detected
+        landmarks.extrapolated = True
+
+        self.skipped += 1
+        self.extrapolated += 1
+        return landmarks
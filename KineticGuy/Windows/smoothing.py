@@ -0,0 +1,118 @@
+#import necessary modules
+import numpy as np
+from landmarks import (NUM_LANDMARKS, LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP, LEFT_ELBOW, RIGHT_ELBOW,
+                       LEFT_WRIST, RIGHT_WRIST, LEFT_PINKY, RIGHT_PINKY, LEFT_INDEX, RIGHT_INDEX, LEFT_THUMB,
+                       RIGHT_THUMB)
+
+
+def defaultCutoffs(torso=1.0, arms=1.5, hands=2.0, other=1.0):
+    '''
+    This function returns the minimum cutoff frequency of each landmark. The hands move fastest and get the highest
+    cutoff, so the joined hands and the quit pose are not delayed, the torso drives the jumps and crouches.
+    Args:
+        torso: The minimum cutoff in Hz of the shoulders and the hips.
+        arms:  The minimum cutoff in Hz of the elbows.
+        hands: The minimum cutoff in Hz of the wrists and the fingers.
+        other: The minimum cutoff in Hz of the other landmarks.
+    Returns:
+        cutoffs: A (33,) float32 array.
+    '''
+
+    cutoffs = np.full(NUM_LANDMARKS, other, dtype=np.float32)
+    cutoffs[[LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP]] = torso
+    cutoffs[[LEFT_ELBOW, RIGHT_ELBOW]] = arms
+    cutoffs[[LEFT_WRIST, RIGHT_WRIST, LEFT_PINKY, RIGHT_PINKY, LEFT_INDEX, RIGHT_INDEX, LEFT_THUMB,
+             RIGHT_THUMB]] = hands
+    return cutoffs
+
+
+class OneEuroFilter:
+    '''
+    This class smooths the x, y and z coordinates of all the landmarks at once with the One-Euro filter: a low-pass
+    filter whose cutoff rises with the speed of each landmark, so slow jitter is removed and fast moves are not
+    delayed. A landmark below the visibility threshold, a frame without a person, or a long gap between frames
+    resets the filter, so the next value is taken as is instead of being pulled toward a stale one.
+    Args:
+        min_cutoff:     The minimum cutoff frequency in Hz, a number or one value per landmark.
+        beta:           The increase of the cutoff per unit of speed (normalized coordinates per second).
+        d_cutoff:       The cutoff frequency in Hz of the speed estimate.
+        min_visibility: The visibility under which a landmark is reset.
+        max_gap:        The time in seconds between two frames after which every landmark is reset.
+    '''
+
+    def __init__(self, min_cutoff=None, beta=5.0, d_cutoff=1.0, min_visibility=0.5, max_gap=0.5):
+
+        min_cutoff = defaultCutoffs() if min_cutoff is None else min_cutoff
+        self.min_cutoff = np.broadcast_to(np.asarray(min_cutoff, dtype=np.float32), (NUM_LANDMARKS,))[:, None]
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.min_visibility = min_visibility
+        self.max_gap = max_gap
+
+        # Initialize the filtered coordinates, their speed, which landmarks have a state, and the last timestamp.
+        self.value = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+        self.speed = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+        self.valid = np.zeros(NUM_LANDMARKS, dtype=bool)
+        self.timestamp = None
+
+    def reset(self):
+        '''
+        This function forgets the state of every landmark.
+        '''
+
+        self.valid[:] = False
+        self.timestamp = None
+
+    @staticmethod
+    def alpha(cutoff, dt):
+        '''
+        This function returns the smoothing factor of a low-pass filter with the given cutoff frequency.
+        '''
+
+        return 1.0 / (1.0 + 1.0 / (2 * np.pi * cutoff * dt))
+
+    def update(self, landmarks, timestamp):
+        '''
+        This function smooths the landmarks of one frame in place.
+        Args:
+            landmarks: The LandmarkFrame object storing the pose landmarks of the frame.
+            timestamp: The time the frame was captured, in seconds.
+        Returns:
+            landmarks: The same LandmarkFrame object, smoothed.
+        '''
+
+        # Check if the person is lost, then start over on the next detection.
+        if not landmarks.detected:
+            self.reset()
+            return landmarks
+
+        data = landmarks.data
+        raw = data[:, :3]
+
+        # Check if this is the first frame or the frames are too far apart, then take the landmarks as they are.
+        dt = None if self.timestamp is None else timestamp - self.timestamp
+        if dt is None or dt <= 0 or dt > self.max_gap:
+            self.value[:] = raw
+            self.speed[:] = 0
+            self.valid[:] = data[:, 3] >= self.min_visibility
+            self.timestamp = timestamp
+            return landmarks
+        self.timestamp = timestamp
+
+        # Estimate the speed of each coordinate and smooth it.
+        speed = (raw - self.value) / dt
+        self.speed += self.alpha(self.d_cutoff, dt) * (speed - self.speed)
+
+        # Smooth the coordinates with a cutoff rising with the speed.
+        cutoff = self.min_cutoff + self.beta * np.abs(self.speed)
+        self.value += self.alpha(cutoff, dt) * (raw - self.value)
+
+        # Reset the landmarks that were not tracked on the previous frame or are not visible on this one.
+        visible = data[:, 3] >= self.min_visibility
+        reset = ~(self.valid & visible)
+        self.value[reset] = raw[reset]
+        self.speed[reset] = 0
+        self.valid[:] = visible
+
+        raw[:] = self.value
+        return landmarks
@@ -0,0 +1,57 @@
+#import necessary modules
+import argparse
+import os
+from time import perf_counter
+
+# Take the reference time before any heavy module is imported.
+start = perf_counter()
+
+import cv2
+
+
+def main():
+    '''
+    This function measures the startup of the control loop: importing the pose detection code, building the video
+    Pose function and running the first inference, and prints the time-to-first-inference.
+    '''
+
+    parser = argparse.ArgumentParser(description='Measure the time from launch to the first pose inference.')
+    parser.add_argument('image', nargs='?', default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                                 'sample.png'),
+                        help='The image the first inference runs on.')
+    args = parser.parse_args()
+
+    timings = []
+
+    # Import the pose detection code the same way main.py does.
+    t = perf_counter()
+    from pose_detection import processPose
+    from models import getVideoPose
+    timings.append(('import', perf_counter() - t))
+
+    # Build the only model the control loop uses.
+    t = perf_counter()
+    pose_video = getVideoPose()
+    timings.append(('build model', perf_counter() - t))
+
+    # Read the image and run the first inference on it.
+    image = cv2.imread(args.image)
+    if image is None:
+        parser.error(f'can not read {args.image}')
+    t = perf_counter()
+    landmarks, _ = processPose(image, pose_video)
+    timings.append(('first inference', perf_counter() - t))
+
+    # Run a second inference to show the steady state cost next to the startup cost.
+    t = perf_counter()
+    processPose(image, pose_video, landmarks=landmarks)
+    timings.append(('second inference', perf_counter() - t))
+
+    for name, seconds in timings:
+        print(f'{name:<24}{seconds * 1000:9.1f} ms')
+    print(f'{"time-to-first-inference":<24}{(perf_counter() - start - timings[-1][1]) * 1000:9.1f} ms')
+    print(f'person detected: {landmarks.detected}')
+
+
+if __name__ == '__main__':
+    main()
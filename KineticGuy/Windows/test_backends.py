@@ -0,0 +1,76 @@
+#import necessary modules
+import numpy as np
+import pytest
+from backends import (COCO_KEYPOINTS, OpenCvDnnBackend, SyntheticBackend, asBackend, createBackend,
+                      heatmapKeypoints)
+from capture import BlankSource
+from landmarks import LandmarkFrame, LEFT_SHOULDER, LEFT_THUMB, NOSE
+from replay import replay
+from test_pipeline import HANDS_JOINED, ScriptedPose
+
+
+class FakeNet:
+    '''
+    This class stands in for a cv2.dnn network, returning the same heatmaps whatever the input.
+    '''
+
+    def __init__(self, heatmaps):
+        self.heatmaps = heatmaps
+        self.blob = None
+
+    def setInput(self, blob):
+        self.blob = blob
+
+    def forward(self, output=None):
+        return self.heatmaps[np.newaxis]
+
+
+def test_synthetic_backend_plays_the_game_without_camera():
+    report = replay(BlankSource(100), SyntheticBackend(), fps=30.0)
+    events = [event['event'] for event in report['events']]
+
+    assert report['frames'] == 100
+    assert events[:2] == ['start', 'left'] and 'right' in events and 'jump_start' in events and 'jump_end' in events
+
+
+def test_synthetic_backend_is_deterministic():
+    first, second = SyntheticBackend(noise=0.01, seed=3), SyntheticBackend(noise=0.01, seed=3)
+    image = np.zeros((48, 64, 3), dtype=np.uint8)
+
+    for _ in range(30):
+        a, b = first.detect(image, LandmarkFrame()), second.detect(image, LandmarkFrame())
+        assert a.detected == b.detected and np.array_equal(a.data, b.data)
+    assert (a.width, a.height) == (64, 48)
+    with pytest.raises(ValueError):
+        SyntheticBackend([('cartwheel', 1)])
+
+
+def test_heatmaps_map_to_mediapipe_landmarks():
+    heatmaps = np.zeros((len(COCO_KEYPOINTS) + 1, 46, 46), dtype=np.float32)
+    heatmaps[:, 0, 0] = 0.05
+    heatmaps[COCO_KEYPOINTS.index('left_shoulder'), 10, 30] = 0.9
+    heatmaps[COCO_KEYPOINTS.index('right_shoulder'), 10, 15] = 0.8
+    heatmaps[COCO_KEYPOINTS.index('left_wrist'), 40, 20] = 0.7
+    backend = OpenCvDnnBackend(net=FakeNet(heatmaps))
+
+    landmarks = backend.detect(np.zeros((480, 640, 3), dtype=np.uint8), LandmarkFrame())
+    assert landmarks.detected and (landmarks.width, landmarks.height) == (640, 480)
+    np.testing.assert_allclose(landmarks.data[LEFT_SHOULDER], [30.5 / 46, 10.5 / 46, 0, 0.9], rtol=1e-6)
+    np.testing.assert_allclose(landmarks.data[LEFT_THUMB], [20.5 / 46, 40.5 / 46, 0, 0.7], rtol=1e-6)
+    assert backend.net.blob.shape == (1, 3, 368, 368)
+
+    # Without confident shoulders nobody is detected.
+    heatmaps[COCO_KEYPOINTS.index('right_shoulder')] = 0.01
+    assert not backend.detect(np.zeros((480, 640, 3), dtype=np.uint8), LandmarkFrame()).detected
+    assert heatmapKeypoints(heatmaps)[NOSE, 2] == pytest.approx(0.05)
+
+
+def test_pose_functions_are_wrapped_in_a_backend():
+    synthetic = createBackend('synthetic')
+    assert asBackend(synthetic) is synthetic
+
+    landmarks = asBackend(ScriptedPose([HANDS_JOINED])).detect(np.zeros((48, 64, 3), dtype=np.uint8),
+                                                                LandmarkFrame())
+    assert landmarks.detected and landmarks.width == 64
+    with pytest.raises(ValueError):
+        createBackend('kinect')
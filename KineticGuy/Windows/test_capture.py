@@ -0,0 +1,99 @@
+#import necessary modules
+import queue
+from time import time, sleep
+import numpy as np
+from capture import FrameGrabber
+
+
+class FakeCapture:
+    '''
+    This class stands in for cv2.VideoCapture, returning the frames put into its queue.
+    '''
+
+    def __init__(self, frames=()):
+        self.frames = queue.Queue()
+        for frame in frames:
+            self.frames.put(frame)
+        self.opened = True
+
+    def set(self, prop, value):
+        return True
+
+    def isOpened(self):
+        return self.opened
+
+    def read(self):
+        try:
+            return True, self.frames.get(timeout=0.01)
+        except queue.Empty:
+            return False, None
+
+    def release(self):
+        self.opened = False
+
+
+def makeFrame(value):
+    return np.full((4, 4, 3), value, dtype=np.uint8)
+
+
+def waitFor(condition, timeout=2.0):
+    end = time() + timeout
+    while not condition() and time() < end:
+        sleep(0.005)
+    return condition()
+
+
+def test_live_read_returns_newest_frame_and_counts_dropped():
+    fake = FakeCapture()
+    grabber = FrameGrabber(fake, live=True).start()
+    try:
+        for value in range(3):
+            fake.frames.put(makeFrame(value))
+        assert waitFor(lambda: grabber.stats()['captured'] == 3)
+
+        ok, frame = grabber.read()
+        assert ok and frame[0, 0, 0] == 2
+        assert grabber.seq == 2
+        assert grabber.stats() == {'captured': 3, 'dropped': 2, 'stale': 0}
+    finally:
+        grabber.release()
+
+
+def test_live_read_without_new_frame_is_stale():
+    fake = FakeCapture([makeFrame(0)])
+    grabber = FrameGrabber(fake, live=True).start()
+    try:
+        assert grabber.read()[0]
+
+        ok, frame = grabber.read(timeout=0.05)
+        assert not ok and frame is None
+        assert grabber.stats()['stale'] == 1
+
+        fake.frames.put(makeFrame(1))
+        ok, frame = grabber.read()
+        assert ok and frame[0, 0, 0] == 1
+        assert grabber.stats() == {'captured': 2, 'dropped': 0, 'stale': 1}
+    finally:
+        grabber.release()
+
+
+def test_file_source_returns_every_frame_in_order():
+    fake = FakeCapture([makeFrame(value) for value in range(20)])
+    grabber = FrameGrabber(fake, live=False).start()
+    values = []
+    while grabber.isOpened():
+        ok, frame = grabber.read()
+        if ok:
+            values.append(int(frame[0, 0, 0]))
+    grabber.release()
+
+    assert values == list(range(20))
+    assert grabber.stats()['dropped'] == 0
+    assert not fake.opened
+
+
+def test_live_source_gives_up_after_consecutive_failures():
+    fake = FakeCapture()
+    grabber = FrameGrabber(fake, live=True, max_failures=3).start()
+    assert waitFor(lambda: not grabber.isOpened())
+    assert not fake.opened
@@ -0,0 +1,81 @@
+#import necessary modules
+import cv2
+from capture import SyntheticCamera
+from capture_modes import applyMode, candidateModes, fourccCode, fourccName, latencyEstimate, negotiateCapture
+
+# Small and fast modes, so each mode is measured in a few milliseconds: MJPG reaches 400 FPS only at the small size,
+# YUYV 200 FPS at both sizes.
+FAST_MODES = ({'fourcc': 'MJPG', 'width': 64, 'height': 48, 'fps': 400.0},
+              {'fourcc': 'MJPG', 'width': 128, 'height': 96, 'fps': 100.0},
+              {'fourcc': 'YUYV', 'width': 128, 'height': 96, 'fps': 200.0},
+              {'fourcc': 'YUYV', 'width': 64, 'height': 48, 'fps': 200.0})
+
+
+def test_fourcc_round_trip():
+    assert fourccName(fourccCode('MJPG')) == 'MJPG'
+    assert fourccName(float(fourccCode('YUYV'))) == 'YUYV'
+
+
+def test_candidate_modes_cover_formats_rates_and_buffers():
+    modes = candidateModes(640, 480, fourccs=('MJPG', 'YUYV'), rates=(60.0, 30.0), buffer_sizes=(1, 3))
+
+    assert len(modes) == 8
+    assert {(mode['fourcc'], mode['fps'], mode['buffer_size']) for mode in modes} == \
+        {(fourcc, fps, size) for fourcc in ('MJPG', 'YUYV') for fps in (60.0, 30.0) for size in (1, 3)}
+    assert all((mode['width'], mode['height']) == (640, 480) for mode in modes)
+
+
+def test_apply_mode_reads_back_the_mode_in_effect():
+    camera = SyntheticCamera()
+
+    # YUYV only reaches 7.5 FPS at the large size, the driver lowers the requested rate.
+    mode = applyMode(camera, {'fourcc': 'YUYV', 'width': 1280, 'height': 960, 'fps': 30.0, 'buffer_size': 1})
+    assert mode == {'fourcc': 'YUYV', 'width': 1280, 'height': 960, 'fps': 7.5, 'buffer_size': 1}
+
+    # An unsupported size falls back to the first mode.
+    mode = applyMode(camera, {'fourcc': 'YUYV', 'width': 800, 'height': 600, 'fps': 30.0, 'buffer_size': 2})
+    assert (mode['fourcc'], mode['width'], mode['height']) == ('MJPG', 1280, 960)
+    assert camera.get(cv2.CAP_PROP_BUFFERSIZE) == 2
+
+
+def test_latency_estimate_counts_the_buffered_frames():
+    measures = {'interval_ms': 10.0}
+
+    assert latencyEstimate({'buffer_size': 1}, measures) == 20.0
+    assert latencyEstimate({'buffer_size': 3}, measures) == 40.0
+    assert latencyEstimate({'buffer_size': None}, measures) == 50.0
+
+
+def test_negotiate_picks_the_lowest_latency_mode_meeting_the_target():
+    camera = SyntheticCamera(FAST_MODES)
+    modes = candidateModes(128, 96, fourccs=('MJPG', 'YUYV'), rates=(200.0,), buffer_sizes=(1, 3))
+    tried = []
+
+    chosen = negotiateCapture(camera, 128, 96, target_fps=150.0, modes=modes, frames=10, report=tried.append)
+
+    # Only YUYV delivers 150 FPS at this size, with the shallow buffer.
+    assert len(tried) == 4
+    assert chosen['meets_target']
+    assert chosen['mode']['fourcc'] == 'YUYV' and chosen['mode']['buffer_size'] == 1
+
+    # The camera is left in the chosen mode.
+    assert fourccName(camera.get(cv2.CAP_PROP_FOURCC)) == 'YUYV'
+    assert camera.get(cv2.CAP_PROP_BUFFERSIZE) == 1
+
+
+def test_negotiate_falls_back_to_the_fastest_mode():
+    camera = SyntheticCamera(FAST_MODES)
+    modes = candidateModes(128, 96, fourccs=('MJPG', 'YUYV'), rates=(400.0,), buffer_sizes=(1,))
+
+    chosen = negotiateCapture(camera, 128, 96, target_fps=1000.0, modes=modes, frames=10)
+
+    assert not chosen['meets_target']
+    assert chosen['mode']['fourcc'] == 'YUYV'
+
+
+def test_negotiate_returns_none_without_frames():
+    camera = SyntheticCamera(FAST_MODES)
+    camera.release()
+
+    assert negotiateCapture(camera, 128, 96, modes=candidateModes(128, 96, rates=(200.0,), buffer_sizes=(1,)),
+                            frames=5) is None
@@ -0,0 +1,76 @@
+#import necessary modules
+import numpy as np
+import pytest
+from backends import syntheticPoses
+from classifier_bench import (FRAME_SIZES, benchmark, calibrate, classifyPoses, expectedLabels, loadBaselines,
+                              regressions)
+from landmarks import LandmarkFrame, NUM_LANDMARKS
+from pose_detection import (checkHandsJoined, checkJumpCrouch, checkLeftRight, checkShouldersJoined,
+                            classifyHandsJoined, classifyJumpCrouch, classifyLeftRight, classifyShouldersJoined,
+                            findAngle)
+from test_pipeline import makeResults
+
+
+@pytest.mark.parametrize('size', FRAME_SIZES)
+def test_synthetic_poses_are_classified_at_each_size(size):
+    for (frame_size, pose), labels in classifyPoses([size]).items():
+        assert labels == expectedLabels(pose, frame_size), pose
+
+
+def test_check_functions_classify_the_pose_results():
+    poses = syntheticPoses()
+    image = np.zeros((960, 1280, 3), dtype=np.uint8)
+
+    def results(name):
+        return makeResults({index: tuple(point) for index, point in enumerate(poses[name][:, :2].tolist())})
+
+    assert checkLeftRight(image, results('lean_left'))[1] == 'Hands Left'
+    assert checkLeftRight(image, results('lean_right'))[1] == 'Hands Right'
+    assert checkHandsJoined(image, results('hands_joined'))[1] == 'Hands Joined'
+    assert checkJumpCrouch(image, results('jump'), MID_Y=384)[1] == 'Jumping'
+    assert checkJumpCrouch(image, results('crouch'), MID_Y=384)[1] == 'Crouching'
+    assert checkShouldersJoined(image, results('quit'))[1] == 'Quit'
+
+    # Nothing is drawn unless it is specified, the input image is returned as it is.
+    output_image, _ = checkLeftRight(image, results('standing'))
+    assert output_image is image
+
+
+def test_find_angle_never_raises():
+    # Points on each other, on the top row of the image, far apart and a hair off the vertical.
+    rng = np.random.default_rng(0)
+    cases = [(0, 0, 0, 0), (5, 0, 5, 0), (0, 0, 640, 0), (1e9, 1e-9, 0, 0), (3, 1e150, 3, -1e150)]
+    cases += [tuple(point) for point in rng.integers(-2, 3, (200, 4)).tolist()]
+
+    for case in cases:
+        angle = findAngle(*case)
+        assert np.isnan(angle) or 0 <= angle <= 180, case
+
+
+def test_classifiers_survive_degenerate_landmarks():
+    # Every landmark on the same point, as a detection collapsing on a corner of the image could return.
+    landmarks = LandmarkFrame(1280, 960, np.zeros((NUM_LANDMARKS, 4), dtype=np.float32))
+
+    # The elbows on the shoulders have no angle, so no hand counts as raised.
+    assert classifyLeftRight(landmarks)[0] == 'Standing'
+    assert classifyHandsJoined(landmarks)[0] == 'Hands Joined'
+    assert classifyJumpCrouch(landmarks, 384)[0] == 'Jumping'
+    assert classifyShouldersJoined(landmarks)[0] == 'Quit'
+
+
+def test_classifier_throughput_against_baselines():
+    baselines = loadBaselines()
+
+    # Measure again the benchmarks over their limit, keeping the fastest time, so a busy moment of the machine does
+    # not fail the run; a real regression stays over it.
+    calibration_us = calibrate()
+    timings = benchmark()
+    for _ in range(2):
+        slow = regressions(timings, baselines, calibration_us)
+        if not slow:
+            break
+        calibration_us = min(calibration_us, calibrate())
+        timings = {name: min(us, again) for (name, us), again in zip(timings.items(), benchmark().values())}
+
+    assert set(timings) == set(baselines['us_per_call'])
+    assert not regressions(timings, baselines, calibration_us)
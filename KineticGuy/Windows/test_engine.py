@@ -0,0 +1,42 @@
+#import necessary modules
+import numpy as np
+from engine import FrameRing, ProcessPipeline
+from input_dispatch import InputDispatcher, RecordingBackend
+from pipeline import GameController
+from test_pipeline import HANDS_JOINED, LEAN_LEFT, STANDING, ScriptedPose
+
+
+def scriptedPose(poses, mirror=False):
+    return ScriptedPose(poses, mirror)
+
+
+def test_ring_slots_share_memory():
+    ring = FrameRing(2, 64)
+    try:
+        ring.view(1, (2, 4, 3))[:] = 7
+        other = FrameRing(2, 64, ring.name)
+        assert other.view(1, (24,)).tolist() == [7] * 24
+        assert not other.view(0, (24,)).any()
+        other.close()
+    finally:
+        ring.close()
+
+
+def test_process_pipeline_classifies_frames_in_order():
+    backend = RecordingBackend()
+    controller = GameController(InputDispatcher(backend), num_of_frames=3)
+    poses = [HANDS_JOINED] * 3 + [STANDING, LEAN_LEFT]
+
+    # A single worker sees the frames in order, so it follows the script frame by frame.
+    with ProcessPipeline(controller, workers=1, depth=3, pose_factory=scriptedPose,
+                         pose_config={'poses': poses, 'mirror': True}) as pipeline:
+        outputs = [pipeline.process(np.full((480, 640, 3), index, dtype=np.uint8), timestamp=index)[0]
+                   for index in range(5)]
+        last, playing = pipeline.flush()
+
+    # Every frame is classified once, by process() or by flush(), and the returned frames are the captured ones.
+    assert playing and pipeline.frames == 5 and not pipeline.in_flight
+    assert any(output is not None for output in outputs + [last])
+    assert [name for _, name in controller.events] == ['start', 'left']
+    assert [timestamp for timestamp, _ in controller.events] == [2, 4]
+    assert backend.actions() == [('click', (1300, 800, 'left')), ('press', ('left',))]
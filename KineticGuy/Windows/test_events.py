@@ -0,0 +1,59 @@
+#import necessary modules
+from time import sleep
+import numpy as np
+from events import EventReceiver, UdpEventSender, decodeEvent, encodeEvent, parseAddress
+from input_dispatch import InputDispatcher, NullBackend, RecordingBackend
+from pipeline import GameController, Pipeline
+from test_pipeline import HANDS_JOINED, LEAN_LEFT, STANDING, ScriptedPose
+
+
+def test_packets_round_trip():
+    packet = encodeEvent('jump_start', 12.5, 70000, player=3)
+
+    assert len(packet) == 16
+    assert decodeEvent(packet) == {'name': 'jump_start', 'timestamp': 12.5, 'seq': 70000 & 0xFFFF, 'player': 3}
+    assert decodeEvent(b'XX' + packet[2:]) is None and decodeEvent(packet[:-1]) is None
+    assert parseAddress('10.0.0.2:6000') == ('10.0.0.2', 6000) and parseAddress('game') == ('game', 5005)
+
+
+def test_receiver_drops_copies_and_late_events():
+    backend = RecordingBackend()
+    receiver = EventReceiver(0, '127.0.0.1', InputDispatcher(backend))
+    try:
+        assert receiver.handle(encodeEvent('left', 1.0, 5), 1.0)
+        assert receiver.handle(encodeEvent('left', 1.0, 5), 1.0) is None
+        assert receiver.handle(encodeEvent('right', 0.5, 4), 1.0) is None
+
+        # The sequence numbers wrap, and a restarted sender starts over from 0 on newer frames.
+        assert receiver.handle(encodeEvent('right', 2.0, 0), 2.0)
+        assert receiver.handle(encodeEvent('jump_start', 2.0, 1), 2.0)
+    finally:
+        receiver.stop()
+
+    assert receiver.dropped == 2
+    assert backend.actions() == [('press', ('left',)), ('press', ('right',)), ('keyDown', ('up',))]
+
+
+def test_gestures_reach_local_receiver():
+    backend = RecordingBackend()
+    receiver = EventReceiver(0, '127.0.0.1', InputDispatcher(backend)).start()
+    sender = UdpEventSender(receiver.address, repeat=2)
+
+    # The vision side injects nothing, the receiver injects what the controller would have.
+    controller = GameController(InputDispatcher(NullBackend()), num_of_frames=2, output=sender)
+    pipeline = Pipeline(ScriptedPose([HANDS_JOINED] * 2 + [STANDING, LEAN_LEFT], mirror=True), controller)
+    try:
+        for index in range(4):
+            pipeline.process(np.zeros((480, 640, 3), dtype=np.uint8), timestamp=index)
+        for _ in range(100):
+            if len(receiver.events) + receiver.dropped == 4:
+                break
+            sleep(0.01)
+    finally:
+        sender.close()
+        receiver.stop()
+
+    assert [event['name'] for _, event in receiver.events] == ['start', 'left']
+    assert [event['timestamp'] for _, event in receiver.events] == [1, 3]
+    assert receiver.dropped == 2 and sender.sent == 4
+    assert backend.actions() == [('click', (1300, 800, 'left')), ('press', ('left',))]
@@ -0,0 +1,54 @@
+#import necessary modules
+import numpy as np
+from geometry import distances, jointAngles, manhattanDistances, pixelPoints, relativePositions, verticalAngles
+from landmarks import LandmarkFrame, NUM_LANDMARKS
+from pose_detection import findAngle, measurePoses
+
+
+def test_kernels_batch_over_frames():
+    points = np.array([[[0, 0], [3, 4], [3, 0]],
+                       [[1, 1], [1, 1], [1, 3]]], dtype=np.float32)
+
+    np.testing.assert_allclose(relativePositions(points, [1], [0]), [[[3, 4]], [[0, 0]]])
+    np.testing.assert_allclose(distances(points, [0, 0], [1, 2]), [[5, 3], [0, 2]])
+    np.testing.assert_allclose(manhattanDistances(points, [0], [1]), [[7], [0]])
+    np.testing.assert_allclose(jointAngles(points[:1], [2], [0], [1]), [[90]])
+
+    # The second frame has its first two landmarks on each other, their angle is undefined.
+    angles = verticalAngles(points, [1, 2], [0, 0])
+    np.testing.assert_allclose(angles[0], [np.degrees(np.arccos(0.8)), 90], rtol=1e-6)
+    assert np.isnan(angles[1, 0]) and angles[1, 1] == 0
+
+
+def test_pixel_points_scale_each_frame():
+    landmarks = np.full((2, NUM_LANDMARKS, 4), 0.5, dtype=np.float32)
+    points = pixelPoints(landmarks, np.array([640, 320]), np.array([480, 240]))
+
+    assert points.shape == (2, NUM_LANDMARKS, 2)
+    np.testing.assert_allclose(points[:, 0], [[320, 240], [160, 120]])
+
+
+def test_find_angle_degenerate_inputs():
+    # An elbow at the top of the image used to divide by zero, and vertical arms to leave the domain of acos.
+    assert findAngle(100, 0, 100, 50) == 180
+    assert findAngle(100, 150, 100, 50) == 0
+    assert findAngle(0.1 + 0.2, 3e8, 0.3, 1.0) == 0
+    assert findAngle(150, 50, 100, 50) == 90
+    assert np.isnan(findAngle(100, 50, 100, 50))
+
+
+def test_find_angle_matches_the_kernel():
+    points = np.random.default_rng(0).uniform(-500, 500, (200, 2, 2))
+    kernel = verticalAngles(points, [0], [1])[:, 0]
+
+    np.testing.assert_allclose([findAngle(*first, *second) for first, second in points.tolist()], kernel)
+
+
+def test_measures_match_single_frame():
+    landmarks = LandmarkFrame(640, 480, np.random.default_rng(0).random((NUM_LANDMARKS, 4), dtype=np.float32))
+    single = measurePoses(landmarks.pixels())
+    batch = measurePoses(np.stack([landmarks.pixels()] * 3))
+
+    for name, value in single.items():
+        assert value.shape == () and batch[name].shape == (3,)
+        np.testing.assert_allclose(batch[name], value)
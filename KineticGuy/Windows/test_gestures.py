@@ -0,0 +1,35 @@
+#import necessary modules
+from gestures import GestureEngine, GestureRule, PLAYING, WAITING
+from input_dispatch import InputDispatcher, NullBackend
+from landmarks import LandmarkFrame
+from pipeline import GameController
+from profiler import Profiler
+from test_pipeline import HANDS_JOINED, makeResults
+
+
+def steps(rule, labels, period=0.1):
+    return [index for index, label in enumerate(labels) if rule.step(label, None, index * period)]
+
+
+def test_rule_debounce_hold_and_cooldown():
+    when = lambda label, game: label
+    assert steps(GestureRule('a', PLAYING, 'c', when, None, frames=3), [1, 1, 0, 1, 1, 1, 1, 1, 1]) == [5, 8]
+    assert steps(GestureRule('b', PLAYING, 'c', when, None, hold=0.25), [1] * 8) == [3, 7]
+    assert steps(GestureRule('c', PLAYING, 'c', when, None, cooldown=0.5), [1] * 8) == [0, 5]
+
+
+def test_only_rules_of_current_state_run():
+    engine = GestureEngine([GestureRule('start', WAITING, 'hands_joined', lambda label, game: False, None),
+                            GestureRule('jump_start', PLAYING, 'jump_crouch', lambda label, game: False, None)])
+    assert [rule.name for rule in engine.active(WAITING)] == ['start']
+
+    controller = GameController(InputDispatcher(NullBackend()), num_of_frames=10)
+    profiler = Profiler()
+    controller.instrument(profiler)
+    landmarks = LandmarkFrame.fromResults(makeResults(HANDS_JOINED), 640, 480)
+    for index in range(5):
+        controller.update(landmarks, timestamp=index)
+
+    # Before the game starts only the hands are checked, once per frame.
+    assert profiler.count('hands_joined') == 5
+    assert profiler.count('jump_crouch') == profiler.count('left_right') == profiler.count('shoulders_joined') == 0
@@ -0,0 +1,40 @@
+#import necessary modules
+from types import SimpleNamespace
+import numpy as np
+from hands import HandState, NUM_HAND_LANDMARKS, TIP_IDS, V_SIGN, fingerStates
+
+
+def makeHand(fingers, handedness='Right'):
+    # A hand with every finger closed: the tips below their joints and the thumb tip towards the palm.
+    points = np.zeros((NUM_HAND_LANDMARKS, 3), dtype=np.float32)
+    points[:, 1] = 100
+    thumb = -10 if handedness == 'Right' else 10
+    for finger, tip in enumerate(TIP_IDS.tolist()):
+        if finger == 0:
+            points[tip, 0] = -thumb if not fingers[0] else thumb
+        else:
+            points[tip, 1] = 90 if fingers[finger] else 110
+    return points
+
+
+def test_finger_states_of_both_hands():
+    for handedness in ('Right', 'Left'):
+        for fingers in (V_SIGN, (True, False, False, False, True), (False,) * 5):
+            hand = HandState(makeHand(fingers, handedness), handedness)
+            assert hand.fingers.tolist() == list(fingers)
+            assert hand.count == sum(fingers)
+            assert hand.matches(fingers) and not hand.matches((True,) * 5)
+
+
+def test_finger_states_batch_over_hands():
+    hands = np.stack([makeHand(V_SIGN), makeHand((True,) * 5), makeHand((False,) * 5)])
+    assert fingerStates(hands, 'Right').tolist() == [list(V_SIGN), [True] * 5, [False] * 5]
+
+
+def test_hand_from_landmarks_maps_crop_to_frame():
+    landmark = [SimpleNamespace(x=index / 20, y=0.5, z=0.0) for index in range(NUM_HAND_LANDMARKS)]
+    hand = HandState.fromLandmarks(SimpleNamespace(landmark=landmark), 'Left', 440, 330, x0=10, y0=20, size=100)
+
+    assert hand.points.shape == (NUM_HAND_LANDMARKS, 3) and hand.handedness == 'Left'
+    np.testing.assert_allclose(hand.points[20, :2], (110, 70))
+    assert HandState.fromLandmarks(None, 'Left', 440, 330) is None
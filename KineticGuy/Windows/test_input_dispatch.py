@@ -0,0 +1,59 @@
+#import necessary modules
+import threading
+from input_dispatch import InputDispatcher, RecordingBackend
+
+
+class BlockingBackend(RecordingBackend):
+    '''
+    This class records the events only once it is released, like a slow OS input injection.
+    '''
+
+    def __init__(self):
+        super().__init__()
+        self.released = threading.Event()
+
+    def press(self, key):
+        self.released.wait()
+        super().press(key)
+
+
+def test_events_are_injected_in_order_with_redundant_keys_dropped():
+    backend = RecordingBackend()
+    dispatcher = InputDispatcher(backend).start()
+
+    dispatcher.keyDown('up')
+    dispatcher.keyDown('up')
+    dispatcher.press('left')
+    dispatcher.keyUp('up')
+    dispatcher.keyUp('up')
+    dispatcher.click(963, 500)
+    dispatcher.stop()
+
+    assert backend.actions() == [('keyDown', ('up',)), ('press', ('left',)), ('keyUp', ('up',)),
+                                 ('click', (963, 500, 'left'))]
+    assert dispatcher.coalesced == 2
+    assert dispatcher.dispatched == 4
+
+
+def test_emitting_does_not_wait_for_the_backend():
+    backend = BlockingBackend()
+    dispatcher = InputDispatcher(backend).start()
+
+    dispatcher.press('left')
+    dispatcher.press('right')
+    assert backend.actions() == []
+
+    backend.released.set()
+    dispatcher.stop()
+    assert backend.actions() == [('press', ('left',)), ('press', ('right',))]
+
+
+def test_stop_releases_held_keys():
+    backend = RecordingBackend()
+    dispatcher = InputDispatcher(backend).start()
+
+    dispatcher.keyDown('up')
+    dispatcher.stop()
+
+    assert backend.actions() == [('keyDown', ('up',)), ('keyUp', ('up',))]
+    assert dispatcher.held == set()
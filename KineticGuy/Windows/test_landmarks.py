@@ -0,0 +1,53 @@
+#import necessary modules
+from types import SimpleNamespace
+import numpy as np
+from landmarks import LandmarkFrame, NUM_LANDMARKS, LEFT_WRIST, RIGHT_WRIST
+
+
+def makeResults(points):
+    landmark = [SimpleNamespace(x=x, y=y, z=0.0, visibility=1.0) for x, y in points]
+    return SimpleNamespace(pose_landmarks=SimpleNamespace(landmark=landmark))
+
+
+def test_update_copies_landmarks_in_place():
+    points = [(index / 100, index / 50) for index in range(NUM_LANDMARKS)]
+    landmarks = LandmarkFrame()
+    data = landmarks.data
+
+    assert landmarks.update(makeResults(points), 640, 480) is landmarks
+    assert landmarks.data is data
+    assert landmarks.detected
+    assert landmarks.data.shape == (NUM_LANDMARKS, 4) and landmarks.data.dtype == np.float32
+    np.testing.assert_allclose(landmarks.pixel(LEFT_WRIST), (0.15 * 640, 0.30 * 480), rtol=1e-6)
+    np.testing.assert_allclose(landmarks.pixels([LEFT_WRIST, RIGHT_WRIST]),
+                               [[0.15 * 640, 0.30 * 480], [0.16 * 640, 0.32 * 480]], rtol=1e-6)
+
+
+def test_update_without_person_is_not_detected():
+    landmarks = LandmarkFrame.fromResults(SimpleNamespace(pose_landmarks=None), 640, 480)
+    assert not landmarks.detected
+    assert (landmarks.width, landmarks.height) == (640, 480)
+
+
+def test_copy_does_not_share_data():
+    landmarks = LandmarkFrame(640, 480, np.ones((NUM_LANDMARKS, 4), dtype=np.float32))
+    copy = landmarks.copy()
+    copy.data[0, 0] = 5
+
+    assert landmarks.detected and copy.detected
+    assert landmarks.data[0, 0] == 1
+
+
+def test_mirror_flips_x_and_swaps_sides():
+    points = [(index / 100, index / 50) for index in range(NUM_LANDMARKS)]
+    landmarks = LandmarkFrame.fromResults(makeResults(points), 640, 480)
+    data = landmarks.data
+
+    assert landmarks.mirror() is landmarks and landmarks.data is data
+    np.testing.assert_allclose(landmarks.pixel(LEFT_WRIST), ((1 - 0.16) * 640, 0.32 * 480), rtol=1e-6)
+    np.testing.assert_allclose(landmarks.pixel(RIGHT_WRIST), ((1 - 0.15) * 640, 0.30 * 480), rtol=1e-6)
+    np.testing.assert_allclose(landmarks.pixel(0), (640, 0))
+
+    # Mirroring twice gives the detected landmarks back.
+    landmarks.mirror()
+    np.testing.assert_allclose(landmarks.data[:, :2], points, rtol=1e-6)
@@ -0,0 +1,56 @@
+#import necessary modules
+from backends import SyntheticBackend
+from capture import BlankSource, FrameGrabber, SyntheticCamera
+from latency import measureLatency
+from profiler import Profiler
+from input_dispatch import InputDispatcher, RecordingBackend
+
+
+def test_dispatcher_records_the_frame_to_action_latency():
+    profiler = Profiler()
+    dispatcher = InputDispatcher(RecordingBackend(), profiler=profiler)
+
+    dispatcher.press('left', timestamp=0.0)
+
+    assert profiler.count('latency') == 1
+    assert profiler.summary()['latency']['p50_ms'] > 0
+
+
+def test_measure_latency_on_a_file_backed_source():
+    grabber = FrameGrabber(BlankSource(120), width=None, height=None).start()
+    try:
+        report = measureLatency(grabber, SyntheticBackend(), driver_ms=10.0, num_of_frames=5)
+    finally:
+        grabber.release()
+
+    # The script starts the game and moves, each input has a measured latency. The classifiers measure pixels, so
+    # the frames have the size of a camera frame.
+    assert report['frames'] == 120
+    assert report['events']
+    assert report['frame_to_action']['count'] == len(report['events'])
+    assert report['glass_to_action_ms']['p50_ms'] == report['frame_to_action']['p50_ms'] + 10.0
+    assert 'inference' in report['stages'] and 'latency' not in report['stages']
+
+
+def test_measure_latency_on_a_synthetic_camera():
+    camera = SyntheticCamera(({'fourcc': 'MJPG', 'width': 640, 'height': 480, 'fps': 200.0},))
+    grabber = FrameGrabber(camera, width=None, height=None, live=True).start()
+    try:
+        report = measureLatency(grabber, SyntheticBackend(), frames=40, num_of_frames=5)
+    finally:
+        grabber.release()
+
+    assert report['frames'] == 40
+    assert report['grabber']['captured'] >= 40
+    assert report['driver_ms'] == 0.0
+
+
+def test_measure_latency_without_input():
+    grabber = FrameGrabber(BlankSource(5), width=None, height=None).start()
+    try:
+        report = measureLatency(grabber, SyntheticBackend(script=(('absent', 1),)))
+    finally:
+        grabber.release()
+
+    assert report['frame_to_action'] is None
+    assert report['glass_to_action_ms'] is None
@@ -0,0 +1,85 @@
+#import necessary modules
+import numpy as np
+import pytest
+from engine import ProcessPipeline
+from input_dispatch import InputDispatcher, NullBackend, RecordingBackend
+from landmarks import LandmarkFrame
+from motion import MotionGate
+from pipeline import GameController, Pipeline
+from test_pipeline import HANDS_JOINED, STANDING, ScriptedPose
+from conftest import constantLandmarks
+
+
+def makeFrame(square=None, value=255):
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    if square is not None:
+        x, y = square
+        frame[y:y + 80, x:x + 80] = value
+    return frame
+
+
+def test_gate_skips_still_frames_until_the_maximum_interval():
+    gate = MotionGate(threshold=8.0, max_skip=0.5)
+
+    # The first frame has nothing to compare with.
+    assert gate.shouldInfer(makeFrame((100, 100)), 0.0)
+    gate.observe(constantLandmarks(0.3), 0.0)
+
+    # The same frame, or one with sensor noise, is still.
+    assert not gate.shouldInfer(makeFrame((100, 100)), 0.1)
+    noisy = makeFrame((100, 100)).astype(np.int16) + np.random.default_rng(0).integers(-3, 4, (480, 640, 3))
+    assert not gate.shouldInfer(np.clip(noisy, 0, 255).astype(np.uint8), 0.2)
+    landmarks = gate.hold(LandmarkFrame())
+    assert landmarks.detected and not landmarks.extrapolated and np.allclose(landmarks.data[:, 0], 0.3)
+    assert (landmarks.width, landmarks.height) == (640, 480)
+
+    # A detection is forced once the maximum interval passed, even on a still frame.
+    assert gate.shouldInfer(makeFrame((100, 100)), 0.5)
+
+
+def test_gate_detects_motion_in_the_player_region_only():
+    gate = MotionGate(threshold=8.0)
+    gate.shouldInfer(makeFrame((100, 100)), 0.0)
+    gate.observe(constantLandmarks(0.3), 0.0)
+
+    # The square moved: motion on the whole frame and in a region around it, none in a region away from it.
+    moved = makeFrame((140, 100))
+    assert gate.shouldInfer(moved, 0.1)
+    assert gate.shouldInfer(moved, 0.1, region=(64, 64, 320, 320))
+    assert not gate.shouldInfer(moved, 0.1, region=(400, 0, 640, 480))
+
+    # The reference is the frame of the last detection, so a slow drift adds up.
+    assert gate.shouldInfer(makeFrame((116, 100)), 0.2)
+
+
+def test_pipeline_reuses_landmarks_while_the_player_is_still():
+    pose = ScriptedPose([STANDING])
+    gate = MotionGate(max_skip=0.5)
+    pipeline = Pipeline(pose, GameController(InputDispatcher(NullBackend())), motion=gate)
+
+    for index in range(30):
+        pipeline.process(makeFrame((300, 200)), timestamp=index / 30)
+
+    # A detection on the first frame and every half second after it.
+    assert pose.calls == 2 and gate.held == 28
+    assert pipeline.profiler.count('motion') == 30 and pipeline.profiler.count('inference') == 30
+    assert pipeline.landmarks.detected
+
+
+def test_held_frames_keep_counting_the_gestures():
+    backend = RecordingBackend()
+    controller = GameController(InputDispatcher(backend), num_of_frames=5)
+    pose = ScriptedPose([HANDS_JOINED], mirror=True)
+    pipeline = Pipeline(pose, controller, motion=MotionGate(max_skip=1.0))
+
+    for index in range(5):
+        pipeline.process(makeFrame(), timestamp=index / 30)
+
+    # The hands stayed joined on the reused landmarks, the game starts after one detection.
+    assert pose.calls == 1
+    assert controller.game_started and backend.actions() == [('click', (1300, 800, 'left'))]
+
+
+def test_process_pipeline_rejects_a_motion_gate():
+    with pytest.raises(ValueError):
+        ProcessPipeline(GameController(InputDispatcher(NullBackend())), motion=MotionGate())
@@ -0,0 +1,30 @@
+#import necessary modules
+import numpy as np
+from overlay import Overlay, textCommand, lineCommand, circleCommand, applyCommands
+
+
+def test_apply_draws_commands_in_place():
+    image = np.zeros((100, 200, 3), dtype=np.uint8)
+    output_image = applyCommands(image, [lineCommand((0, 50), (200, 50), (255, 255, 255), 2),
+                                         circleCommand((20, 20), 3, (0, 255, 0), -1)])
+
+    assert output_image is image
+    assert image[50, 100].tolist() == [255, 255, 255]
+    assert image[10, 100].tolist() == [0, 0, 0]
+    assert image[20, 20].tolist() == [0, 255, 0]
+
+
+def test_overlay_collects_and_clears_commands():
+    overlay = Overlay()
+    overlay.add([textCommand('Standing', (5, 90))])
+    overlay.add([lineCommand((0, 50.7), (200, 50.7))])
+
+    assert [command[0] for command in overlay.commands] == ['text', 'line']
+    assert overlay.commands[1][1] == (0, 50)
+
+    image = np.zeros((100, 200, 3), dtype=np.uint8)
+    overlay.apply(image)
+    assert image.any()
+
+    overlay.clear()
+    assert overlay.commands == []
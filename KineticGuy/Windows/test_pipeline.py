@@ -0,0 +1,93 @@
+#import necessary modules
+import os
+from types import SimpleNamespace
+import numpy as np
+from capture import ImageSequence
+from input_dispatch import InputDispatcher, RecordingBackend
+from landmarks import (NUM_LANDMARKS, MIRROR_INDEXES, LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_ELBOW, RIGHT_ELBOW, LEFT_WRIST,
+                       RIGHT_WRIST, LEFT_THUMB, RIGHT_THUMB)
+from overlay import Overlay
+from pipeline import GameController, Pipeline
+from replay import replay
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+STANDING = {LEFT_SHOULDER: (0.6, 0.4), RIGHT_SHOULDER: (0.4, 0.4), LEFT_ELBOW: (0.65, 0.55),
+            RIGHT_ELBOW: (0.35, 0.55), LEFT_WRIST: (0.7, 0.7), RIGHT_WRIST: (0.3, 0.7), LEFT_THUMB: (0.7, 0.72),
+            RIGHT_THUMB: (0.3, 0.72)}
+HANDS_JOINED = {**STANDING, LEFT_WRIST: (0.51, 0.3), RIGHT_WRIST: (0.49, 0.3)}
+LEAN_LEFT = {**STANDING, RIGHT_ELBOW: (0.3, 0.3)}
+
+
+def makeResults(pose, mirror=False):
+    points = np.full((NUM_LANDMARKS, 2), 0.5)
+    for index, point in pose.items():
+        points[index] = point
+    if mirror:
+        points = points[MIRROR_INDEXES]
+        points[:, 0] = 1 - points[:, 0]
+    landmark = [SimpleNamespace(x=x, y=y, z=0.0, visibility=1.0) for x, y in points.tolist()]
+    return SimpleNamespace(pose_landmarks=SimpleNamespace(landmark=landmark))
+
+
+class ScriptedPose:
+    '''
+    This class stands in for the mediapipe Pose function, returning the scripted poses in order. With mirror set
+    the poses are scripted as the player sees them, and returned as detected on the captured frame.
+    '''
+
+    def __init__(self, poses, mirror=False):
+        self.poses = list(poses)
+        self.mirror = mirror
+        self.calls = 0
+
+    def process(self, image):
+        pose = self.poses[min(self.calls, len(self.poses) - 1)]
+        self.calls += 1
+        return makeResults(pose, self.mirror)
+
+
+def test_pipeline_starts_game_and_moves_character():
+    backend = RecordingBackend()
+    controller = GameController(InputDispatcher(backend), num_of_frames=3)
+    pipeline = Pipeline(ScriptedPose([HANDS_JOINED] * 3 + [STANDING, LEAN_LEFT], mirror=True), controller)
+    overlay = Overlay()
+
+    # The left edge of the captured frames is white, it is on the right of the shown frames.
+    for _ in range(5):
+        overlay.clear()
+        image = np.zeros((480, 640, 3), dtype=np.uint8)
+        image[:, :10] = 255
+        frame, playing = pipeline.process(image, overlay)
+        assert playing
+
+    assert controller.game_started and controller.x_pos_index == 0
+    assert [name for _, name in controller.events] == ['start', 'left']
+    assert backend.actions() == [('click', (1300, 800, 'left')), ('press', ('left',))]
+    assert frame[470, -5].all() and not frame[470, 5].any()
+    assert all(pipeline.profiler.count(stage) == 5 for stage in Pipeline.STAGES)
+    assert pipeline.profiler.count('hands_joined') == 5 and pipeline.profiler.count('left_right') == 2
+
+
+def test_pipeline_without_render_only_collects_commands():
+    controller = GameController(InputDispatcher(RecordingBackend()), num_of_frames=1)
+    pipeline = Pipeline(ScriptedPose([HANDS_JOINED, STANDING]), controller, render=False)
+    overlay = Overlay()
+
+    for _ in range(2):
+        overlay.clear()
+        image = np.zeros((480, 640, 3), dtype=np.uint8)
+        frame, _ = pipeline.process(image, overlay)
+
+    assert frame is image and not frame.any()
+    assert 'landmarks' in [command[0] for command in overlay.commands]
+
+
+def test_replay_reports_stages_and_events():
+    source = ImageSequence([os.path.join(HERE, 'sample.png')], repeat=6)
+    report = replay(source, ScriptedPose([HANDS_JOINED]), fps=30.0, num_of_frames=2)
+
+    assert report['frames'] == 6
+    assert set(Pipeline.STAGES) <= set(report['stages'])
+    assert [event['event'] for event in report['events']] == ['start', 'restart', 'restart']
+    assert report['events'][0]['time'] == 1 / 30
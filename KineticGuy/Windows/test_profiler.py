@@ -0,0 +1,38 @@
+#import necessary modules
+import csv
+import json
+from profiler import Profiler
+
+
+def test_profiler_percentiles_and_dump(tmp_path):
+    profiler = Profiler(window=100)
+    for index in range(200):
+        profiler.record('inference', (index % 100 + 1) / 1000)
+    with profiler.stage('draw'):
+        pass
+
+    summary = profiler.summary()
+    assert summary['inference']['count'] == 100
+    assert abs(summary['inference']['p50_ms'] - 50.5) < 1e-6
+    assert summary['inference']['p99_ms'] <= summary['inference']['max_ms'] == 100.0
+    assert summary['draw']['count'] == 1
+    assert len(profiler.hudCommands()) == 3
+
+    profiler.dump(str(tmp_path / 'stages.csv'))
+    with open(tmp_path / 'stages.csv') as file:
+        assert [row['stage'] for row in csv.DictReader(file)] == ['inference', 'draw']
+    profiler.dump(str(tmp_path / 'stages.json'))
+    with open(tmp_path / 'stages.json') as file:
+        assert set(json.load(file)['stages']) == {'inference', 'draw'}
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler(enabled=False)
+
+    def classify(value):
+        return value * 2
+
+    assert profiler.timed('classify')(classify) is classify
+    with profiler.stage('inference'):
+        profiler.record('draw', 1.0)
+    assert profiler.summary() == {} and profiler.hudCommands() == []
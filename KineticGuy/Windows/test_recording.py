@@ -0,0 +1,62 @@
+#import necessary modules
+import os
+import numpy as np
+from capture import ImageSequence
+from input_dispatch import InputDispatcher, NullBackend
+from pipeline import GameController, Pipeline
+from recording import LandmarkRecorder, loadRecording, measureRecording, replayRecording, sweep
+from replay import replay
+from test_pipeline import HANDS_JOINED, LEAN_LEFT, STANDING, ScriptedPose
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_recording_round_trip_replays_same_events(tmp_path):
+    path = str(tmp_path / 'session.kglm')
+    source = ImageSequence([os.path.join(HERE, 'sample.png')], repeat=6)
+    with LandmarkRecorder(path) as recorder:
+        report = replay(source, ScriptedPose([HANDS_JOINED]), fps=30.0, num_of_frames=2, recorder=recorder)
+
+    records = loadRecording(path)
+    assert len(records) == 6 and records['detected'].all()
+    assert np.allclose(records['timestamp'], np.arange(6) / 30)
+
+    replayed = replayRecording(records, num_of_frames=2)
+    assert replayed['frames'] == 6
+    assert replayed['events'] == report['events']
+
+
+def test_sweep_changes_events_with_thresholds(tmp_path):
+    path = str(tmp_path / 'session.kglm')
+    controller = GameController(InputDispatcher(NullBackend()), num_of_frames=2)
+    with LandmarkRecorder(path) as recorder:
+        pipeline = Pipeline(ScriptedPose([HANDS_JOINED] * 2 + [STANDING]), controller, mirror=False,
+                            recorder=recorder)
+        for index in range(3):
+            pipeline.process(np.zeros((480, 640, 3), dtype=np.uint8), timestamp=index)
+
+    results = sweep([loadRecording(path)], {'hands_joined.distance': [5, 130]}, num_of_frames=2)
+    assert [result['events'].get('start', 0) for result in results] == [0, 1]
+
+
+def test_measures_match_live_frames(tmp_path):
+    path = str(tmp_path / 'session.kglm')
+    controller = GameController(InputDispatcher(NullBackend()), num_of_frames=2)
+    with LandmarkRecorder(path) as recorder:
+        pipeline = Pipeline(ScriptedPose([HANDS_JOINED, LEAN_LEFT, STANDING]), controller, mirror=False,
+                            recorder=recorder)
+        for index in range(3):
+            pipeline.process(np.zeros((480, 640, 3), dtype=np.uint8), timestamp=index)
+
+    # The wrists are 0.02 * 640 pixels apart on the first frame, and the right elbow is raised on the second.
+    measures = measureRecording(loadRecording(path))
+    assert measures['wrist_distance'].shape == (3,)
+    np.testing.assert_allclose(measures['wrist_distance'][0], 0.02 * 640, rtol=1e-4)
+    assert measures['right_angle'][1] > 95 > measures['right_angle'][2]
+    assert measures['left_angle'][1] < 95
+
+
+def test_empty_recording_loads(tmp_path):
+    path = str(tmp_path / 'empty.kglm')
+    LandmarkRecorder(path).close()
+    assert replayRecording(loadRecording(path))['frames'] == 0
@@ -0,0 +1,53 @@
+#import necessary modules
+import numpy as np
+from landmarks import LandmarkFrame, NUM_LANDMARKS
+from roi import RoiTracker
+
+
+def makeLandmarks(x1, y1, x2, y2):
+    data = np.zeros((NUM_LANDMARKS, 4), dtype=np.float32)
+    data[:, 0] = np.linspace(x1, x2, NUM_LANDMARKS)
+    data[:, 1] = np.linspace(y1, y2, NUM_LANDMARKS)
+    data[:, 3] = 1.0
+    return LandmarkFrame(0, 0, data)
+
+
+def test_full_frame_is_scaled_to_inference_width():
+    tracker = RoiTracker(inference_width=320)
+    crop = tracker.crop(np.zeros((960, 1280, 3), dtype=np.uint8))
+
+    assert crop.shape == (240, 320, 3)
+    assert tracker.current == (0, 0, 1280, 960)
+
+    # The next crop of the same size is scaled into the same buffer.
+    assert tracker.crop(np.ones((960, 1280, 3), dtype=np.uint8)) is crop and crop.all()
+
+
+def test_landmarks_are_mapped_back_and_region_tracks_person():
+    tracker = RoiTracker(inference_width=None, smoothing=0.0)
+    image = np.zeros((960, 1280, 3), dtype=np.uint8)
+    tracker.crop(image)
+    landmarks = tracker.update(makeLandmarks(0.4, 0.25, 0.6, 0.75), 1280, 960)
+
+    # The region holds the person with a margin and keeps the frame aspect ratio.
+    x1, y1, x2, y2 = tracker.roi
+    assert x1 < 0.4 * 1280 and x2 > 0.6 * 1280 and y1 < 0.25 * 960 and y2 > 0.75 * 960
+    assert abs((x2 - x1) * 960 - (y2 - y1) * 1280) < 1280 * 2
+
+    # Landmarks detected on the crop are mapped back to full frame coordinates.
+    crop = tracker.crop(image)
+    assert crop.shape[:2] == (y2 - y1, x2 - x1)
+    landmarks = tracker.update(makeLandmarks(0.5, 0.5, 0.5, 0.5), 1280, 960)
+    np.testing.assert_allclose(landmarks.pixel(0), ((x1 + x2) / 2, (y1 + y2) / 2), atol=1)
+    assert (landmarks.width, landmarks.height) == (1280, 960)
+
+
+def test_lost_person_falls_back_to_full_frame():
+    tracker = RoiTracker()
+    tracker.crop(np.zeros((960, 1280, 3), dtype=np.uint8))
+    tracker.update(makeLandmarks(0.4, 0.25, 0.6, 0.75), 1280, 960)
+    assert tracker.roi is not None
+
+    tracker.crop(np.zeros((960, 1280, 3), dtype=np.uint8))
+    tracker.update(LandmarkFrame(), 1280, 960)
+    assert tracker.roi is None
@@ -0,0 +1,22 @@
+#import necessary modules
+import os
+from capture import ImageSequence
+from runtime import PlayerSession, Runtime
+from test_engine import scriptedPose
+from test_pipeline import HANDS_JOINED, STANDING
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_runtime_keeps_sessions_independent():
+    sessions = [PlayerSession(name, ImageSequence([os.path.join(HERE, 'sample.png')], repeat=6), num_of_frames=2,
+                              smoothing=False, pose_factory=scriptedPose, pose_config={'poses': [pose]}, live=False)
+                for name, pose in (('joined', HANDS_JOINED), ('standing', STANDING))]
+
+    metrics = Runtime(sessions).run(duration=30.0)
+
+    assert [session['name'] for session in metrics] == ['joined', 'standing']
+    assert [session['frames'] for session in metrics] == [6, 6]
+    assert metrics[1]['events'] == 0 and metrics[0]['events'] > 0
+    assert sessions[0].controller.game_started and not sessions[1].controller.game_started
+    assert 'worker' in metrics[0]['stages']
@@ -0,0 +1,42 @@
+#import necessary modules
+import numpy as np
+from input_dispatch import InputDispatcher, NullBackend
+from landmarks import LandmarkFrame
+from pipeline import GameController, Pipeline
+from scheduler import InferenceScheduler
+from test_pipeline import STANDING, ScriptedPose
+from conftest import constantLandmarks
+
+
+def test_interval_follows_inference_time_and_extrapolates():
+    scheduler = InferenceScheduler(budget=0.01, max_interval=4, smoothing=1.0)
+    scheduler.observe(constantLandmarks(0.1), 0.0, 0.025)
+    scheduler.observe(constantLandmarks(0.2), 0.1, 0.025)
+    assert scheduler.interval == 3
+
+    assert not scheduler.shouldInfer(0.15)
+    landmarks = scheduler.extrapolate(LandmarkFrame(), 0.15)
+    assert landmarks.extrapolated and landmarks.detected
+    assert np.allclose(landmarks.data[:, 0], 0.25) and np.allclose(landmarks.data[:, 3], 1.0)
+    assert not scheduler.shouldInfer(0.2)
+    scheduler.extrapolate(landmarks, 0.2)
+    assert scheduler.shouldInfer(0.25)
+
+    # A fast detection brings the detection back on every frame, a lost person is never extrapolated.
+    scheduler.observe(constantLandmarks(0.3), 0.25, 0.001)
+    assert scheduler.interval == 1 and scheduler.shouldInfer(0.3)
+    scheduler.interval = 4
+    scheduler.observe(LandmarkFrame(640, 480), 0.3, 0.001)
+    assert scheduler.shouldInfer(0.35)
+
+
+def test_pipeline_skips_detection_on_scheduled_frames():
+    pose = ScriptedPose([STANDING])
+    scheduler = InferenceScheduler(budget=1e-9, max_interval=3)
+    controller = GameController(InputDispatcher(NullBackend()))
+    pipeline = Pipeline(pose, controller, scheduler=scheduler)
+
+    for index in range(9):
+        pipeline.process(np.zeros((48, 64, 3), dtype=np.uint8), timestamp=index / 30)
+
+    assert pose.calls == 3 and scheduler.extrapolated == 6
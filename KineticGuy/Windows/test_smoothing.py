@@ -0,0 +1,34 @@
+#import necessary modules
+import numpy as np
+from landmarks import LEFT_WRIST
+from smoothing import OneEuroFilter
+from conftest import constantLandmarks
+
+
+def test_filter_removes_jitter_and_follows_moves():
+    smoother = OneEuroFilter(min_cutoff=1.0, beta=5.0)
+    rng = np.random.default_rng(0)
+    outputs = [smoother.update(constantLandmarks(0.5 + rng.normal(0, 0.005)), index / 30).data[0, 0]
+               for index in range(60)]
+    assert np.std(outputs[30:]) < 0.5 * 0.005
+
+    # A fast move is followed within a few frames.
+    for index in range(60, 66):
+        landmarks = smoother.update(constantLandmarks(0.8), index / 30)
+    assert abs(landmarks.data[0, 0] - 0.8) < 0.02
+
+
+def test_filter_resets_on_hidden_landmarks_and_gaps():
+    smoother = OneEuroFilter()
+    smoother.update(constantLandmarks(0.2), 0.0)
+
+    # A landmark hidden on the previous frame takes its new value as is.
+    hidden = constantLandmarks(0.2)
+    hidden.data[LEFT_WRIST, 3] = 0.0
+    smoother.update(hidden, 1 / 30)
+    landmarks = smoother.update(constantLandmarks(0.6), 2 / 30)
+    assert landmarks.data[LEFT_WRIST, 0] == np.float32(0.6)
+    assert landmarks.data[0, 0] < 0.6
+
+    # A long gap resets every landmark.
+    assert smoother.update(constantLandmarks(0.9), 5.0).data[0, 0] == np.float32(0.9)
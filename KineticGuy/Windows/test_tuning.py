@@ -0,0 +1,61 @@
+#import necessary modules
+import os
+import tuning
+from tuning import loadProfile, readClip, saveProfile, tune, tunedSettings
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class FakeClock:
+    '''
+    This class stands in for perf_counter, advanced only by the TimedPose objects.
+    '''
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TimedPose:
+    '''
+    This class stands in for a pose backend, taking longer for larger models and images.
+    '''
+
+    clock = None
+
+    def __init__(self, model_complexity, **config):
+        self.cost = (model_complexity + 1) * 0.01
+
+    def detect(self, image, landmarks):
+        self.clock.now += self.cost * image.shape[1] / 320
+        return landmarks
+
+
+def test_tune_picks_most_accurate_configuration_meeting_target(monkeypatch):
+    TimedPose.clock = FakeClock()
+    monkeypatch.setattr(tuning, 'perf_counter', TimedPose.clock)
+    clip = readClip([os.path.join(HERE, 'sample.png')], frames=2)
+
+    # Complexity 2 takes at least 30 ms, complexity 1 takes 20 ms at 320 pixels and 30 ms at 480.
+    settings = tune(clip, target_ms=25, pose_factory=TimedPose)
+    assert (settings['model_complexity'], settings['inference_width']) == (1, 320)
+    assert (settings['capture_width'], settings['capture_height']) == (640, 480)
+
+    # Without a configuration meeting the target, the fastest one is used.
+    settings = tune(clip, target_ms=0.1, pose_factory=TimedPose)
+    assert (settings['model_complexity'], settings['inference_width']) == (0, 320)
+
+
+def test_profile_is_reused_for_the_same_target(tmp_path):
+    path = str(tmp_path / 'profile.json')
+    assert loadProfile(path) is None
+
+    saveProfile({'model_complexity': 0, 'inference_width': 320}, 33.0, path)
+    assert loadProfile(path, 33.0)['model_complexity'] == 0
+    assert loadProfile(path, 16.0) is None
+
+    # A launch with a profile does not read the clip or build a model.
+    settings = tunedSettings(['missing.png'], 33.0, path, pose_factory=None)
+    assert settings['inference_width'] == 320
@@ -0,0 +1,243 @@
+#import necessary modules
+import argparse
+import json
+import os
+import platform
+from time import perf_counter
+import cv2
+import numpy as np
+from capture import openSource
+from landmarks import LandmarkFrame
+from backends import asBackend
+from models import getVideoPose, closeModels
+
+# The version of the profile file, a profile of another version is tuned again.
+PROFILE_VERSION = 1
+
+# The default location of the machine profile.
+PROFILE_PATH = os.path.join(os.path.expanduser('~'), '.kineticguy', 'profile.json')
+
+# The default warm-up clip, the sample images next to this file.
+DEFAULT_CLIP = [os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+                for name in ('sample.png', 'sample2.png')]
+
+# The candidate model complexities and inference widths, from the most to the least accurate.
+COMPLEXITIES = (2, 1, 0)
+INFERENCE_WIDTHS = (640, 480, 320)
+
+# The capture resolutions, the smallest one at least twice as wide as the inference width is requested, so the
+# crop around the person still has the inference resolution.
+CAPTURE_SIZES = ((640, 480), (960, 720), (1280, 960))
+
+
+def candidates():
+    '''
+    This function lists the configurations tried, from the most to the least accurate.
+    Returns:
+        candidates: A list of dictionaries with the model_complexity and the inference_width.
+    '''
+
+    return [{'model_complexity': complexity, 'inference_width': width}
+            for complexity in COMPLEXITIES for width in INFERENCE_WIDTHS]
+
+
+def captureSize(inference_width):
+    '''
+    This function returns the capture resolution requested for an inference width.
+    '''
+
+    return next((size for size in CAPTURE_SIZES if size[0] >= 2 * inference_width), CAPTURE_SIZES[-1])
+
+
+def confidences(model_complexity):
+    '''
+    This function returns the detection and tracking confidences of a model complexity. The lite model scores its
+    detections lower, so it gets lower thresholds to keep the person tracked.
+    '''
+
+    value = 0.5 if model_complexity == 0 else 0.7
+    return {'min_detection_confidence': value, 'min_tracking_confidence': value}
+
+
+def machineKey():
+    '''
+    This function identifies the machine and the software the timings were measured with.
+    Returns:
+        key: A string that changes when the hardware, the OS or OpenCV change.
+    '''
+
+    return '|'.join((platform.node(), platform.machine(), platform.processor(), platform.system(),
+                     str(os.cpu_count()), cv2.__version__))
+
+
+def benchmark(pose, images, inference_width, warmup=2):
+    '''
+    This function measures the time of the preprocessing and the pose detection on a clip.
+    Args:
+        pose:            The pose backend or function.
+        images:          The list of BGR frames of the clip.
+        inference_width: The width the frames are scaled down to before the detection.
+        warmup:          The number of frames run first and not measured.
+    Returns:
+        times: The array of the time in seconds of each measured frame.
+    '''
+
+    backend = asBackend(pose)
+    landmarks = LandmarkFrame()
+    times = []
+    for index, image in enumerate(images[:warmup] + images):
+        start = perf_counter()
+        height, width, _ = image.shape
+        if width > inference_width:
+            image = cv2.resize(image, (inference_width, round(height * inference_width / width)),
+                               interpolation=cv2.INTER_AREA)
+        backend.detect(cv2.cvtColor(image, cv2.COLOR_BGR2RGB), landmarks)
+        if index >= warmup:
+            times.append(perf_counter() - start)
+
+    return np.array(times)
+
+
+def tune(images, target_ms=33.0, pose_factory=getVideoPose, report=None):
+    '''
+    This function picks the most accurate configuration whose 95th percentile frame time meets the target.
+    Args:
+        images:       The list of BGR frames of the warm-up clip.
+        target_ms:    The target frame time in milliseconds.
+        pose_factory: The function building the pose function of a configuration.
+        report:       An optional function called with each measured configuration.
+    Returns:
+        settings: A dictionary with the model_complexity, the inference_width, the capture_width and
+                  capture_height, the confidences and the measured frame_ms. If no configuration meets the target
+                  the fastest one is returned.
+    '''
+
+    fastest = None
+    for candidate in candidates():
+
+        # Build the model of the candidate and time it on the clip.
+        settings = dict(candidate, **confidences(candidate['model_complexity']))
+        pose = pose_factory(model_complexity=settings['model_complexity'],
+                            min_detection_confidence=settings['min_detection_confidence'],
+                            min_tracking_confidence=settings['min_tracking_confidence'])
+        settings['frame_ms'] = float(np.percentile(benchmark(pose, images, settings['inference_width']), 95) * 1000)
+        settings['capture_width'], settings['capture_height'] = captureSize(settings['inference_width'])
+        if report is not None:
+            report(settings)
+
+        # Check if the candidate meets the target, the candidates are tried from the most accurate.
+        if settings['frame_ms'] <= target_ms:
+            return settings
+        if fastest is None or settings['frame_ms'] < fastest['frame_ms']:
+            fastest = settings
+
+    return fastest
+
+
+def loadProfile(path=PROFILE_PATH, target_ms=None):
+    '''
+    This function reads the settings tuned on this machine.
+    Args:
+        path:      The path of the profile file.
+        target_ms: The target frame time the settings must have been tuned for, any by default.
+    Returns:
+        settings: The dictionary returned by tune(), or None if the file is missing, was written on another
+                  machine or for another target.
+    '''
+
+    try:
+        with open(path) as file:
+            profile = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    if profile.get('version') != PROFILE_VERSION or profile.get('machine') != machineKey():
+        return None
+    if target_ms is not None and profile.get('target_ms') != target_ms:
+        return None
+    return profile.get('settings')
+
+
+def saveProfile(settings, target_ms, path=PROFILE_PATH):
+    '''
+    This function writes the tuned settings of this machine.
+    Args:
+        settings:  The dictionary returned by tune().
+        target_ms: The target frame time the settings were tuned for.
+        path:      The path of the profile file.
+    '''
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump({'version': PROFILE_VERSION, 'machine': machineKey(), 'target_ms': target_ms,
+                   'settings': settings}, file, indent=2)
+
+
+def readClip(paths, frames=20):
+    '''
+    This function reads the frames of the warm-up clip, a video or images, into memory.
+    Args:
+        paths:  The path of a video, or the paths of images.
+        frames: The maximum number of frames read; images are repeated up to it.
+    Returns:
+        images: The list of BGR frames.
+    '''
+
+    source = openSource(paths, repeat=frames)
+    images = []
+    while len(images) < frames and source.isOpened():
+        ok, frame = source.read()
+        if not ok:
+            break
+        images.append(frame)
+    source.release()
+
+    if not images:
+        raise ValueError(f'can not read a frame from {paths}')
+    return images
+
+
+def tunedSettings(clip, target_ms=33.0, path=PROFILE_PATH, retune=False, report=None, pose_factory=getVideoPose):
+    '''
+    This function returns the settings of this machine, from its profile if it was tuned already, otherwise by
+    tuning them on the warm-up clip and writing the profile.
+    Args:
+        clip:         The paths of the warm-up clip, read only if the settings are tuned.
+        target_ms:    The target frame time in milliseconds.
+        path:         The path of the profile file.
+        retune:       A boolean value that is if set to true the profile is ignored and written again.
+        report:       An optional function called with each measured configuration.
+        pose_factory: The function building the pose function of a configuration.
+    Returns:
+        settings: The dictionary returned by tune().
+    '''
+
+    settings = None if retune else loadProfile(path, target_ms)
+    if settings is None:
+        settings = tune(readClip(clip), target_ms, pose_factory, report)
+        saveProfile(settings, target_ms, path)
+
+        # Close the models of the other candidates, only the chosen one is built again.
+        closeModels()
+
+    return settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pick the pose model and resolutions meeting a frame time on this '
+                                                 'machine and store them in its profile.')
+    parser.add_argument('clip', nargs='*', default=DEFAULT_CLIP, help='A video, or images, to benchmark on.')
+    parser.add_argument('--target-ms', type=float, default=33.0, help='The target frame time in milliseconds.')
+    parser.add_argument('--profile-path', default=PROFILE_PATH, help='The path of the machine profile.')
+    args = parser.parse_args()
+
+    def report(settings):
+        print(f"complexity {settings['model_complexity']} width {settings['inference_width']:4d}: "
+              f"{settings['frame_ms']:7.1f} ms p95")
+
+    settings = tunedSettings(args.clip, args.target_ms, args.profile_path, retune=True, report=report)
+    print(f'chosen: {settings}')
+
+
+if __name__ == '__main__':
+    main()